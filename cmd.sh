@@ -12,5 +12,5 @@ python manage.py process_stocks
 python manage.py process_ma_stocks
 
 # cmd.sh
-source /home/anurag3753/venv/bin/activate && cd /home/anurag3753/swing_trader && pip install -r requirements-new.txt && python manage.py process_lth && python manage.py process_stocks && python manage.py process_ma_stocks
+source /home/anurag3753/venv/bin/activate && cd /home/anurag3753/swing_trader && pip install -r requirements-new.txt && python manage.py run_pipeline
 #source /home/anurag3753/venv/bin/activate && cd /home/anurag3753/swing_trader && pip install -r requirements.txt && python manage.py process_stocks && python manage.py process_ma_stocks
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import StockLTH
+from .models import FiredAlert, Membership, PipelineRun, StageTiming, StockLTH, StrategyCheckpoint, Universe
 
 
 @admin.register(StockLTH)
@@ -9,3 +9,44 @@ class StockLTHAdmin(admin.ModelAdmin):
     search_fields = ['symbol']
     readonly_fields = ['last_updated']
     ordering = ['-lth_price']
+
+
+class StageTimingInline(admin.TabularInline):
+    model = StageTiming
+    extra = 0
+    readonly_fields = ['stage', 'universe', 'seconds', 'rows', 'failed']
+
+
+@admin.register(PipelineRun)
+class PipelineRunAdmin(admin.ModelAdmin):
+    list_display = ['command', 'started_at', 'finished_at', 'status']
+    list_filter = ['command', 'status']
+    inlines = [StageTimingInline]
+    ordering = ['-started_at']
+
+
+@admin.register(Universe)
+class UniverseAdmin(admin.ModelAdmin):
+    list_display = ['name', 'source_file', 'run_v20', 'run_ma']
+
+
+@admin.register(Membership)
+class MembershipAdmin(admin.ModelAdmin):
+    list_display = ['symbol', 'universe', 'start_date', 'end_date']
+    list_filter = ['universe', 'end_date']
+    search_fields = ['symbol']
+
+
+@admin.register(FiredAlert)
+class FiredAlertAdmin(admin.ModelAdmin):
+    list_display = ['symbol', 'kind', 'level', 'price', 'fired_at']
+    list_filter = ['kind']
+    search_fields = ['symbol']
+    ordering = ['-fired_at']
+
+
+@admin.register(StrategyCheckpoint)
+class StrategyCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['symbol', 'strategy', 'universe', 'last_date', 'updated_at']
+    list_filter = ['strategy', 'universe']
+    search_fields = ['symbol']
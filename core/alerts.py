@@ -0,0 +1,262 @@
+"""
+Price-trigger alerts over the open signals.
+
+Every signal on the published dashboards contributes price levels: an open
+V20 signal fires when the price falls to its buy_price, a filled one when it
+rises to its sell_price, and an MA Buy fires when the price falls to its price. Levels are
+held per symbol in sorted numpy arrays, so checking a batch of live prices
+costs two ``searchsorted`` calls per priced symbol however many triggers exist.
+
+A trigger fires when the price crosses its level between two checks, not
+because the price already sits beyond it. The last checked price per symbol is
+kept in ``ALERT_STATE_FILE``; a symbol seen for the first time only records
+its price.
+
+Fired triggers are recorded in FiredAlert and never fire again. Alerts are
+delivered to the sinks named in ``ALERT_SINKS`` before they are recorded, so a
+failed delivery is retried on the next check. The engine remembers which
+sinks already took an alert and skips them on the retry; across a restart a
+retried alert may reach a sink twice, so sinks should tolerate duplicates.
+"""
+import json
+import os
+import urllib.request
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import FiredAlert
+from ma.models import DashboardRow as MADashboardRow
+from signals.models import DashboardRow as SignalDashboardRow, Signal
+
+Alert = namedtuple('Alert', ['kind', 'signal_id', 'symbol', 'level', 'price'])
+
+# Trigger kinds that fire when the price falls to the level; the rest fire on a rise
+FALLING_KINDS = (FiredAlert.V20_BUY, FiredAlert.MA_BUY)
+
+
+def open_triggers():
+    """
+    Yield (kind, signal_id, symbol, level) for every signal on the published dashboards.
+
+    Open V20 signals trigger on their buy_price and filled ones on their sell_price.
+    """
+    for signal_id, symbol, buy_price, sell_price, status in SignalDashboardRow.objects.published().filter(
+        status__in=Signal.ACTIONABLE_STATUSES
+    ).values_list('signal_id', 'symbol', 'buy_price', 'sell_price', 'status').iterator(chunk_size=2000):
+        if status == Signal.OPEN:
+            yield FiredAlert.V20_BUY, signal_id, symbol, buy_price
+        else:
+            yield FiredAlert.V20_SELL, signal_id, symbol, sell_price
+
+    for signal_id, symbol, price in MADashboardRow.objects.published().filter(action='Buy').values_list(
+        'signal_id', 'symbol', 'price'
+    ).iterator(chunk_size=2000):
+        yield FiredAlert.MA_BUY, signal_id, symbol, price
+
+
+class TriggerIndex:
+    """
+    Per-symbol sorted arrays of trigger levels.
+
+    ``falling[symbol]`` and ``rising[symbol]`` hold (levels, kinds, signal_ids)
+    with levels sorted ascending.
+    """
+
+    def __init__(self, triggers, exclude=()):
+        exclude = set(exclude)
+        grouped = {}
+        for kind, signal_id, symbol, level in triggers:
+            if (kind, signal_id) in exclude:
+                continue
+            side = 'falling' if kind in FALLING_KINDS else 'rising'
+            grouped.setdefault((side, symbol), []).append((float(level), kind, signal_id))
+
+        self.falling = {}
+        self.rising = {}
+        for (side, symbol), rows in grouped.items():
+            rows.sort(key=lambda row: row[0])
+            levels, kinds, signal_ids = zip(*rows)
+            getattr(self, side)[symbol] = (
+                np.array(levels, dtype=float), np.array(kinds), np.array(signal_ids, dtype=np.int64)
+            )
+
+    @classmethod
+    def from_open_signals(cls):
+        """Build the index from the published dashboards, skipping triggers that already fired."""
+        fired = FiredAlert.objects.values_list('kind', 'signal_id')
+        return cls(open_triggers(), exclude=fired)
+
+    def __len__(self):
+        return sum(len(entry[0]) for side in (self.falling, self.rising) for entry in side.values())
+
+    @property
+    def symbols(self):
+        return sorted(set(self.falling) | set(self.rising))
+
+    def crossed(self, prices, previous):
+        """
+        Find triggers crossed by moving from the previous prices to ``prices``.
+
+        Args:
+            prices: Dictionary of {symbol: price}; None prices are skipped
+            previous: Dictionary of {symbol: last checked price}; symbols
+                missing from it cannot have crossed anything yet
+
+        Returns:
+            List of Alert
+        """
+        alerts = []
+        for symbol, price in prices.items():
+            last = previous.get(symbol)
+            if price is None or last is None:
+                continue
+            if symbol in self.falling and price < last:
+                levels, kinds, signal_ids = self.falling[symbol]
+                # Falling triggers fire for levels the price fell to: price <= level < last
+                start = np.searchsorted(levels, price, side='left')
+                stop = np.searchsorted(levels, last, side='left')
+                alerts.extend(self._alerts(symbol, price, levels, kinds, signal_ids, slice(start, stop)))
+            if symbol in self.rising and price > last:
+                levels, kinds, signal_ids = self.rising[symbol]
+                # Rising triggers fire for levels the price rose to: last < level <= price
+                start = np.searchsorted(levels, last, side='right')
+                stop = np.searchsorted(levels, price, side='right')
+                alerts.extend(self._alerts(symbol, price, levels, kinds, signal_ids, slice(start, stop)))
+        return alerts
+
+    def discard(self, alerts):
+        """Remove fired triggers so later checks skip them."""
+        keys = {(alert.kind, alert.signal_id) for alert in alerts}
+        for symbol in {alert.symbol for alert in alerts}:
+            for side in (self.falling, self.rising):
+                if symbol not in side:
+                    continue
+                levels, kinds, signal_ids = side[symbol]
+                keep = np.array([(kind, int(signal_id)) not in keys for kind, signal_id in zip(kinds, signal_ids)])
+                if keep.all():
+                    continue
+                if keep.any():
+                    side[symbol] = (levels[keep], kinds[keep], signal_ids[keep])
+                else:
+                    del side[symbol]
+
+    @staticmethod
+    def _alerts(symbol, price, levels, kinds, signal_ids, selected):
+        return [
+            Alert(str(kind), int(signal_id), symbol, float(level), float(price))
+            for level, kind, signal_id in zip(levels[selected], kinds[selected], signal_ids[selected])
+        ]
+
+
+class FileSink:
+    """Append alerts as JSON lines to ALERT_FILE."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.ALERT_FILE)
+
+    def send(self, alerts):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert_payload(alert), cls=DjangoJSONEncoder) + '\n')
+
+
+class WebhookSink:
+    """POST alerts as one JSON document to ALERT_WEBHOOK_URL."""
+
+    def __init__(self, url=None, timeout=10):
+        self.url = url or settings.ALERT_WEBHOOK_URL
+        self.timeout = timeout
+
+    def send(self, alerts):
+        if not self.url:
+            return
+        body = json.dumps({'alerts': [alert_payload(alert) for alert in alerts]}, cls=DjangoJSONEncoder)
+        request = urllib.request.Request(
+            self.url, data=body.encode(), headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def alert_payload(alert):
+    return {**alert._asdict(), 'fired_at': timezone.now()}
+
+
+def get_sinks():
+    """Instantiate the sinks listed in ALERT_SINKS."""
+    return [import_string(path)() for path in settings.ALERT_SINKS]
+
+
+def load_last_prices(path):
+    """Return {symbol: last checked price} from the alert state file."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_last_prices(path, prices):
+    """Write the alert state file atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(prices, f)
+    os.replace(tmp_path, path)
+
+
+class AlertEngine:
+    """Check price batches against a TriggerIndex and deliver newly crossed triggers."""
+
+    def __init__(self, index, sinks, last_prices=None):
+        self.index = index
+        self.sinks = sinks
+        # {symbol: price} of the last successful check
+        self.last_prices = dict(last_prices or {})
+        # Per sink, the (kind, signal_id) already delivered but not yet recorded
+        self.delivered = [set() for _ in sinks]
+
+    def check(self, prices):
+        """
+        Deliver and record the triggers crossed since the last check.
+
+        When a sink fails the exception propagates and the prices are not
+        taken as seen, so the next check finds the same crossings again and
+        sends them only to the sinks that have not received them.
+
+        Returns:
+            List of Alert fired by this check
+        """
+        alerts = self.index.crossed(prices, self.last_prices)
+        if alerts:
+            self.deliver(alerts)
+        self.last_prices.update({symbol: float(price) for symbol, price in prices.items() if price is not None})
+        return alerts
+
+    def deliver(self, alerts):
+        for sink, delivered in zip(self.sinks, self.delivered):
+            pending = [alert for alert in alerts if (alert.kind, alert.signal_id) not in delivered]
+            if pending:
+                sink.send(pending)
+                delivered.update((alert.kind, alert.signal_id) for alert in pending)
+
+        FiredAlert.objects.bulk_create(
+            [
+                FiredAlert(kind=alert.kind, signal_id=alert.signal_id, symbol=alert.symbol,
+                           level=round(alert.level, 2), price=alert.price)
+                for alert in alerts
+            ],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
+        self.index.discard(alerts)
+        for delivered in self.delivered:
+            delivered.difference_update((alert.kind, alert.signal_id) for alert in alerts)
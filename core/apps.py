@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+        from core.db import configure_sqlite
+        from core.models import Membership
+        from core.universes import clear_symbol_index
+
+        connection_created.connect(configure_sqlite, dispatch_uid='core.configure_sqlite')
+        post_save.connect(clear_symbol_index, sender=Membership, dispatch_uid='core.clear_symbol_index_save')
+        post_delete.connect(clear_symbol_index, sender=Membership, dispatch_uid='core.clear_symbol_index_delete')
@@ -0,0 +1,175 @@
+"""
+Cold storage for signal rows moved out of the hot database tables.
+
+Archived rows live in compressed ``.npz`` files partitioned by table and by the
+month of the signal date::
+
+    <SIGNAL_ARCHIVE_DIR>/<db_table>/<YYYY-MM>.npz
+
+``history()`` reads the hot table and the archive together, so backtests and
+history views see every signal regardless of where it is stored.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+
+def archive_columns(model):
+    """Return the archived field names of a model: every concrete field but the primary key."""
+    return [field.attname for field in model._meta.concrete_fields if not field.primary_key]
+
+
+def _normalize(model, frame):
+    """Coerce a frame of model rows to archive dtypes: dates, floats and strings."""
+    frame = frame.copy()
+    for field in model._meta.concrete_fields:
+        if field.attname not in frame:
+            continue
+        internal_type = field.get_internal_type()
+        if internal_type == 'DateField':
+            frame[field.attname] = pd.to_datetime(frame[field.attname])
+        elif internal_type in ('DecimalField', 'FloatField'):
+            frame[field.attname] = frame[field.attname].astype(float)
+        elif internal_type == 'CharField':
+            frame[field.attname] = frame[field.attname].astype(str)
+    return frame
+
+
+class SignalArchive:
+    """Month-partitioned columnar archive of signal rows."""
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.SIGNAL_ARCHIVE_DIR)
+
+    def partition_path(self, model, month):
+        """Return the file holding ``month`` (a 'YYYY-MM' string) of a model's rows."""
+        return self.root / model._meta.db_table / f"{month}.npz"
+
+    def partitions(self, model, start=None, end=None):
+        """List partition months stored for a model, optionally within [start, end)."""
+        directory = self.root / model._meta.db_table
+        if not directory.exists():
+            return []
+        months = sorted(path.stem for path in directory.glob('*.npz'))
+        if start is not None:
+            months = [month for month in months if month >= pd.Timestamp(start).strftime('%Y-%m')]
+        if end is not None:
+            months = [month for month in months if month <= pd.Timestamp(end).strftime('%Y-%m')]
+        return months
+
+    def load_partition(self, model, month):
+        path = self.partition_path(model, month)
+        if not path.exists():
+            return pd.DataFrame(columns=archive_columns(model))
+        with np.load(path, allow_pickle=False) as stored:
+            frame = pd.DataFrame({key: stored[key] for key in stored.files})
+        # Partitions written before a field was added get the field's default
+        for field in model._meta.concrete_fields:
+            if not field.primary_key and field.attname not in frame:
+                frame[field.attname] = field.get_default()
+        return frame
+
+    def append(self, model, frame):
+        """
+        Merge rows into their month partitions.
+
+        Rows already archived under the same natural key are kept as they are,
+        so archiving the same rows twice is harmless.
+
+        Returns:
+            Number of rows written
+        """
+        if frame.empty:
+            return 0
+        frame = _normalize(model, frame[archive_columns(model)])
+        months = frame['date'].dt.strftime('%Y-%m')
+
+        for month, rows in frame.groupby(months):
+            merged = pd.concat([self.load_partition(model, month), rows], ignore_index=True)
+            merged = _normalize(model, merged).drop_duplicates(subset=list(model.NATURAL_KEY), keep='first')
+            self._write(self.partition_path(model, month), merged.sort_values(['date', 'symbol']))
+        return len(frame)
+
+    def read(self, model, start=None, end=None, symbols=None):
+        """
+        Read archived rows with ``start <= date < end``.
+
+        Returns:
+            DataFrame with the model's archive columns
+        """
+        frames = [self.load_partition(model, month) for month in self.partitions(model, start, end)]
+        if not frames:
+            return _normalize(model, pd.DataFrame(columns=archive_columns(model)))
+        frame = _normalize(model, pd.concat(frames, ignore_index=True))
+        return _filter(frame, start, end, symbols)
+
+    def _write(self, path, frame):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        for column in frame.columns:
+            values = frame[column]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                arrays[column] = values.to_numpy(dtype='datetime64[D]')
+            elif pd.api.types.is_numeric_dtype(values):
+                arrays[column] = values.to_numpy()
+            else:
+                arrays[column] = values.to_numpy(dtype=str)
+
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _filter(frame, start=None, end=None, symbols=None):
+    if start is not None:
+        frame = frame[frame['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame['date'] < pd.Timestamp(end)]
+    if symbols is not None:
+        frame = frame[frame['symbol'].isin(list(symbols))]
+    return frame
+
+
+def history(model, start=None, end=None, symbols=None, filters=None, archive=None):
+    """
+    Read signals from the hot table and the archive as one DataFrame.
+
+    Args:
+        model: Signal model with a ``NATURAL_KEY``
+        start: Optional first date to include
+        end: Optional date to stop before
+        symbols: Optional iterable of symbols to include
+        filters: Optional {field: value} equality filters, e.g. {'universe': 'v40'}
+        archive: SignalArchive to read from (default: SIGNAL_ARCHIVE_DIR)
+
+    Returns:
+        DataFrame with the model's archive columns; a row present in both
+        places (archived but not yet deleted) is returned once
+    """
+    columns = archive_columns(model)
+    filters = filters or {}
+    queryset = model.objects.filter(**filters)
+    if start is not None:
+        queryset = queryset.filter(date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(date__lt=end)
+    if symbols is not None:
+        queryset = queryset.filter(symbol__in=list(symbols))
+
+    hot = _normalize(model, pd.DataFrame.from_records(queryset.values(*columns), columns=columns))
+    cold = (archive or SignalArchive()).read(model, start, end, symbols)
+    for field, value in filters.items():
+        cold = cold[cold[field] == value]
+
+    combined = pd.concat([hot, cold], ignore_index=True)
+    return combined.drop_duplicates(subset=list(model.NATURAL_KEY), keep='first').reset_index(drop=True)
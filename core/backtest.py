@@ -0,0 +1,199 @@
+"""
+Vectorized backtests of stored signals against cached price history.
+
+Signals are grouped per symbol and evaluated as a (signals x bars) matrix with
+numpy, so there is no Python loop per signal.
+
+V20 signals are limit orders: the buy fills on the first bar after the signal
+date whose low reaches ``buy_price``, and the target is hit on the first later
+bar whose high reaches ``sell_price``. MA Buy signals fill at their price on
+the signal date and exit at the symbol's next Sell signal, or are marked to the
+latest close while still open.
+"""
+import numpy as np
+import pandas as pd
+
+RESULT_COLUMNS = ['status', 'fill_date', 'exit_date', 'days_held', 'mae_pct', 'return_pct']
+
+# Signals evaluated per matrix; bounds memory at CHUNK_SIZE x bars booleans
+CHUNK_SIZE = 2000
+
+
+def _price_arrays(data):
+    return (
+        data.index.to_numpy(dtype='datetime64[D]'),
+        data['Low'].to_numpy(dtype=float),
+        data['High'].to_numpy(dtype=float),
+        data['Close'].to_numpy(dtype=float),
+    )
+
+
+def _collect(frames, index):
+    """Combine per-symbol results; signals without quotes get status 'no_data'."""
+    if frames:
+        results = pd.concat(frames).reindex(index)
+    else:
+        results = pd.DataFrame(index=index, columns=RESULT_COLUMNS)
+    results['status'] = results['status'].fillna('no_data')
+    return results
+
+
+def _window_min(lows, start, end):
+    """Minimum low over the inclusive bar ranges [start, end] of each row."""
+    bars = np.arange(len(lows))
+    window = (bars >= start[:, None]) & (bars <= end[:, None])
+    return np.where(window, lows, np.inf).min(axis=1)
+
+
+def _limit_order_chunk(dates, lows, highs, closes, signal_dates, buy, sell):
+    n = len(dates)
+    bars = np.arange(n)
+
+    # Fill on the first bar after the signal date that trades at or below the buy price
+    first_bar = np.searchsorted(dates, signal_dates, side='right')
+    fill_mask = (bars >= first_bar[:, None]) & (lows <= buy[:, None])
+    filled = fill_mask.any(axis=1)
+    fill_idx = fill_mask.argmax(axis=1)
+
+    # Target counts only on bars after the fill bar, since intraday order is unknown
+    target_mask = (bars > fill_idx[:, None]) & (highs >= sell[:, None]) & filled[:, None]
+    hit = target_mask.any(axis=1)
+    exit_idx = np.where(hit, target_mask.argmax(axis=1), n - 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mae = (_window_min(lows, fill_idx, exit_idx) / buy - 1) * 100
+        exit_price = np.where(hit, sell, closes[-1])
+        returns = (exit_price / buy - 1) * 100
+
+    status = np.where(hit, 'target_hit', np.where(filled, 'open', 'unfilled'))
+    fill_dates = np.where(filled, dates[fill_idx], np.datetime64('NaT'))
+    exit_dates = np.where(hit, dates[exit_idx], np.datetime64('NaT'))
+    return pd.DataFrame({
+        'status': status,
+        'fill_date': fill_dates,
+        'exit_date': exit_dates,
+        'days_held': np.where(filled, (dates[exit_idx] - dates[fill_idx]).astype(int), np.nan),
+        'mae_pct': np.where(filled, np.round(mae, 2), np.nan),
+        'return_pct': np.where(filled, np.round(returns, 2), np.nan),
+    })
+
+
+def backtest_limit_orders(signals, stock_quotes):
+    """
+    Evaluate V20-style limit-order signals.
+
+    Args:
+        signals: DataFrame with symbol, date, buy_price and sell_price columns
+        stock_quotes: Dictionary of {symbol: OHLC DataFrame}
+
+    Returns:
+        ``signals`` joined with RESULT_COLUMNS; status is one of 'no_data',
+        'unfilled', 'open' or 'target_hit'
+    """
+    evaluated = []
+    for symbol, group in signals.groupby('symbol', sort=False):
+        data = stock_quotes.get(symbol)
+        if data is None or data.empty:
+            continue
+        arrays = _price_arrays(data.sort_index())
+        for start in range(0, len(group), CHUNK_SIZE):
+            chunk = group.iloc[start:start + CHUNK_SIZE]
+            frame = _limit_order_chunk(
+                *arrays,
+                pd.to_datetime(chunk['date']).to_numpy(dtype='datetime64[D]'),
+                chunk['buy_price'].to_numpy(dtype=float),
+                chunk['sell_price'].to_numpy(dtype=float),
+            )
+            frame.index = chunk.index
+            evaluated.append(frame)
+    # Stored lifecycle columns such as status give way to the backtest's own
+    return signals.drop(columns=RESULT_COLUMNS, errors='ignore').join(_collect(evaluated, signals.index))
+
+
+def backtest_ma(signals, stock_quotes):
+    """
+    Evaluate MA Buy signals, exiting at the next Sell signal or the latest close.
+
+    Args:
+        signals: DataFrame with symbol, date, action and price columns
+        stock_quotes: Dictionary of {symbol: OHLC DataFrame}
+
+    Returns:
+        The Buy rows of ``signals`` joined with RESULT_COLUMNS; status is one
+        of 'no_data', 'open' or 'closed'
+    """
+    buys = signals[signals['action'].str.lower() == 'buy']
+    sells = signals[signals['action'].str.lower() == 'sell']
+    sells_by_symbol = {symbol: group.sort_values('date') for symbol, group in sells.groupby('symbol')}
+    evaluated = []
+
+    for symbol, group in buys.groupby('symbol', sort=False):
+        data = stock_quotes.get(symbol)
+        if data is None or data.empty:
+            continue
+        dates, lows, highs, closes = _price_arrays(data.sort_index())
+        signal_dates = pd.to_datetime(group['date']).to_numpy(dtype='datetime64[D]')
+        entry = group['price'].to_numpy(dtype=float)
+
+        symbol_sells = sells_by_symbol.get(symbol, sells.iloc[:0])
+        sell_dates = pd.to_datetime(symbol_sells['date']).to_numpy(dtype='datetime64[D]')
+        sell_prices = symbol_sells['price'].to_numpy(dtype=float)
+
+        # The next Sell strictly after each Buy closes the position; open ones
+        # fall through to a sentinel holding the latest bar
+        next_sell = np.searchsorted(sell_dates, signal_dates, side='right')
+        closed = next_sell < len(sell_dates)
+        exit_dates = np.append(sell_dates, dates[-1])[next_sell]
+        exit_price = np.append(sell_prices, closes[-1])[next_sell]
+
+        entry_idx = np.minimum(np.searchsorted(dates, signal_dates, side='left'), len(dates) - 1)
+        exit_idx = np.maximum(np.searchsorted(dates, exit_dates, side='right') - 1, entry_idx)
+
+        mae = (_window_min(lows, entry_idx, exit_idx) / entry - 1) * 100
+        evaluated.append(pd.DataFrame({
+            'status': np.where(closed, 'closed', 'open'),
+            'fill_date': signal_dates,
+            'exit_date': np.where(closed, exit_dates, np.datetime64('NaT')),
+            'days_held': (exit_dates - signal_dates).astype(int),
+            'mae_pct': np.round(mae, 2),
+            'return_pct': np.round((exit_price / entry - 1) * 100, 2),
+        }, index=group.index))
+
+    return buys.drop(columns=RESULT_COLUMNS, errors='ignore').join(_collect(evaluated, buys.index))
+
+
+def summarize(results, hit_statuses=('target_hit',)):
+    """
+    Aggregate backtest results per universe and strategy.
+
+    Args:
+        results: Output of backtest_limit_orders or backtest_ma
+        hit_statuses: Statuses that count as hits; without any, a hit is a
+            filled signal with a positive return
+
+    Returns:
+        DataFrame indexed by (universe, strategy)
+    """
+    filled = results['fill_date'].notna()
+    if hit_statuses:
+        hits = results['status'].isin(hit_statuses)
+    else:
+        hits = filled & (results['return_pct'].astype(float) > 0)
+
+    frame = results.assign(
+        filled=filled,
+        hit=hits,
+        days_held=results['days_held'].astype(float),
+        mae_pct=results['mae_pct'].astype(float),
+        return_pct=results['return_pct'].astype(float),
+    )
+    summary = frame.groupby(['universe', 'strategy']).agg(
+        signals=('symbol', 'size'),
+        filled=('filled', 'sum'),
+        hits=('hit', 'sum'),
+        avg_days_held=('days_held', 'mean'),
+        avg_mae_pct=('mae_pct', 'mean'),
+        avg_return_pct=('return_pct', 'mean'),
+    )
+    summary['hit_rate'] = (summary['hits'] / summary['filled'].where(summary['filled'] > 0)).round(4)
+    return summary.round(2)
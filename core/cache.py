@@ -0,0 +1,59 @@
+"""
+Response caching for the list views keyed by the processed-data version.
+
+Rendered pages are cached per (view, path, query params, data version), so a
+finished processing run invalidates them by publishing a new ``DataVersion``. Cached
+responses carry ETag and Last-Modified headers for cheap revalidation by
+browsers and any CDN in front of the app.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from core.models import DataVersion
+
+
+class VersionedCacheMixin:
+    """Cache GET responses of a class-based view until the data version changes."""
+
+    def get_response_cache_key(self, request, version):
+        params = urlencode(sorted(request.GET.lists()), doseq=True)
+        raw_key = f"{type(self).__module__}.{type(self).__name__}:{request.path}:{params}:{version}"
+        return 'view-cache:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = self.get_response_cache_key(request, DataVersion.current().version)
+        cached = cache.get(key)
+
+        if cached is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            if response.status_code != 200:
+                return response
+            cached = (response.content, response['Content-Type'], time.time())
+            cache.set(key, cached, settings.RESPONSE_CACHE_TIMEOUT)
+        else:
+            response = HttpResponse(cached[0], content_type=cached[1])
+
+        content, _, rendered_at = cached
+        etag = quote_etag(hashlib.md5(content).hexdigest())
+        last_modified = int(rendered_at)
+
+        conditional_response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified, response=response
+        )
+        conditional_response['ETag'] = etag
+        conditional_response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(conditional_response, public=True, max_age=0, must_revalidate=True)
+        return conditional_response
@@ -0,0 +1,76 @@
+"""
+Per-symbol strategy checkpoints shared by the V20 and MA processors.
+
+A checkpoint stores the adjustment basis of the quotes it was computed on.
+When the quote store re-adjusts a symbol its checkpoints no longer apply:
+the symbol is evaluated from scratch and its stored signals are replaced.
+"""
+from django.utils import timezone
+
+from core.db import bulk_upsert
+from core.models import StrategyCheckpoint
+
+
+def load_checkpoints(strategy, universe, symbols):
+    """
+    Load the checkpoints of a strategy for the given symbols.
+
+    Returns:
+        Dictionary of {symbol: (last_date, state)}
+    """
+    rows = StrategyCheckpoint.objects.filter(
+        strategy=strategy, universe=universe, symbol__in=list(symbols)
+    ).values_list('symbol', 'last_date', 'state')
+    return {symbol: (last_date, state) for symbol, last_date, state in rows.iterator(chunk_size=2000)}
+
+
+def save_checkpoints(strategy, universe, checkpoints):
+    """
+    Upsert checkpoints given as {symbol: (last_date, state)}.
+
+    Returns:
+        Number of checkpoints written
+    """
+    now = timezone.now()
+    return bulk_upsert(
+        StrategyCheckpoint,
+        [
+            StrategyCheckpoint(
+                strategy=strategy, universe=universe, symbol=symbol,
+                last_date=last_date, state=state, updated_at=now,
+            )
+            for symbol, (last_date, state) in checkpoints.items()
+        ],
+        unique_fields=('strategy', 'universe', 'symbol'),
+        update_fields=['last_date', 'state', 'updated_at'],
+    )
+
+
+def split_rebased(checkpoints, bases):
+    """
+    Set aside checkpoints computed on an older adjustment basis of their quotes.
+
+    Args:
+        checkpoints: Dictionary of {symbol: (last_date, state)}
+        bases: Dictionary of {symbol: basis}, e.g. ``QuoteStore.bases``;
+            checkpoints of symbols missing from it are kept
+
+    Returns:
+        Tuple of (checkpoints still valid, set of symbols re-adjusted since
+        their checkpoint)
+    """
+    current, rebased = {}, set()
+    for symbol, (last_date, state) in checkpoints.items():
+        if symbol not in bases or state.get('basis', 0) == bases[symbol]:
+            current[symbol] = (last_date, state)
+        else:
+            rebased.add(symbol)
+    return current, rebased
+
+
+def stamp_basis(checkpoints, bases):
+    """Record in each checkpoint the adjustment basis of the quotes it was computed on."""
+    return {
+        symbol: (last_date, {**state, 'basis': bases.get(symbol, 0)})
+        for symbol, (last_date, state) in checkpoints.items()
+    }
@@ -0,0 +1,40 @@
+"""Shared helpers for building the precomputed dashboard tables."""
+from core.quote_store import QuoteStore
+from core.utils import LTHHelper
+
+
+def latest_closes(symbols, store=None):
+    """Return the last stored close for each symbol that has quotes on disk."""
+    store = store or QuoteStore()
+    closes = {}
+    for symbol in set(symbols):
+        data, _ = store.load(symbol)
+        if data is not None and not data.empty:
+            closes[symbol] = round(float(data['Close'].iloc[-1]), 4)
+    return closes
+
+
+def lth_columns(symbols):
+    """
+    Compute the LTH-related dashboard columns for many symbols.
+
+    Returns:
+        Dictionary of {symbol: {lth_price, lth_date, close_price, distance_from_lth}}
+    """
+    lth_data = LTHHelper.get_lth_bulk(symbols)
+    closes = latest_closes(symbols)
+
+    columns = {}
+    for symbol in set(symbols):
+        lth = lth_data.get(symbol)
+        close_price = closes.get(symbol)
+        distance = None
+        if lth and close_price is not None:
+            distance = LTHHelper.distance_from_lth_price(close_price, lth['lth_price'])
+        columns[symbol] = {
+            'lth_price': lth['lth_price'] if lth else None,
+            'lth_date': lth['lth_date'] if lth else None,
+            'close_price': close_price,
+            'distance_from_lth': distance,
+        }
+    return columns
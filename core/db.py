@@ -0,0 +1,45 @@
+"""Database helpers shared by the processing commands."""
+from django.conf import settings
+from django.db import connections, router, transaction
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to each new SQLite connection (connection_created receiver)."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+def bulk_upsert(model, objects, unique_fields, update_fields, batch_size=500):
+    """
+    Insert or update many model instances in one transaction.
+
+    Rows whose ``unique_fields`` already exist get only ``update_fields``
+    overwritten, so columns such as ``added_date`` keep their original value.
+    Instances sharing a natural key within the batch are collapsed to the last
+    one, since PostgreSQL refuses to upsert the same row twice in one statement.
+    Keys are compared as the database will store them, so e.g. float prices
+    that round to the same DecimalField value count as one row.
+
+    Returns:
+        Number of distinct rows written
+    """
+    connection = connections[router.db_for_write(model)]
+    fields = [model._meta.get_field(name) for name in unique_fields]
+    unique_objects = {}
+    for obj in objects:
+        key = tuple(field.get_db_prep_save(getattr(obj, field.attname), connection) for field in fields)
+        unique_objects[key] = obj
+
+    with transaction.atomic():
+        model.objects.bulk_create(
+            list(unique_objects.values()),
+            update_conflicts=True,
+            unique_fields=list(unique_fields),
+            update_fields=list(update_fields),
+            batch_size=batch_size,
+        )
+
+    return len(unique_objects)
@@ -0,0 +1,132 @@
+"""
+Streaming JSON and CSV exports of the signal and LTH tables.
+
+Rows are read with a server-side iterator and written out in batches, so an
+export of the full history runs in constant memory. Results are ordered by
+primary key; pass the returned ``next`` value (or the last ``id`` of a CSV
+page) as ``after`` to fetch the following page.
+
+Query parameters:
+    format: 'json' (default) or 'csv'
+    after: Only rows with an id greater than this cursor
+    limit: Maximum number of rows to return (default: all)
+    since, until: Date range on the model's date field, ``since <= date < until``
+    <field>: Equality filter on any of the view's ``filter_fields``
+"""
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.gzip import gzip_page
+
+
+class ExportError(ValueError):
+    """Invalid export query parameter."""
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+@method_decorator(gzip_page, name='dispatch')
+class ExportView(View):
+    """Read-only streaming export of one model."""
+    model = None
+    fields = ()
+    filter_fields = ()
+    date_field = 'date'
+    chunk_size = 2000  # Rows fetched from the database cursor at a time
+    batch_size = 500  # Rows serialized into each streamed chunk
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def filter_queryset(self, queryset, params):
+        for field in self.filter_fields:
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+
+        for param, lookup in (('since', 'gte'), ('until', 'lt')):
+            if params.get(param):
+                queryset = queryset.filter(**{f'{self.date_field}__{lookup}': self._parse_date(param, params[param])})
+
+        if params.get('after'):
+            queryset = queryset.filter(pk__gt=self._parse_int('after', params['after']))
+
+        queryset = queryset.order_by('pk')
+        limit = params.get('limit')
+        if limit:
+            queryset = queryset[:self._parse_int('limit', limit)]
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'json')
+        try:
+            if export_format not in ('json', 'csv'):
+                raise ExportError(f"Unknown format '{export_format}'; use json or csv")
+            queryset = self.filter_queryset(self.get_queryset(), request.GET)
+        except ExportError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        columns = ['id', *self.fields]
+        rows = queryset.values(*columns).iterator(chunk_size=self.chunk_size)
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+
+        if export_format == 'csv':
+            response = StreamingHttpResponse(self.stream_csv(rows, columns), content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="{self.model._meta.model_name}.csv"'
+        else:
+            response = StreamingHttpResponse(self.stream_json(rows, limit), content_type='application/json')
+        return response
+
+    def stream_json(self, rows, limit):
+        """Yield ``{"results": [...], "next": cursor}``; next is None on the last page."""
+        yield '{"results": ['
+        count, last_id, separator = 0, None, ''
+        for batch in self._batches(rows):
+            yield separator + ','.join(json.dumps(row, cls=DjangoJSONEncoder) for row in batch)
+            separator = ','
+            count += len(batch)
+            last_id = batch[-1]['id']
+        next_cursor = last_id if limit is not None and count == limit else None
+        yield f'], "next": {json.dumps(next_cursor)}}}'
+
+    def stream_csv(self, rows, columns):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for batch in self._batches(rows):
+            yield ''.join(writer.writerow([row[column] for column in columns]) for row in batch)
+
+    def _batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _parse_int(param, value):
+        try:
+            number = int(value)
+        except ValueError:
+            raise ExportError(f"'{param}' must be an integer")
+        if number < 0:
+            raise ExportError(f"'{param}' must not be negative")
+        return number
+
+    @staticmethod
+    def _parse_date(param, value):
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise ExportError(f"'{param}' must be a date in YYYY-MM-DD format")
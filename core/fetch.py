@@ -0,0 +1,187 @@
+"""
+Asynchronous quote fetching with bounded concurrency, rate limiting and retries.
+
+Quotes come from a pluggable ``QuoteProvider`` so tests and benchmarks can swap
+Yahoo Finance for local fixtures. Providers with a multi-symbol endpoint fetch
+``batch_size`` symbols per request, and the rate limit applies per request. ``AsyncQuoteFetcher.get_stock_quotes`` has the
+same signature as ``StockReader.get_stock_quotes`` and can be handed to
+``QuoteStore.get_stock_quotes`` as its ``fetch`` callable.
+"""
+import asyncio
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from core.parallel import shard
+
+
+class QuoteProvider(ABC):
+    """Interface for quote sources used by AsyncQuoteFetcher."""
+    batch_size = 1  # Symbols per request
+
+    @abstractmethod
+    async def fetch(self, symbol, start_date, end_date):
+        """Return a DataFrame of daily OHLCV quotes for one symbol."""
+
+    async def fetch_batch(self, symbols, start_date, end_date):
+        """
+        Fetch up to ``batch_size`` symbols in one request.
+
+        Returns:
+            Dictionary of {symbol: DataFrame}; symbols left out count as failed
+        """
+        return {symbol: await self.fetch(symbol, start_date, end_date) for symbol in symbols}
+
+
+class YFinanceProvider(QuoteProvider):
+    """Fetch daily quotes from Yahoo Finance with ``yf.download`` in a worker thread."""
+    batch_size = 50
+
+    def __init__(self):
+        # yf.download keeps its results in module globals, so calls must not overlap;
+        # it parallelizes the symbols of one call itself
+        self._lock = threading.Lock()
+
+    async def fetch(self, symbol, start_date, end_date):
+        quotes = await self.fetch_batch([symbol], start_date, end_date)
+        if symbol not in quotes:
+            raise LookupError(f"No quotes returned for {symbol}")
+        return quotes[symbol]
+
+    async def fetch_batch(self, symbols, start_date, end_date):
+        return await asyncio.to_thread(self._download, list(symbols), start_date, end_date)
+
+    def _download(self, symbols, start_date, end_date):
+        import yfinance as yf
+
+        with self._lock:
+            # Split and dividend adjusted; QuoteStore re-fetches the history when the adjustment moves
+            data = yf.download(
+                symbols, start=start_date, end=end_date, group_by='ticker', auto_adjust=True,
+                progress=False, multi_level_index=True,
+            )
+        quotes = {}
+        if data is None or data.empty:
+            return quotes
+        for symbol in symbols:
+            if symbol in data.columns.get_level_values(0):
+                frame = data[symbol].dropna(how='all')
+                if not frame.empty:
+                    quotes[symbol] = frame
+        return quotes
+
+
+class FixtureProvider(QuoteProvider):
+    """Serve quotes from in-memory frames or ``<symbol>.csv`` files in a directory."""
+
+    def __init__(self, quotes=None, directory=None):
+        self.quotes = dict(quotes or {})
+        self.directory = Path(directory or getattr(settings, 'QUOTE_FIXTURE_DIR', '.'))
+
+    async def fetch(self, symbol, start_date, end_date):
+        data = self.quotes.get(symbol)
+        if data is None:
+            path = self.directory / f"{symbol}.csv"
+            if not path.exists():
+                raise KeyError(f"No fixture quotes for {symbol}")
+            data = pd.read_csv(path, index_col=0, parse_dates=True)
+        return data[(data.index >= start_date) & (data.index < end_date)]
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncQuoteFetcher:
+    """Fetch many symbols concurrently and record which ones failed."""
+
+    def __init__(self, provider, concurrency=8, rate=5.0, retries=3, backoff=0.5):
+        self.provider = provider
+        self.concurrency = concurrency
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        # Failures accumulated across calls: {symbol: error message}
+        self.failures = {}
+
+    @classmethod
+    def from_settings(cls):
+        """Build a fetcher from the QUOTE_* settings."""
+        return cls(
+            import_string(settings.QUOTE_PROVIDER)(),
+            concurrency=settings.QUOTE_FETCH_CONCURRENCY,
+            rate=settings.QUOTE_FETCH_RATE,
+            retries=settings.QUOTE_FETCH_RETRIES,
+            backoff=settings.QUOTE_FETCH_BACKOFF,
+        )
+
+    async def fetch_many(self, symbols, start_date, end_date):
+        """
+        Fetch quotes for many symbols, ``provider.batch_size`` per request.
+
+        A failed request is retried for the whole batch; symbols missing from
+        a batch's result are retried on their own attempt budget too.
+
+        Returns:
+            Tuple of ({symbol: DataFrame}, {symbol: error message})
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate)
+        quotes = {}
+        failures = {}
+
+        async def fetch_batch(batch):
+            pending = list(batch)
+            async with semaphore:
+                for attempt in range(self.retries + 1):
+                    await bucket.acquire()
+                    try:
+                        fetched = await self.provider.fetch_batch(pending, start_date, end_date)
+                        quotes.update({symbol: fetched[symbol] for symbol in pending if symbol in fetched})
+                        pending = [symbol for symbol in pending if symbol not in fetched]
+                        error = "LookupError: No quotes returned"
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                    if not pending:
+                        return
+                    if attempt == self.retries:
+                        failures.update({symbol: error for symbol in pending})
+                        return
+                    # Exponential backoff with jitter before the next attempt
+                    delay = self.backoff * (2 ** attempt)
+                    await asyncio.sleep(delay + random.uniform(0, delay))
+
+        await asyncio.gather(*(fetch_batch(batch) for batch in shard(list(symbols), self.provider.batch_size)))
+        return quotes, failures
+
+    def get_stock_quotes(self, symbols, start_date, end_date):
+        """Synchronous entry point matching ``StockReader.get_stock_quotes``."""
+        quotes, failures = asyncio.run(self.fetch_many(list(symbols), start_date, end_date))
+        for symbol in quotes:
+            self.failures.pop(symbol, None)
+        self.failures.update(failures)
+        return quotes
@@ -0,0 +1,146 @@
+"""
+Per-stage timing for the processing commands and the persisted run ledger.
+
+Stages are timed in memory with ``StageRecorder.stage`` so the same code works
+inside process-pool workers, which must not write to the database. The parent
+process persists everything once through ``record_run``:
+
+    with record_run('process_stocks') as recorder:
+        with recorder.stage('fetch', universe='v40') as stage:
+            quotes = fetch(...)
+            stage.rows = sum(len(data) for data in quotes.values())
+"""
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import numpy as np
+from django.utils import timezone
+
+from core.models import PipelineRun, StageTiming
+
+
+class StageStats:
+    """Timing and counters for one stage; ``rows`` and ``failed`` are set by the caller."""
+
+    def __init__(self, stage, universe=''):
+        self.stage = stage
+        self.universe = universe
+        self.seconds = 0.0
+        self.rows = 0
+        self.failed = 0
+
+
+class StageRecorder:
+    """Collect stage timings in memory until the run is persisted."""
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, universe=''):
+        stats = StageStats(name, universe)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds = time.perf_counter() - started
+            self.stages.append(stats)
+
+    def extend(self, stages):
+        """Add stages recorded elsewhere, e.g. returned by a pool worker."""
+        self.stages.extend(stages)
+
+    def totals(self):
+        """Return {stage: seconds} summed over universes, in first-seen order."""
+        totals = {}
+        for stats in self.stages:
+            totals[stats.stage] = totals.get(stats.stage, 0.0) + stats.seconds
+        return totals
+
+    @property
+    def failed(self):
+        return sum(stats.failed for stats in self.stages)
+
+
+@contextmanager
+def record_run(command):
+    """
+    Record a PipelineRun ledger row around a command's work.
+
+    Yields:
+        StageRecorder whose stages are saved when the block exits, whether it
+        finished or raised
+    """
+    run = PipelineRun.objects.create(command=command)
+    recorder = StageRecorder()
+    try:
+        yield recorder
+    except BaseException as e:
+        run.status = PipelineRun.FAILED
+        run.error = f"{type(e).__name__}: {e}"
+        raise
+    else:
+        run.status = PipelineRun.PARTIAL if recorder.failed else PipelineRun.SUCCESS
+    finally:
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'error', 'finished_at'])
+        StageTiming.objects.bulk_create([
+            StageTiming(
+                run=run,
+                stage=stats.stage,
+                universe=stats.universe,
+                seconds=stats.seconds,
+                rows=stats.rows,
+                failed=stats.failed,
+            )
+            for stats in recorder.stages
+        ])
+
+
+def stage_series(runs):
+    """
+    Sum each run's stage timings over universes.
+
+    Args:
+        runs: Iterable of PipelineRun with ``stages`` prefetched, oldest first
+
+    Returns:
+        Dictionary of {(command, stage): [(started_at, seconds), ...]}
+    """
+    series = {}
+    for run in runs:
+        totals = {}
+        for stats in run.stages.all():
+            totals[stats.stage] = totals.get(stats.stage, 0.0) + stats.seconds
+        for stage, seconds in totals.items():
+            series.setdefault((run.command, stage), []).append((run.started_at, seconds))
+    return series
+
+
+def percentiles(values):
+    """Return (p50, p95) of a list of timings."""
+    return tuple(float(p) for p in np.percentile(values, [50, 95]))
+
+
+def find_regressions(series, window=timedelta(days=7), threshold=1.5):
+    """
+    Compare each stage's latest timing with the median of the trailing window.
+
+    Returns:
+        List of (command, stage, latest, baseline) where latest exceeds
+        ``threshold`` times the baseline median
+    """
+    regressions = []
+    for (command, stage), points in sorted(series.items()):
+        latest_at, latest = points[-1]
+        baseline = [
+            seconds for started_at, seconds in points[:-1]
+            if started_at >= latest_at - window
+        ]
+        if not baseline:
+            continue
+        median = float(np.median(baseline))
+        if median > 0 and latest > threshold * median:
+            regressions.append((command, stage, latest, median))
+    return regressions
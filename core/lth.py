@@ -0,0 +1,80 @@
+"""Vectorized Life Time High (LTH) computation across many symbols."""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.models import StockLTH
+from core.panel import build_panel
+
+LTHResult = namedtuple('LTHResult', ['summary', 'running_high', 'drawdown_pct'])
+
+
+def compute_lth(stock_quotes):
+    """
+    Compute LTH statistics for every symbol in one pass over a close matrix.
+
+    Args:
+        stock_quotes: Dictionary of {symbol: DataFrame} with stock data
+
+    Returns:
+        LTHResult with:
+            summary: DataFrame indexed by symbol with lth_price, lth_date,
+                last_close and drawdown_pct (distance of last close from LTH)
+            running_high: dates x symbols running all-time-high
+            drawdown_pct: dates x symbols percentage below the running high
+    """
+    closes = build_panel(stock_quotes, fields=('Close',))['Close']
+    closes = closes.loc[:, closes.notna().any()]
+    empty = pd.DataFrame(columns=['lth_price', 'lth_date', 'last_close', 'drawdown_pct'])
+    if closes.empty:
+        return LTHResult(empty, closes, closes)
+
+    values = closes.to_numpy()
+    columns = np.arange(values.shape[1])
+
+    # argmax returns the first occurrence, matching Series.idxmax()
+    lth_rows = np.where(np.isnan(values), -np.inf, values).argmax(axis=0)
+    lth_prices = values[lth_rows, columns]
+
+    last_rows = values.shape[0] - 1 - np.isnan(values[::-1]).argmin(axis=0)
+    last_closes = values[last_rows, columns]
+
+    running_high = np.fmax.accumulate(values, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown_pct = (values / running_high - 1) * 100
+
+    summary = pd.DataFrame({
+        'lth_price': lth_prices,
+        'lth_date': closes.index[lth_rows].date,
+        'last_close': last_closes,
+        'drawdown_pct': np.round((last_closes / lth_prices - 1) * 100, 2),
+    }, index=closes.columns)
+
+    return LTHResult(
+        summary,
+        pd.DataFrame(running_high, index=closes.index, columns=closes.columns),
+        pd.DataFrame(drawdown_pct, index=closes.index, columns=closes.columns),
+    )
+
+
+def lth_records(stock_quotes):
+    """Return {symbol: (lth_price, lth_date)} in the shape bulk_update_lth_if_higher expects."""
+    summary = compute_lth(stock_quotes).summary
+    return {
+        symbol: (row.lth_price, row.lth_date)
+        for symbol, row in summary.iterrows()
+    }
+
+
+def update_lth_from_quotes(stock_quotes, universe=None):
+    """
+    Compute LTH for all quotes and merge the results into StockLTH.
+
+    Returns:
+        Dictionary with 'new', 'updated', 'unchanged' and 'processed' counts
+    """
+    records = lth_records(stock_quotes)
+    result = StockLTH.bulk_update_lth_if_higher(records, universe=universe)
+    result['processed'] = len(records)
+    return result
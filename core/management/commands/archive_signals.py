@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from core.archive import SignalArchive, archive_columns
+from core.instrumentation import record_run
+from core.parallel import shard
+from core.publish import publish_dashboards
+from signals.models import Signal
+from ma.models import StockSignal
+import datetime
+import pandas as pd
+import time
+
+# Signal tables, the queryset of rows their dashboard shows, and the rows kept
+# however old they are. V20 signals are deduplicated per universe, so a symbol
+# shown in several universes keeps each row; open and filled V20 signals are
+# still tracked by advance_signals, so they never age out.
+TABLES = {
+    'signals': (Signal, lambda: Signal.objects.deduplicated(), Q(status__in=Signal.ACTIONABLE_STATUSES)),
+    'ma': (StockSignal, lambda: StockSignal.objects.lowest_per_symbol(), None),
+}
+
+
+class Command(BaseCommand):
+    help = 'Move old or superseded signals from the database into the compressed signal archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.SIGNAL_RETENTION_DAYS,
+            help=f'Archive signals dated more than this many days ago, except open or filled V20 signals (default: {settings.SIGNAL_RETENTION_DAYS})',
+        )
+        parser.add_argument(
+            '--superseded',
+            action='store_true',
+            help='Also archive signals the dashboards no longer show; '
+                 'rows inside the strategy lookback come back on the next run',
+        )
+        parser.add_argument(
+            '--table',
+            choices=sorted(TABLES),
+            help='Only archive this table (default: all)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows deleted per transaction (default: 500)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.05,
+            help='Seconds to pause between delete batches so web requests get the database (default: 0.05)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many rows would be archived',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now().date() - datetime.timedelta(days=options['days'])
+        archive = SignalArchive()
+        tables = [options['table']] if options['table'] else sorted(TABLES)
+        total = 0
+
+        with record_run('archive_signals') as recorder:
+            for name in tables:
+                model, shown, active = TABLES[name]
+                candidates = Q(date__lt=cutoff)
+                if active is not None:
+                    candidates &= ~active
+                if options['superseded']:
+                    candidates |= ~Q(pk__in=shown().values('pk'))
+                queryset = model.objects.filter(candidates).order_by('pk')
+                pks = list(queryset.values_list('pk', flat=True))
+
+                if options['dry_run']:
+                    self.stdout.write(f"  {name}: {len(pks)} rows would be archived")
+                    continue
+
+                with recorder.stage('archive', name) as stage:
+                    stage.rows = self.archive_rows(model, pks, archive, options['batch_size'], options['pause'])
+                total += stage.rows
+                self.stdout.write(f"  {name}: archived {stage.rows} rows")
+
+            if total:
+                # Archived rows may have been dashboard rows, or hidden a better one
+                with recorder.stage('dashboard') as stage:
+                    stage.rows = sum(publish_dashboards())
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} signals dated before {cutoff} or superseded'))
+
+    def archive_rows(self, model, pks, archive, batch_size, pause):
+        """
+        Copy rows to the archive, then delete them in small transactions.
+
+        Rows are read by primary key, so exactly the rows that get deleted are
+        archived even if a concurrent run changes which rows are superseded.
+        The archive is written first, so an interrupted run leaves rows in both
+        places rather than losing them; history() returns such rows once.
+        """
+        if not pks:
+            return 0
+        columns = archive_columns(model)
+        batches = shard(pks, batch_size)
+        rows = pd.DataFrame.from_records(
+            [row for batch in batches for row in model.objects.filter(pk__in=batch).values(*columns)],
+            columns=columns,
+        )
+        archive.append(model, rows)
+
+        for batch in batches:
+            model.objects.filter(pk__in=batch).delete()
+            time.sleep(pause)
+        return len(pks)
@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand
+from core.archive import history
+from core.backtest import backtest_limit_orders, backtest_ma, summarize
+from core.quote_store import QuoteStore
+from signals.models import Signal
+from ma.models import StockSignal
+import pandas as pd
+import time
+
+
+class Command(BaseCommand):
+    help = 'Backtest stored and archived V20 and MA signals against the cached price history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strategy',
+            choices=['all', 'v20', 'ma'],
+            default='all',
+            help='Which signals to backtest (default: all)',
+        )
+        parser.add_argument(
+            '--universe',
+            help='Only backtest V20 signals from this universe',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write per-signal results to this CSV file',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        store = QuoteStore()
+        results = []
+
+        if options['strategy'] in ('all', 'v20'):
+            filters = {'universe': options['universe']} if options['universe'] else None
+            signals = history(Signal, filters=filters)
+            quotes = self.load_quotes(store, signals['symbol'].unique())
+            v20_results = backtest_limit_orders(signals, quotes)
+            self.write_summary('V20', summarize(v20_results))
+            results.append(v20_results)
+
+        if options['strategy'] in ('all', 'ma'):
+            signals = history(StockSignal).assign(strategy='ma', universe='ma')
+            quotes = self.load_quotes(store, signals['symbol'].unique())
+            ma_results = backtest_ma(signals, quotes)
+            # A closed MA trade counts as a hit when it made money
+            self.write_summary('MA', summarize(ma_results, hit_statuses=()))
+            results.append(ma_results)
+
+        if options['output'] and results:
+            pd.concat(results, ignore_index=True).to_csv(options['output'], index=False)
+            self.stdout.write(f"Wrote per-signal results to {options['output']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backtested {sum(len(frame) for frame in results)} signals "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        )
+
+    def load_quotes(self, store, symbols):
+        """Read cached quotes only; symbols missing from the store report as no_data."""
+        quotes = {}
+        for symbol in symbols:
+            data, _ = store.load(symbol)
+            if data is not None:
+                quotes[symbol] = data
+        return quotes
+
+    def write_summary(self, title, summary):
+        self.stdout.write(f"{title} backtest:")
+        if summary.empty:
+            self.stdout.write('  No signals')
+            return
+        for line in summary.to_string().splitlines():
+            self.stdout.write(f"  {line}")
@@ -0,0 +1,222 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from core.db import bulk_upsert
+from core.lth import compute_lth, lth_records
+from core.models import StockLTH
+from core.panel import build_panel
+from core.prices import StaticPriceBackend, get_price_service
+from core.publish import publish_dashboards
+from core.quote_store import QuoteStore
+from core.synthetic import generate_market
+from signals.models import Signal
+from signals.strategies import v20_signals_multi
+from ma.models import StockSignal
+import contextlib
+import io
+import json
+import pandas as pd
+import subprocess
+import tempfile
+import time
+
+STAGES = ('v20', 'ma', 'lth', 'store', 'views')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark strategies, LTH, storage and list views on a synthetic market, fully offline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='40,250,2000',
+            help='Comma separated symbol counts to benchmark (default: 40,250,2000)',
+        )
+        parser.add_argument(
+            '--years',
+            type=float,
+            default=2,
+            help='Years of synthetic history per symbol (default: 2)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Seed for the synthetic market (default: 42)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Repetitions of the in-memory stages; the fastest is reported (default: 3)',
+        )
+        parser.add_argument(
+            '--stages',
+            default=','.join(STAGES),
+            help=f"Comma separated stages to run (default: {','.join(STAGES)})",
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON report to this file instead of stdout',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Previous JSON report to compare the timings against',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        stages = options['stages'].split(',')
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise CommandError(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+        # Storage and view stages run against a throwaway test database
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = [self.benchmark_size(size, stages, options) for size in sizes]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'commit': self.git_commit(),
+            'seed': options['seed'],
+            'years': options['years'],
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote benchmark report to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                self.write_comparison(json.load(f), report)
+
+    def benchmark_size(self, size, stages, options):
+        """Run the selected stages on a market of ``size`` symbols."""
+        market = generate_market(size, years=options['years'], seed=options['seed'])
+        timings = {}
+        counts = {'symbols': size, 'bars': sum(len(data) for data in market.quotes.values())}
+        repeat = options['repeat']
+
+        v20 = pd.DataFrame()
+        if 'v20' in stages:
+            timings['v20'], v20 = self.timed(repeat, lambda: pd.concat(
+                v20_signals_multi(build_panel(market.quotes), [20, 30]).values(), ignore_index=True
+            ))
+            counts['v20_signals'] = len(v20)
+
+        ma_processor, ma_signals = None, []
+        if 'ma' in stages:
+            # Imported here so the other stages can be benchmarked without tradewise
+            from ma.management.commands.process_ma_stocks import StockProcessor as MAProcessor
+
+            ma_processor = MAProcessor('synthetic', 'bench')
+            with contextlib.redirect_stdout(io.StringIO()):
+                timings['ma'], ma_signals = self.timed(repeat, lambda: ma_processor.compute_signals(market.quotes))
+            counts['ma_signals'] = len(ma_signals)
+
+        if 'lth' in stages:
+            timings['lth'], _ = self.timed(repeat, lambda: compute_lth(market.quotes))
+
+        with tempfile.TemporaryDirectory() as store_dir, override_settings(
+            QUOTE_STORE_DIR=store_dir,
+            PRICE_BACKEND='core.prices.StaticPriceBackend',
+        ):
+            for model in (Signal, StockSignal, StockLTH):
+                model.objects.all().delete()
+
+            if 'store' in stages or 'views' in stages:
+                timings.update(self.benchmark_storage(market, v20, ma_processor, ma_signals))
+            if 'views' in stages:
+                timings.update(self.benchmark_views(market))
+
+        return {'size': size, 'timings': {k: round(v, 6) for k, v in timings.items()}, 'counts': counts}
+
+    def benchmark_storage(self, market, v20, ma_processor, ma_signals):
+        timings = {}
+        signals = [Signal(**row, strategy='v20', universe='bench') for row in v20.to_dict('records')]
+
+        timings['store_quotes'], _ = self.timed(1, lambda: [
+            QuoteStore().save(symbol, data, data.index[0]) for symbol, data in market.quotes.items()
+        ])
+        timings['store_lth'], _ = self.timed(1, lambda: StockLTH.bulk_update_lth_if_higher(
+            lth_records(market.quotes), universe='bench'
+        ))
+        timings['store_signals'], _ = self.timed(1, lambda: bulk_upsert(
+            Signal, signals, unique_fields=Signal.NATURAL_KEY, update_fields=['sell_price', 'expected_gain'],
+        ))
+        # Re-running a day's processing upserts onto existing rows
+        timings['store_signals_rerun'], _ = self.timed(1, lambda: bulk_upsert(
+            Signal, signals, unique_fields=Signal.NATURAL_KEY, update_fields=['sell_price', 'expected_gain'],
+        ))
+        if ma_processor is not None:
+            timings['store_ma_signals'], _ = self.timed(1, lambda: ma_processor.store_signals(ma_signals))
+        return timings
+
+    def benchmark_views(self, market):
+        timings = {}
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        StaticPriceBackend.prices = {
+            symbol: float(data['Close'].iloc[-1]) for symbol, data in market.quotes.items()
+        }
+        get_price_service().clear()
+        client = Client()
+        try:
+            timings['dashboard_rebuild'], _ = self.timed(1, publish_dashboards)
+            for name, url in (('signals', '/signals/'), ('ma', '/ma/')):
+                cache.clear()
+                timings[f'view_{name}'], response = self.timed(1, lambda: client.get(url))
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}")
+                timings[f'view_{name}_cached'], _ = self.timed(1, lambda: client.get(url))
+        finally:
+            StaticPriceBackend.prices = {}
+            get_price_service().clear()
+        return timings
+
+    @staticmethod
+    def timed(repeat, func):
+        """Return (fastest seconds, result of the last call) over ``repeat`` calls."""
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            result = func()
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        return best, result
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def write_comparison(self, baseline, report):
+        """Print each timing next to the same timing in a previous report."""
+        previous = {result['size']: result['timings'] for result in baseline['results']}
+        self.stdout.write(f"Compared with {baseline.get('commit') or 'baseline'}:")
+        for result in report['results']:
+            before = previous.get(result['size'], {})
+            for stage, seconds in result['timings'].items():
+                if not before.get(stage):
+                    continue
+                ratio = seconds / before[stage]
+                line = f"  {result['size']:>6} {stage:<22} {before[stage]:9.4f}s -> {seconds:9.4f}s ({ratio:.2f}x)"
+                self.stdout.write(self.style.WARNING(line) if ratio > 1.2 else line)
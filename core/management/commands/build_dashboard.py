@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from core.instrumentation import record_run
+from core.publish import publish_dashboards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild and publish the precomputed dashboard tables from stored signals and LTH data'
+
+    def handle(self, *args, **options):
+        with record_run('build_dashboard') as recorder:
+            with recorder.stage('dashboard') as stage:
+                signal_rows, ma_rows = publish_dashboards()
+                stage.rows = signal_rows + ma_rows
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Published dashboards: {signal_rows} signal rows, {ma_rows} MA rows')
+        )
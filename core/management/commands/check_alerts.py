@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.alerts import AlertEngine, TriggerIndex, get_sinks, load_last_prices, save_last_prices
+from core.models import DataVersion
+from core.prices import get_price_service
+import time
+
+
+class Command(BaseCommand):
+    help = 'Fire alerts when live prices cross the buy or sell levels of open signals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Check prices once, then exit',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.ALERT_CHECK_INTERVAL,
+            help=f'Seconds between price checks (default: {settings.ALERT_CHECK_INTERVAL})',
+        )
+
+    def handle(self, *args, **options):
+        sinks = get_sinks()
+        price_service = get_price_service()
+        # Crossings are measured from the prices of the previous check, even across restarts
+        engine = AlertEngine(TriggerIndex([]), sinks, load_last_prices(settings.ALERT_STATE_FILE))
+        version = None
+
+        try:
+            while True:
+                # Triggers follow the published dashboards; reload after each publish
+                current_version = DataVersion.current().version
+                if current_version != version:
+                    engine.index = TriggerIndex.from_open_signals()
+                    version = current_version
+                    self.stdout.write(
+                        f"Loaded {len(engine.index)} triggers on {len(engine.index.symbols)} symbols"
+                    )
+
+                started = time.perf_counter()
+                try:
+                    alerts = engine.check(price_service.get_prices(engine.index.symbols))
+                except Exception as e:
+                    # Undelivered alerts are not recorded, so the next check retries them
+                    self.stdout.write(self.style.ERROR(f"Failed to deliver alerts: {e}"))
+                    alerts = []
+                else:
+                    save_last_prices(settings.ALERT_STATE_FILE, engine.last_prices)
+                for alert in alerts:
+                    self.stdout.write(
+                        f"  {alert.kind} {alert.symbol}: price {alert.price} crossed {alert.level}"
+                    )
+                self.stdout.write(f"Checked prices in {time.perf_counter() - started:.3f}s, {len(alerts)} alerts")
+
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.universes import import_universes, load_stocks_config
+from pathlib import Path
+import datetime
+
+
+class Command(BaseCommand):
+    help = 'Import universes and their members from stocks_config.json and its symbol files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--config',
+            default='stocks_config.json',
+            help='Universe configuration file; symbol files are read next to it (default: stocks_config.json)',
+        )
+        parser.add_argument(
+            '--date',
+            type=datetime.date.fromisoformat,
+            help='Date the membership changes take effect, YYYY-MM-DD (default: today)',
+        )
+
+    def handle(self, *args, **options):
+        config_path = Path(options['config'])
+        try:
+            config_data = load_stocks_config(config_path)
+            changes = import_universes(config_data, on=options['date'], base_dir=config_path.parent)
+        except FileNotFoundError as e:
+            raise CommandError(f"Missing universe file: {e.filename}")
+
+        for name, (added, removed) in changes.items():
+            self.stdout.write(f"  {name}: {added} symbols added, {removed} removed")
+        self.stdout.write(self.style.SUCCESS(f'Imported {len(changes)} universes'))
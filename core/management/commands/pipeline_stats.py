@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.instrumentation import find_regressions, percentiles, stage_series
+from core.models import PipelineRun
+import datetime
+
+
+class Command(BaseCommand):
+    help = 'Show recent pipeline runs, p50/p95 per stage and regressions versus the trailing week'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Number of days of runs to analyse (default: 30)',
+        )
+        parser.add_argument(
+            '--command',
+            help='Only show runs of this management command',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=1.5,
+            help='Flag a stage when its latest time exceeds this multiple of the trailing-week median (default: 1.5)',
+        )
+        parser.add_argument(
+            '--recent',
+            type=int,
+            default=10,
+            help='Number of recent runs to list (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - datetime.timedelta(days=options['days'])
+        runs = PipelineRun.objects.filter(started_at__gte=since).prefetch_related('stages').order_by('started_at')
+        if options['command']:
+            runs = runs.filter(command=options['command'])
+        runs = list(runs)
+
+        if not runs:
+            self.stdout.write(f"No pipeline runs in the last {options['days']} days")
+            return
+
+        self.stdout.write('Recent runs:')
+        for run in runs[-options['recent']:]:
+            stages = run.stages.all()
+            duration = f"{run.duration:8.1f}s" if run.duration is not None else '       -'
+            self.stdout.write(
+                f"  {run.started_at:%Y-%m-%d %H:%M}  {run.command:<18} {run.status:<8} {duration}  "
+                f"fetched {sum(s.rows for s in stages if s.stage == 'fetch')} rows, "
+                f"{sum(s.failed for s in stages)} symbols failed"
+            )
+            if run.error:
+                self.stdout.write(self.style.ERROR(f"    {run.error}"))
+
+        series = stage_series(runs)
+        self.stdout.write('Stage timings (p50 / p95 / latest):')
+        for (command, stage), points in sorted(series.items()):
+            p50, p95 = percentiles([seconds for _, seconds in points])
+            self.stdout.write(
+                f"  {command:<18} {stage:<12} {p50:8.2f}s {p95:8.2f}s {points[-1][1]:8.2f}s  ({len(points)} runs)"
+            )
+
+        regressions = find_regressions(series, threshold=options['threshold'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions versus the trailing week'))
+        for command, stage, latest, baseline in regressions:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  Regression: {command} {stage} took {latest:.2f}s "
+                    f"vs {baseline:.2f}s trailing-week median ({latest / baseline:.1f}x)"
+                )
+            )
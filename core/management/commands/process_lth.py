@@ -1,9 +1,13 @@
 from django.core.management.base import BaseCommand
-from tradewise.quotes import StockReader
-from core.models import StockLTH
-from pathlib import Path
+from django.db.models import Q
+from core.models import StockLTH, Universe
+from core.fetch import AsyncQuoteFetcher
+from core.quote_store import QuoteStore
+from core.instrumentation import StageRecorder, record_run
+from core.lth import lth_records
+from core.publish import publish_dashboards
+from core.universes import symbol_index, sync_universes
 import datetime
-import json
 
 
 class Command(BaseCommand):
@@ -26,56 +30,36 @@ class Command(BaseCommand):
         update_only = options['update_only']
         days_back = options['days_back']
         
-        with open('stocks_config.json', 'r') as f:
-            config_data = json.load(f)
-
-        # Process all universes (both 'files' and 'ma' sections)
-        all_universes = []
-        
-        if 'files' in config_data:
-            all_universes.extend(config_data['files'])
-        
-        if 'ma' in config_data:
-            all_universes.extend(config_data['ma'])
-
-        # Ensure US universe is included if the file exists
-        us_entry = {'filename': 'us40.txt', 'category': 'us40'}
-        if not any(entry.get('filename') == 'us40.txt' for entry in all_universes):
-            if Path('us40.txt').exists():
-                all_universes.append(us_entry)
-                self.stdout.write('Added us40.txt to LTH processing because it was missing from stocks_config.json.')
-
-        # Deduplicate duplicate universe entries
-        seen = set()
-        unique_universes = []
-        for entry in all_universes:
-            key = (entry.get('filename'), entry.get('category'))
-            if key not in seen:
-                seen.add(key)
-                unique_universes.append(entry)
+        sync_universes()
+        # Every universe a strategy runs on needs LTH data
+        universes = Universe.objects.filter(Q(run_v20=True) | Q(run_ma=True)).order_by('pk')
 
         total_processed = 0
         total_updated = 0
         total_new = 0
 
-        for file_data in unique_universes:
-            input_filename = file_data['filename']
-            category = file_data['category']
-            
-            self.stdout.write(f"Processing {category} universe from {input_filename}...")
-            
-            processor = LTHProcessor(input_filename, category, update_only, days_back)
-            processed, updated, new = processor.process_lth()
-            
-            total_processed += processed
-            total_updated += updated
-            total_new += new
-            
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"  {category}: {processed} stocks processed, {updated} LTH updated, {new} new records"
+        with record_run('process_lth') as recorder:
+            for universe in universes:
+                category = universe.name
+
+                self.stdout.write(f"Processing {category} universe...")
+
+                processor = LTHProcessor(universe.source_file, category, update_only, days_back, recorder)
+                processed, updated, new = processor.process_lth()
+
+                total_processed += processed
+                total_updated += updated
+                total_new += new
+
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"  {category}: {processed} stocks processed, {updated} LTH updated, {new} new records"
+                    )
                 )
-            )
+
+            # Distances from LTH are precomputed, so refresh both dashboards
+            with recorder.stage('dashboard') as stage:
+                stage.rows = sum(publish_dashboards())
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -86,15 +70,15 @@ class Command(BaseCommand):
 
 
 class LTHProcessor:
-    def __init__(self, input_filename, category, update_only=False, days_back=30):
+    def __init__(self, input_filename, category, update_only=False, days_back=30, recorder=None):
         self.input_filename = input_filename
         self.category = category
         self.update_only = update_only
         self.days_back = days_back
+        self.recorder = recorder or StageRecorder()
 
     def process_lth(self):
-        reader = StockReader(self.input_filename)
-        stocks_list = reader.read_stock_list()
+        stocks_list = symbol_index().symbols(self.category)
 
         end_date = datetime.datetime.now().strftime("%Y-%m-%d")
         
@@ -105,46 +89,27 @@ class LTHProcessor:
             # For initial processing, get all historical data
             start_date = (datetime.datetime.now() - datetime.timedelta(days=10*365)).strftime("%Y-%m-%d")
 
-        stock_quotes = reader.get_stock_quotes(stocks_list, start_date, end_date)
-
-        processed_count = 0
-        updated_count = 0
-        new_count = 0
-
-        for symbol, data in stock_quotes.items():
-            try:
-                if data.empty:
-                    continue
+        fetcher = AsyncQuoteFetcher.from_settings()
+        with self.recorder.stage('fetch', self.category) as stage:
+            stock_quotes = QuoteStore().get_stock_quotes(
+                stocks_list, start_date, end_date, fetch=fetcher.get_stock_quotes
+            )
+            stage.rows = sum(len(data) for data in stock_quotes.values())
+            stage.failed = len(fetcher.failures)
+        for symbol, error in fetcher.failures.items():
+            print(f"Failed to fetch quotes for {symbol}: {error}")
 
-                # Find the highest closing price and its date
-                max_close_idx = data['Close'].idxmax()
-                lth_price = data.loc[max_close_idx, 'Close']
-                lth_date = max_close_idx.date()
+        return self.process_quotes(stock_quotes)
 
-                # Update or create LTH record
-                was_updated_or_new = StockLTH.update_lth_if_higher(
-                    symbol=symbol,
-                    price=lth_price,
-                    date=lth_date,
-                    universe=self.category
-                )
+    def process_quotes(self, stock_quotes):
+        """Update LTH records from already fetched quotes."""
+        # Compute LTH for the whole universe at once and merge with stored rows
+        with self.recorder.stage('lth_compute', self.category) as stage:
+            records = lth_records(stock_quotes)
+            stage.rows = len(records)
 
-                processed_count += 1
-                
-                if was_updated_or_new:
-                    # Check if it's a new record or an update
-                    existing_record = StockLTH.objects.filter(symbol=symbol).first()
-                    if existing_record and existing_record.lth_price == lth_price:
-                        if StockLTH.objects.filter(symbol=symbol).count() == 1:
-                            # This was a newly created record
-                            new_count += 1
-                        else:
-                            # This was an updated record
-                            updated_count += 1
-
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f"Error processing {symbol}: {str(e)}")
-                )
+        with self.recorder.stage('lth_store', self.category) as stage:
+            result = StockLTH.bulk_update_lth_if_higher(records, universe=self.category)
+            stage.rows = result['new'] + result['updated']
 
-        return processed_count, updated_count, new_count
+        return len(records), result['updated'], result['new']
@@ -0,0 +1,112 @@
+from django.core.management.base import BaseCommand
+from core.fetch import AsyncQuoteFetcher
+from core.instrumentation import record_run
+from core.publish import publish_dashboards
+from core.management.commands.process_lth import LTHProcessor
+from core.quote_store import QuoteStore
+from core.universes import strategy_universes, symbol_index, sync_universes
+from signals.management.commands.process_stocks import StockProcessor as V20Processor
+from ma.management.commands.process_ma_stocks import StockProcessor as MAProcessor
+import datetime
+
+
+class Command(BaseCommand):
+    help = 'Fetch every symbol once and run the LTH, V20 and MA stages on the shared quotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lth-days',
+            type=int,
+            default=10*365,
+            help='History window used for LTH (default: 10 years)',
+        )
+        parser.add_argument(
+            '--strategy-days',
+            type=int,
+            default=2*365,
+            help='History window used for the V20 and MA strategies (default: 2 years)',
+        )
+        parser.add_argument(
+            '--full-recompute',
+            action='store_true',
+            help='Evaluate the strategies over the whole window instead of resuming from checkpoints',
+        )
+
+    def handle(self, *args, **options):
+        with record_run('run_pipeline') as recorder:
+            self.run_stages(recorder, options)
+
+        self.stdout.write('Stage timings:')
+        for stage, seconds in recorder.totals().items():
+            self.stdout.write(f"  {stage:<12} {seconds:8.2f}s")
+        self.stdout.write(f"  {'total':<12} {sum(recorder.totals().values()):8.2f}s")
+
+        self.stdout.write(self.style.SUCCESS('Successfully ran the processing pipeline'))
+
+    def run_stages(self, recorder, options):
+        # Pick up edits to the symbol files before anything reads the universes
+        sync_universes()
+        v20_universes = strategy_universes('v20')
+        ma_universes = strategy_universes('ma')
+        lth_universes = list({universe.pk: universe for universe in v20_universes + ma_universes}.values())
+        index = symbol_index()
+
+        now = datetime.datetime.now()
+        end_date = now.strftime("%Y-%m-%d")
+        lth_start = (now - datetime.timedelta(days=options['lth_days'])).strftime("%Y-%m-%d")
+        strategy_start = now - datetime.timedelta(days=options['strategy_days'])
+
+        with recorder.stage('fetch') as stage:
+            # Fetch the union of all universes once
+            all_symbols = sorted({symbol for universe in lth_universes for symbol in index.symbols(universe.name)})
+
+            fetcher = AsyncQuoteFetcher.from_settings()
+            store = QuoteStore()
+            stock_quotes = store.get_stock_quotes(
+                all_symbols, lth_start, end_date, fetch=fetcher.get_stock_quotes
+            )
+            stage.rows = sum(len(data) for data in stock_quotes.values())
+            stage.failed = len(fetcher.failures)
+        self.stdout.write(f"Fetched {len(stock_quotes)} of {len(all_symbols)} symbols once")
+        for symbol, error in fetcher.failures.items():
+            self.stdout.write(self.style.ERROR(f"  Failed to fetch {symbol}: {error}"))
+        if store.readjusted:
+            self.stdout.write(f"Re-adjusted history of {len(store.readjusted)} symbols; re-evaluating them in full")
+
+        strategy_quotes = {
+            symbol: data[data.index >= strategy_start.strftime("%Y-%m-%d")]
+            for symbol, data in stock_quotes.items()
+        }
+
+        for universe in lth_universes:
+            category = universe.name
+            universe_quotes = self._slice(stock_quotes, index.symbols(category))
+            processor = LTHProcessor(universe.source_file, category, recorder=recorder)
+            processed, updated, new = processor.process_quotes(universe_quotes)
+            self.stdout.write(
+                f"  LTH {category}: {processed} stocks processed, {updated} LTH updated, {new} new records"
+            )
+
+        for universe in v20_universes:
+            category = universe.name
+            universe_quotes = self._slice(strategy_quotes, index.symbols(category))
+            processor = V20Processor(universe.source_file, category, recorder, options['full_recompute'])
+            signals = processor.process_quotes(universe_quotes, store.bases)
+            self.stdout.write(f"  V20 {category}: {len(signals)} signals")
+
+        for universe in ma_universes:
+            category = universe.name
+            universe_quotes = self._slice(strategy_quotes, index.symbols(category))
+            processor = MAProcessor(universe.source_file, category, recorder, options['full_recompute'])
+            signals = processor.process_quotes(universe_quotes, store.bases)
+            self.stdout.write(f"  MA {category}: {len(signals)} signals")
+
+        with recorder.stage('dashboard') as stage:
+            signal_rows, ma_rows = publish_dashboards()
+            stage.rows = signal_rows + ma_rows
+        self.stdout.write(f"  Dashboards: {signal_rows} signal rows, {ma_rows} MA rows")
+
+    @staticmethod
+    def _slice(stock_quotes, symbols):
+        """Return the quotes that belong to one universe."""
+        return {symbol: stock_quotes[symbol] for symbol in symbols if symbol in stock_quotes}
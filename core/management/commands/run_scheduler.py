@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.models import PipelineRun
+from core.scheduler import FileLock, Job, LockBusy, load_state, preload_commands, save_state, start_job
+import datetime
+import multiprocessing
+import signal
+import threading
+
+
+class Command(BaseCommand):
+    help = 'Run the SCHEDULER_JOBS processing jobs from one long-running process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due, then exit',
+        )
+        parser.add_argument(
+            '--run',
+            metavar='JOB',
+            help='Run this job immediately, then exit',
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=30,
+            help='Seconds between schedule checks (default: 30)',
+        )
+
+    def handle(self, *args, **options):
+        jobs = [Job.from_config(config) for config in settings.SCHEDULER_JOBS]
+        try:
+            # Forked jobs then start with their modules already imported
+            preload_commands(jobs)
+        except KeyError as e:
+            raise CommandError(f"Unknown command in SCHEDULER_JOBS: {e.args[0]}")
+        self.context = multiprocessing.get_context('fork')
+        self.stop_requested = threading.Event()
+        self.current = None
+
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        if options['run']:
+            job = next((job for job in jobs if job.name == options['run']), None)
+            if job is None:
+                raise CommandError(f"Unknown job: {options['run']}")
+            self.run_job(job)
+            return
+
+        state_file = settings.SCHEDULER_STATE_FILE
+        catch_up = datetime.timedelta(seconds=settings.SCHEDULER_CATCH_UP)
+        state = load_state(state_file)
+
+        now = timezone.now()
+        for job in jobs:
+            self.stdout.write(f"{job.name}: {job.command} next at {job.next_slot(now):%Y-%m-%d %H:%M} UTC")
+
+        while not self.stop_requested.is_set():
+            now = timezone.now()
+            for job in jobs:
+                if self.stop_requested.is_set():
+                    break
+                slot = job.due_slot(now, state.get(job.name), catch_up)
+                if slot is None:
+                    continue
+                if self.run_job(job):
+                    state[job.name] = slot
+                    save_state(state_file, state)
+
+            if options['once']:
+                break
+            self.stop_requested.wait(options['poll'])
+
+        self.stdout.write('Scheduler stopped')
+
+    def request_stop(self, signum, frame):
+        """Finish the running job, then exit; a second signal stops the job too."""
+        if self.stop_requested.is_set() and self.current is not None:
+            self.stdout.write(self.style.WARNING(f"Terminating {self.current.name}"))
+            self.current.terminate()
+        else:
+            self.stdout.write('Shutting down after the running job finishes')
+        self.stop_requested.set()
+
+    def run_job(self, job):
+        """
+        Run one job under the scheduler lock.
+
+        Returns:
+            False if another process held the lock and the job did not run
+        """
+        try:
+            with FileLock(settings.SCHEDULER_LOCK_FILE):
+                started_at = timezone.now()
+                self.stdout.write(f"[{started_at:%Y-%m-%d %H:%M:%S}] Starting {job.name}: {job.command} {' '.join(job.args)}")
+
+                self.current = start_job(job, self.context)
+                self.current.join(job.timeout)
+                if self.current.is_alive():
+                    self.stdout.write(self.style.ERROR(f"{job.name} timed out after {job.timeout}s"))
+                    self.current.terminate()
+                    self.current.join(30)
+                    if self.current.is_alive():
+                        self.current.kill()
+                        self.current.join()
+                    self.mark_timed_out(job, started_at)
+                elif self.current.exitcode != 0:
+                    self.stdout.write(self.style.ERROR(f"{job.name} failed with exit code {self.current.exitcode}"))
+                else:
+                    elapsed = (timezone.now() - started_at).total_seconds()
+                    self.stdout.write(self.style.SUCCESS(f"{job.name} finished in {elapsed:.1f}s"))
+                self.current = None
+        except LockBusy as e:
+            self.stdout.write(self.style.WARNING(f"Skipping {job.name}: {e}"))
+            return False
+        return True
+
+    def mark_timed_out(self, job, started_at):
+        """Close the ledger rows a killed job left behind."""
+        PipelineRun.objects.filter(
+            command=job.command, status=PipelineRun.RUNNING, started_at__gte=started_at,
+        ).update(
+            status=PipelineRun.FAILED,
+            error=f"Killed by the scheduler after {job.timeout}s",
+            finished_at=timezone.now(),
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_pipeline_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Universe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('source_file', models.CharField(blank=True, max_length=255)),
+                ('run_v20', models.BooleanField(default=False)),
+                ('run_ma', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Membership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('universe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='core.universe')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['symbol'], name='core_member_symbol_104def_idx'), models.Index(fields=['universe', 'end_date'], name='core_member_univers_7c2d2f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='membership',
+            constraint=models.UniqueConstraint(fields=('universe', 'symbol', 'start_date'), name='unique_membership_start'),
+        ),
+    ]
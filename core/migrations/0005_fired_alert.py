@@ -0,0 +1,33 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:57
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_universes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FiredAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('v20_buy', 'V20 buy'), ('v20_sell', 'V20 sell'), ('ma_buy', 'MA buy')], max_length=10)),
+                ('signal_id', models.PositiveBigIntegerField()),
+                ('symbol', models.CharField(max_length=20)),
+                ('level', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('price', models.FloatField()),
+                ('fired_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['symbol', 'fired_at'], name='core_fireda_symbol_16d8ef_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='firedalert',
+            constraint=models.UniqueConstraint(fields=('kind', 'signal_id'), name='unique_fired_alert'),
+        ),
+    ]
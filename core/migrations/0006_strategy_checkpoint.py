@@ -0,0 +1,30 @@
+# Generated by Django 4.2.17 on 2026-10-18 08:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_fired_alert'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StrategyCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('strategy', models.CharField(max_length=20)),
+                ('universe', models.CharField(max_length=100)),
+                ('symbol', models.CharField(max_length=20)),
+                ('last_date', models.DateField()),
+                ('state', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='strategycheckpoint',
+            constraint=models.UniqueConstraint(fields=('strategy', 'universe', 'symbol'), name='unique_strategy_checkpoint'),
+        ),
+    ]
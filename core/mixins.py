@@ -1,8 +1,8 @@
 """
 Shared mixins for LTH (Life Time High) functionality.
 """
+from core.prices import get_price_service
 from core.utils import LTHHelper
-import yfinance as yf
 
 
 class LTHFilterMixin:
@@ -20,27 +20,19 @@ class LTHFilterMixin:
         Returns:
             Signals with LTH data attached; filtered if requested.
         """
-        # Cache for storing fetched prices
-        price_cache = {}
-        
-        # Get all symbols for bulk LTH lookup
+        # Get all symbols for bulk LTH and price lookup
         symbols = [signal.symbol for signal in signals]
-        lth_data = LTHHelper.get_lth_bulk(symbols)
+        if all(hasattr(signal, 'snapshot_lth_data') for signal in signals):
+            # Dashboard rows already carry their LTH data
+            lth_data = {signal.symbol: signal.snapshot_lth_data for signal in signals}
+        else:
+            lth_data = LTHHelper.get_lth_bulk(symbols)
+        prices = get_price_service().get_prices(symbols)
 
         filtered_signals = []
         
         for signal in signals:
-            # Fetch current market price
-            if signal.symbol not in price_cache:
-                ticker = yf.Ticker(signal.symbol)
-                try:
-                    current_price = round(ticker.history(period="1d")['Close'].iloc[-1], 2)
-                    price_cache[signal.symbol] = current_price
-                except Exception as e:
-                    price_cache[signal.symbol] = None
-                    print(f"Failed to fetch current price for {signal.symbol}: {e}")
-
-            current_price = price_cache[signal.symbol]
+            current_price = prices.get(signal.symbol)
             
             # Calculate price change percentage based on the specified field
             if current_price is not None:
@@ -53,8 +45,10 @@ class LTHFilterMixin:
             # Add LTH data
             signal.lth_data = lth_data.get(signal.symbol)
             if signal.lth_data and current_price is not None:
-                signal.distance_from_lth = LTHHelper.calculate_distance_from_lth(current_price, signal.symbol)
-                signal.is_near_lth = LTHHelper.is_near_lth(current_price, signal.symbol, threshold_pct=10.0)
+                signal.distance_from_lth = LTHHelper.distance_from_lth_price(
+                    current_price, signal.lth_data['lth_price']
+                )
+                signal.is_near_lth = abs(signal.distance_from_lth) <= 10.0
 
                 if filter_signals:
                     # Filter: Only include stocks that are at least 20% below LTH
@@ -75,9 +69,62 @@ class LTHFilterMixin:
 
         return filtered_signals
 
-    def add_lth_context(self, context, original_signals, filtered_signals):
+    def add_lth_context(self, context, total_before_filter, total_after_filter):
         """Add LTH-related context variables."""
-        context['total_signals_before_filter'] = len(original_signals)
-        context['total_signals_after_filter'] = len(filtered_signals)
+        context['total_signals_before_filter'] = total_before_filter
+        context['total_signals_after_filter'] = total_after_filter
         context['lth_filter_threshold'] = 20.0  # 20% below LTH threshold
         return context
+
+
+class DashboardQueryMixin:
+    """
+    Database-side filtering, ordering and pagination for dashboard list views.
+
+    Every filter runs in SQL over indexed dashboard columns, so rendering page N
+    costs the same as page 1 however much history has accumulated.
+    """
+    paginate_by = 100
+    filter_signals = True
+    max_distance_from_lth = -20.0
+    ordering_fields = ('date', 'symbol', 'distance_from_lth')
+    default_ordering = 'date'
+
+    def get_ordering(self):
+        ordering = self.request.GET.get('ordering', self.default_ordering)
+        # Only allow indexed fields; anything else falls back to the default
+        if ordering.lstrip('-') not in self.ordering_fields:
+            ordering = self.default_ordering
+        return [ordering, 'pk']
+
+    def filter_dashboard(self, queryset):
+        """Apply the is_new and distance-from-LTH filters from the query string."""
+        # Only the published snapshot; rows of a build in progress stay hidden
+        queryset = queryset.published()
+
+        if self.request.GET.get('is_new') in ('1', 'true', 'True'):
+            queryset = queryset.filter(is_new=True)
+
+        # Keep the count before the LTH filter for the filter info banner
+        self.unfiltered_queryset = queryset
+
+        max_distance = self.request.GET.get('max_distance')
+        try:
+            max_distance = float(max_distance) if max_distance else None
+        except ValueError:
+            max_distance = None
+        if max_distance is None and self.filter_signals:
+            max_distance = self.max_distance_from_lth
+        if max_distance is not None:
+            # Filter: Only include stocks that are at least this far below LTH at the last close
+            queryset = queryset.filter(distance_from_lth__lte=max_distance)
+
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        querystring = self.request.GET.copy()
+        querystring.pop('page', None)
+        context['querystring'] = querystring.urlencode()
+        context['ordering'] = self.get_ordering()[0]
+        return context
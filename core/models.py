@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Subquery
 from django.utils import timezone
 
 
@@ -59,3 +60,300 @@ class StockLTH(models.Model):
             stock_lth.save()
         
         return created  # True if new record was created
+
+    @classmethod
+    def bulk_update_lth_if_higher(cls, lth_records, universe=None):
+        """
+        Raise LTH for many symbols at once.
+
+        Existing rows are loaded in one query, new/updated/unchanged sets are
+        computed in memory and written back in a single transaction.
+
+        Args:
+            lth_records: Dictionary of {symbol: (price, date)}
+            universe: Universe/category name for the stocks
+
+        Returns:
+            Dictionary with 'new', 'updated' and 'unchanged' counts
+        """
+        now = timezone.now()
+        new_rows = []
+        updated_rows = []
+        unchanged_symbols = []
+
+        with transaction.atomic():
+            existing = {
+                stock_lth.symbol: stock_lth
+                for stock_lth in cls.objects.select_for_update().filter(symbol__in=list(lth_records))
+            }
+
+            for symbol, (price, date) in lth_records.items():
+                price = round(float(price), 4)
+                stock_lth = existing.get(symbol)
+
+                if stock_lth is None:
+                    new_rows.append(cls(
+                        symbol=symbol,
+                        lth_price=price,
+                        lth_date=date,
+                        universe=universe,
+                        last_updated=now,
+                    ))
+                elif price > float(stock_lth.lth_price):
+                    stock_lth.lth_price = price
+                    stock_lth.lth_date = date
+                    stock_lth.last_updated = now
+                    if universe:
+                        stock_lth.universe = universe
+                    updated_rows.append(stock_lth)
+                else:
+                    unchanged_symbols.append(symbol)
+
+            cls.objects.bulk_create(
+                new_rows,
+                update_conflicts=True,
+                unique_fields=['symbol'],
+                update_fields=['lth_price', 'lth_date', 'universe', 'last_updated'],
+            )
+            cls.objects.bulk_update(
+                updated_rows, ['lth_price', 'lth_date', 'universe', 'last_updated']
+            )
+
+            if unchanged_symbols:
+                # Update last_updated timestamp even if LTH wasn't updated
+                cls.objects.filter(symbol__in=unchanged_symbols).update(last_updated=now)
+                if universe:
+                    cls.objects.filter(
+                        symbol__in=unchanged_symbols, universe__isnull=True
+                    ).update(universe=universe)
+
+        return {
+            'new': len(new_rows),
+            'updated': len(updated_rows),
+            'unchanged': len(unchanged_symbols),
+        }
+
+
+class DashboardRowQuerySet(models.QuerySet):
+    def published(self):
+        """Rows of the published data version; staged rows of a running build stay hidden."""
+        published_version = DataVersion.objects.filter(pk=1).values('version')[:1]
+        return self.filter(run_version=Subquery(published_version))
+
+
+class DashboardRowBase(models.Model):
+    """
+    Denormalized list-view row rebuilt at the end of each processing run.
+
+    Holds everything a dashboard needs except the live price, so list views
+    read one indexed table instead of deduplicating and joining per request.
+    """
+    lth_price = models.DecimalField(max_digits=15, decimal_places=4, null=True)
+    lth_date = models.DateField(null=True)
+    close_price = models.DecimalField(max_digits=15, decimal_places=4, null=True)
+    distance_from_lth = models.FloatField(null=True)  # Distance of close_price from LTH, in percent
+    is_new = models.BooleanField(default=False)
+    built_at = models.DateTimeField(default=timezone.now)
+    run_version = models.PositiveBigIntegerField(default=0)  # DataVersion this row was built for
+
+    objects = DashboardRowQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def snapshot_lth_data(self):
+        """LTH data in the shape returned by LTHHelper.get_lth_bulk()."""
+        if self.lth_price is None:
+            return None
+        return {'lth_price': self.lth_price, 'lth_date': self.lth_date}
+
+
+class DataVersion(models.Model):
+    """
+    Single-row pointer to the published dashboard snapshot.
+
+    Dashboards are built under the next version and become visible when
+    ``publish`` moves the pointer, in one single-row UPDATE.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Data version {self.version} ({self.updated_at})"
+
+    @classmethod
+    def current(cls):
+        """Return the current data version row."""
+        data_version, _ = cls.objects.get_or_create(pk=1)
+        return data_version
+
+    @classmethod
+    def lock(cls):
+        """
+        Lock the pointer row until the surrounding transaction ends and return it.
+
+        Serializes publishers, which must read the version and stage the next
+        one without another publisher in between. The no-op UPDATE comes first
+        because SQLite ignores FOR UPDATE but takes its write lock on a write.
+        """
+        if not cls.objects.filter(pk=1).update(updated_at=F('updated_at')):
+            cls.objects.get_or_create(pk=1)
+        return cls.objects.select_for_update().get(pk=1)
+
+    @classmethod
+    def publish(cls, version):
+        """Point readers at ``version``, invalidating cached pages."""
+        with transaction.atomic():
+            cls.objects.get_or_create(pk=1)
+            cls.objects.filter(pk=1).update(version=version, updated_at=timezone.now())
+        return cls.current()
+
+
+class PipelineRun(models.Model):
+    """Ledger row recording one run of a processing command."""
+    RUNNING = 'running'
+    SUCCESS = 'success'
+    PARTIAL = 'partial'  # Finished, but some symbols failed to fetch
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (RUNNING, 'Running'),
+        (SUCCESS, 'Success'),
+        (PARTIAL, 'Partial'),
+        (FAILED, 'Failed'),
+    ]
+
+    command = models.CharField(max_length=50)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RUNNING)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['command', 'started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.command} at {self.started_at} ({self.status})"
+
+    @property
+    def duration(self):
+        """Run time in seconds, or None while the run is in progress."""
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+class StageTiming(models.Model):
+    """Time spent in one stage of a pipeline run, per universe."""
+    run = models.ForeignKey(PipelineRun, on_delete=models.CASCADE, related_name='stages')
+    stage = models.CharField(max_length=30)  # e.g. 'fetch', 'v20_compute', 'v20_store', 'dashboard'
+    universe = models.CharField(max_length=100, blank=True)
+    seconds = models.FloatField()
+    rows = models.IntegerField(default=0)  # Quote rows fetched, signals produced or rows written
+    failed = models.IntegerField(default=0)  # Symbols that failed in this stage
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['stage', 'universe']),
+        ]
+
+    def __str__(self):
+        return f"{self.stage} {self.universe}: {self.seconds:.2f}s"
+
+
+class Universe(models.Model):
+    """A named list of symbols and the strategies run on it."""
+    name = models.CharField(max_length=100, unique=True)  # e.g. 'v40', 'us40'
+    source_file = models.CharField(max_length=255, blank=True)  # Symbol file it was imported from
+    run_v20 = models.BooleanField(default=False)
+    run_ma = models.BooleanField(default=False)
+
+    def __str__(self):
+        return self.name
+
+
+class MembershipQuerySet(models.QuerySet):
+    def active(self, on=None):
+        """Memberships in effect on ``on`` (default: today)."""
+        on = on or timezone.now().date()
+        return self.filter(start_date__lte=on).filter(
+            models.Q(end_date__isnull=True) | models.Q(end_date__gt=on)
+        )
+
+
+class Membership(models.Model):
+    """A symbol's membership of a universe from start_date until (excluding) end_date."""
+    universe = models.ForeignKey(Universe, on_delete=models.CASCADE, related_name='memberships')
+    symbol = models.CharField(max_length=20)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)  # None while the symbol is still a member
+
+    objects = MembershipQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['symbol']),
+            models.Index(fields=['universe', 'end_date']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['universe', 'symbol', 'start_date'],
+                name='unique_membership_start',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} in {self.universe} from {self.start_date}"
+
+
+class FiredAlert(models.Model):
+    """A price trigger that has fired; each trigger fires once."""
+    V20_BUY = 'v20_buy'  # Price fell to a V20 buy_price
+    V20_SELL = 'v20_sell'  # Price rose to a V20 sell_price
+    MA_BUY = 'ma_buy'  # Price fell to an MA Buy signal price
+    KIND_CHOICES = [
+        (V20_BUY, 'V20 buy'),
+        (V20_SELL, 'V20 sell'),
+        (MA_BUY, 'MA buy'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    signal_id = models.PositiveBigIntegerField()  # Signal or StockSignal primary key, by kind
+    symbol = models.CharField(max_length=20)
+    level = models.DecimalField(max_digits=10, decimal_places=2)
+    price = models.FloatField()  # Live price that crossed the level
+    fired_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['symbol', 'fired_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'signal_id'], name='unique_fired_alert'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.symbol} at {self.price} (level {self.level})"
+
+
+class StrategyCheckpoint(models.Model):
+    """Where a strategy's evaluation of one symbol stopped, so the next run only reads new bars."""
+    strategy = models.CharField(max_length=20)  # 'v20' or 'ma'
+    universe = models.CharField(max_length=100)
+    symbol = models.CharField(max_length=20)
+    last_date = models.DateField()  # Last bar evaluated
+    state = models.JSONField(default=dict)  # Strategy specific, e.g. rolling sums or the open green run
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['strategy', 'universe', 'symbol'],
+                name='unique_strategy_checkpoint',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.strategy} {self.universe} {self.symbol} through {self.last_date}"
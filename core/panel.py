@@ -0,0 +1,55 @@
+"""Align per-symbol quote frames into symbol-wide panels."""
+import pandas as pd
+
+
+def clean_frame(data, fields):
+    """
+    Return ``fields`` of one symbol's quotes as floats on a sorted, unique date index.
+
+    Repeated dates keep their last bar, as the quote store does.
+
+    Raises:
+        ValueError: When a field is missing or the dates or values cannot be parsed
+    """
+    missing = [field for field in fields if field not in data.columns]
+    if missing:
+        raise ValueError(f"missing columns {', '.join(missing)}")
+    frame = data[list(fields)]
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame = frame.set_axis(pd.to_datetime(frame.index))
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    return frame.astype(float)
+
+
+def build_panel(stock_quotes, fields=('Open', 'High', 'Low', 'Close')):
+    """
+    Align quotes into one dates x symbols DataFrame per field.
+
+    Symbols whose quotes cannot be cleaned (see ``clean_frame``) are reported
+    and left out, so one malformed frame does not stop the whole universe.
+
+    Args:
+        stock_quotes: Dictionary of {symbol: DataFrame} with stock data
+        fields: Quote columns to include
+
+    Returns:
+        Dictionary of {field: DataFrame} sharing the same sorted date index and
+        symbol columns; dates a symbol did not trade on are NaN
+    """
+    frames = {}
+    for symbol, data in stock_quotes.items():
+        if data.empty:
+            continue
+        try:
+            frames[symbol] = clean_frame(data, fields)
+        except (TypeError, ValueError) as e:
+            print(f"Skipping {symbol}: {e}")
+    if not frames:
+        return {field: pd.DataFrame(dtype=float) for field in fields}
+
+    panel = {}
+    for field in fields:
+        panel[field] = pd.concat(
+            {symbol: data[field] for symbol, data in frames.items()}, axis=1
+        ).sort_index()
+    return panel
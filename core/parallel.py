@@ -0,0 +1,60 @@
+"""Process-pool helpers for the processing commands."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.db import connections
+
+
+def shard(items, size):
+    """Split a list into consecutive chunks of at most ``size`` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _timed_call(worker, task):
+    started = time.perf_counter()
+    result = worker(*task)
+    return os.getpid(), time.perf_counter() - started, result
+
+
+def run_in_pool(worker, tasks, workers, handle_result):
+    """
+    Run ``worker(*task)`` for every task on a process pool.
+
+    Workers only compute; each result is passed to ``handle_result(task, result)``
+    in the parent process so the database sees a single writer.
+
+    Returns:
+        Tuple of (worker_stats, failures) where worker_stats maps a worker pid to
+        its task count and busy seconds, and failures lists (task, error) pairs
+    """
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+    worker_stats = {}
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        futures = {executor.submit(_timed_call, worker, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                pid, seconds, result = future.result()
+            except Exception as e:
+                failures.append((task, e))
+                continue
+
+            handle_result(task, result)
+            stats = worker_stats.setdefault(pid, {'tasks': 0, 'seconds': 0.0})
+            stats['tasks'] += 1
+            stats['seconds'] += seconds
+
+    return worker_stats, failures
+
+
+def format_worker_summary(worker_stats):
+    """Return printable lines summarising per-worker timings."""
+    lines = ['Worker timings:']
+    for pid, stats in sorted(worker_stats.items()):
+        lines.append(f"  pid {pid}: {stats['tasks']} tasks, {stats['seconds']:.2f}s busy")
+    return lines
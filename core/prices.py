@@ -0,0 +1,145 @@
+"""
+Current-price lookups shared by the list views.
+
+Prices are fetched in one batched request per cache miss and kept in a
+process-wide cache. Entries live for ``PRICE_CACHE_TTL`` seconds while the
+symbol's market is open, and until the next session opens once it has closed.
+"""
+import datetime
+import threading
+import time
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+MARKET_HOURS = {
+    'india': (ZoneInfo('Asia/Kolkata'), datetime.time(9, 15), datetime.time(15, 30)),
+    'us': (ZoneInfo('America/New_York'), datetime.time(9, 30), datetime.time(16, 0)),
+}
+
+
+def market_for(symbol):
+    """Return the market a symbol trades on."""
+    return 'india' if symbol.endswith(('.NS', '.BO')) else 'us'
+
+
+def cache_expiry(symbol, now=None, open_ttl=60):
+    """Return the epoch time at which a price fetched at ``now`` goes stale."""
+    tz, open_time, close_time = MARKET_HOURS[market_for(symbol)]
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    local = now.astimezone(tz)
+
+    if local.weekday() < 5 and open_time <= local.time() < close_time:
+        return now.timestamp() + open_ttl
+
+    # Market closed: the last price holds until the next weekday open
+    day = local.date()
+    if local.weekday() >= 5 or local.time() >= open_time:
+        day += datetime.timedelta(days=1)
+    while day.weekday() >= 5:
+        day += datetime.timedelta(days=1)
+    return datetime.datetime.combine(day, open_time, tzinfo=tz).timestamp()
+
+
+class YFinanceBackend:
+    """Fetch latest prices from Yahoo Finance in a single batched download."""
+
+    def fetch(self, symbols):
+        import yfinance as yf
+
+        data = yf.download(symbols, period='5d', interval='1d', progress=False, threads=True)
+        if data.empty:
+            return {}
+
+        closes = data['Close']
+        if not hasattr(closes, 'columns'):
+            closes = closes.to_frame(symbols[0])
+
+        prices = {}
+        for symbol in symbols:
+            if symbol not in closes.columns:
+                continue
+            series = closes[symbol].dropna()
+            if not series.empty:
+                prices[symbol] = round(float(series.iloc[-1]), 2)
+        return prices
+
+
+class StaticPriceBackend:
+    """Serve prices from an in-memory mapping, for tests and offline runs."""
+
+    prices = {}
+
+    def fetch(self, symbols):
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+class PriceService:
+    """Batched current-price lookups with a market-aware TTL cache."""
+
+    def __init__(self, backend, open_ttl=60):
+        self.backend = backend
+        self.open_ttl = open_ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get_prices(self, symbols):
+        """
+        Get current prices for many symbols.
+
+        Returns:
+            Dictionary of {symbol: price}; the price is None when it could not be fetched
+        """
+        now = time.time()
+        prices = {}
+        missing = []
+
+        with self._lock:
+            for symbol in set(symbols):
+                cached = self._cache.get(symbol)
+                if cached and cached[1] > now:
+                    prices[symbol] = cached[0]
+                else:
+                    missing.append(symbol)
+
+        if not missing:
+            return prices
+
+        try:
+            fetched = self.backend.fetch(sorted(missing))
+        except Exception as e:
+            fetched = {}
+            print(f"Failed to fetch current prices for {len(missing)} symbols: {e}")
+
+        with self._lock:
+            for symbol in missing:
+                price = fetched.get(symbol)
+                prices[symbol] = price
+                if price is None:
+                    # Retry failed symbols after the short TTL rather than on every request
+                    expires_at = now + self.open_ttl
+                else:
+                    expires_at = cache_expiry(symbol, open_ttl=self.open_ttl)
+                self._cache[symbol] = (price, expires_at)
+
+        return prices
+
+    def clear(self):
+        """Drop all cached prices."""
+        with self._lock:
+            self._cache.clear()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_price_service():
+    """Return the process-wide price service for the configured backend."""
+    key = (settings.PRICE_BACKEND, settings.PRICE_CACHE_TTL)
+    with _services_lock:
+        if key not in _services:
+            backend = import_string(settings.PRICE_BACKEND)()
+            _services[key] = PriceService(backend, open_ttl=settings.PRICE_CACHE_TTL)
+        return _services[key]
@@ -0,0 +1,47 @@
+"""
+Build the dashboards off to the side and publish them with one pointer flip.
+
+Both dashboard tables carry the DataVersion each row was built for, and the
+list views only read rows of the published version. A processing run stages a
+complete new version while readers keep seeing the previous one, then
+``DataVersion.publish`` switches every reader over in a single UPDATE.
+
+Staging and publishing run in one transaction holding ``DataVersion.lock``,
+so two runs publishing at once (a manual command next to the scheduler) take
+turns instead of staging under the same version.
+"""
+from django.db import transaction
+
+from core.models import DataVersion
+from ma.dashboard import rebuild_dashboard as rebuild_ma_dashboard
+from ma.models import DashboardRow as MADashboardRow
+from signals.dashboard import rebuild_dashboard as rebuild_signals_dashboard
+from signals.models import DashboardRow as SignalDashboardRow
+
+DASHBOARD_MODELS = (SignalDashboardRow, MADashboardRow)
+
+
+def publish_dashboards():
+    """
+    Stage both dashboards under the next data version and publish them.
+
+    Returns:
+        Tuple of (V20 rows, MA rows) written
+    """
+    with transaction.atomic():
+        published = DataVersion.lock().version
+        version = published + 1
+
+        # Rows left behind by an interrupted build would collide with this one
+        for model in DASHBOARD_MODELS:
+            model.objects.filter(run_version__gt=published).delete()
+
+        signal_rows = rebuild_signals_dashboard(version)
+        ma_rows = rebuild_ma_dashboard(version)
+        DataVersion.publish(version)
+
+        # Readers have moved on; drop the previous snapshot
+        for model in DASHBOARD_MODELS:
+            model.objects.filter(run_version__lt=version).delete()
+
+    return signal_rows, ma_rows
@@ -0,0 +1,199 @@
+"""
+Local on-disk store for daily OHLCV quotes.
+
+Each symbol is kept in its own compressed ``.npz`` file holding one array per
+column plus the date index, so repeated runs read history from disk and only
+ask the network for the bars after the last stored date.
+
+Each top-up re-fetches the last stored bar. When the provider's prices for
+that bar moved (a split or dividend back-adjusts the whole history), the
+stored history is on a stale adjustment basis and is replaced by a full
+backfill instead of being extended. Each file keeps a counter of such
+re-adjustments, its basis, so strategy checkpoints computed on older prices
+can be recognised as stale.
+"""
+import datetime
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+INDEX_KEY = '__index__'
+COVERED_FROM_KEY = '__covered_from__'
+BASIS_KEY = '__basis__'
+
+
+class QuoteStore:
+    """Per-symbol columnar quote store with incremental top-up."""
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.QUOTE_STORE_DIR)
+        # {symbol: basis} of every symbol loaded or saved
+        self.bases = {}
+        # Symbols whose history the last get_stock_quotes call replaced after a re-adjustment
+        self.readjusted = []
+
+    def path_for(self, symbol):
+        """Return the file path used to store a symbol."""
+        return self.root / f"{symbol.replace('/', '_')}.npz"
+
+    def load(self, symbol):
+        """
+        Load stored quotes for a symbol.
+
+        Returns:
+            Tuple of (DataFrame, covered_from) or (None, None) when nothing is stored.
+            ``covered_from`` is the earliest start date that has been backfilled.
+        """
+        path = self.path_for(symbol)
+        if not path.exists():
+            return None, None
+
+        with np.load(path, allow_pickle=False) as stored:
+            index = pd.DatetimeIndex(stored[INDEX_KEY])
+            covered_from = pd.Timestamp(stored[COVERED_FROM_KEY][0]).date()
+            self.bases[symbol] = int(stored[BASIS_KEY][0]) if BASIS_KEY in stored.files else 0
+            columns = {
+                key: stored[key]
+                for key in stored.files
+                if key not in (INDEX_KEY, COVERED_FROM_KEY, BASIS_KEY)
+            }
+
+        return pd.DataFrame(columns, index=index), covered_from
+
+    def save(self, symbol, data, covered_from, basis=None):
+        """Atomically write quotes for a symbol, keeping its basis unless one is given."""
+        if basis is None:
+            basis = self.bases.get(symbol, 0)
+        self.root.mkdir(parents=True, exist_ok=True)
+        arrays = {column: data[column].to_numpy() for column in data.columns}
+        arrays[INDEX_KEY] = data.index.to_numpy(dtype='datetime64[ns]')
+        arrays[COVERED_FROM_KEY] = np.array([covered_from], dtype='datetime64[D]')
+        arrays[BASIS_KEY] = np.array([basis], dtype=np.int64)
+
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, self.path_for(symbol))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.bases[symbol] = basis
+
+    def get_stock_quotes(self, symbols, start_date, end_date, fetch):
+        """
+        Return quotes for ``symbols`` between ``start_date`` and ``end_date``.
+
+        Mirrors ``StockReader.get_stock_quotes``: dates are ``YYYY-MM-DD`` strings
+        and ``end_date`` is exclusive. Symbols without stored history, or whose
+        history does not reach back to ``start_date``, are backfilled in full;
+        everything else is topped up from its last stored bar only, and
+        backfilled in full when that bar's prices were re-adjusted. Those
+        symbols are listed in ``self.readjusted`` and their basis moves on.
+
+        Args:
+            symbols: Iterable of symbols
+            start_date: First date wanted
+            end_date: Exclusive end date
+            fetch: Callable ``fetch(symbols, start_date, end_date)`` returning
+                a dictionary of {symbol: DataFrame}, e.g. ``reader.get_stock_quotes``
+
+        Returns:
+            Dictionary of {symbol: DataFrame} for symbols with data in range
+        """
+        start = datetime.date.fromisoformat(start_date)
+        end = datetime.date.fromisoformat(end_date)
+
+        stored = {}
+        fetch_plan = {}
+        for symbol in symbols:
+            data, covered_from = self.load(symbol)
+            stored[symbol] = (data, covered_from)
+
+            if data is None or covered_from > start:
+                fetch_from = start_date
+            elif data.empty or data.index[-1].date() + datetime.timedelta(days=1) < end:
+                # Re-fetch the last stored bar too in case it was revised
+                fetch_from = data.index[-1].strftime('%Y-%m-%d') if not data.empty else start_date
+            else:
+                continue
+
+            fetch_plan.setdefault(fetch_from, []).append(symbol)
+
+        readjusted = []
+        for fetch_from, group in fetch_plan.items():
+            fetched = fetch(group, fetch_from, end_date)
+            backfill = fetch_from == start_date
+
+            for symbol in group:
+                new_data = fetched.get(symbol)
+                if new_data is None or new_data.empty:
+                    continue
+
+                data, covered_from = stored[symbol]
+                new_data = self._normalize(new_data)
+                if not backfill and self._readjusted(data, new_data):
+                    readjusted.append(symbol)
+                    continue
+                if data is not None:
+                    new_data = pd.concat([data, new_data])
+                    new_data = new_data[~new_data.index.duplicated(keep='last')].sort_index()
+
+                if backfill:
+                    covered_from = min(covered_from, start) if covered_from else start
+
+                self.save(symbol, new_data, covered_from)
+                stored[symbol] = (new_data, covered_from)
+
+        self.readjusted = []
+        if readjusted:
+            # Replace rather than merge: the old bars are on a different adjustment basis
+            fetched = fetch(readjusted, start_date, end_date)
+            for symbol in readjusted:
+                new_data = fetched.get(symbol)
+                if new_data is None or new_data.empty:
+                    continue
+                new_data = self._normalize(new_data).sort_index()
+                self.save(symbol, new_data, start, basis=self.bases.get(symbol, 0) + 1)
+                stored[symbol] = (new_data, start)
+                self.readjusted.append(symbol)
+
+        stock_quotes = {}
+        for symbol, (data, _) in stored.items():
+            if data is None:
+                continue
+            data = data[(data.index >= pd.Timestamp(start)) & (data.index < pd.Timestamp(end))]
+            if not data.empty:
+                stock_quotes[symbol] = data
+
+        return stock_quotes
+
+    @staticmethod
+    def _readjusted(data, new_data):
+        """
+        Whether the re-fetched last stored bar no longer matches the stored one.
+
+        Compares the open, which a still-forming bar does not revise but a
+        back-adjustment does.
+        """
+        if data is None or data.empty or 'Open' not in data or 'Open' not in new_data:
+            return False
+        last_date = data.index[-1]
+        if last_date not in new_data.index:
+            return False
+        stored_open = float(data['Open'].iloc[-1])
+        fetched_open = float(new_data.loc[last_date, 'Open'])
+        return not np.isclose(stored_open, fetched_open, rtol=1e-6, atol=0)
+
+    @staticmethod
+    def _normalize(data):
+        """Keep numeric columns on a timezone-naive date index."""
+        data = data.select_dtypes(include='number')
+        if data.index.tz is not None:
+            data = data.tz_localize(None)
+        return data
@@ -0,0 +1,172 @@
+"""
+Building blocks for the ``run_scheduler`` daemon.
+
+Jobs are management commands run at fixed UTC times. Each run happens in a
+forked child of the scheduler. The scheduler imports every job's command
+module, and with it pandas, numpy and yfinance, before the first fork (see
+``preload_commands``), so children share them copy-on-write instead of paying
+the cold import, while a stuck job can still be killed at its timeout.
+"""
+import datetime
+import fcntl
+import importlib
+import json
+import os
+import signal
+from pathlib import Path
+
+from django.core.management import call_command, get_commands, load_command_class
+from django.db import connections
+
+# Imported lazily by core.fetch and core.prices, so preloaded explicitly
+PRELOAD_MODULES = ('yfinance',)
+
+
+class LockBusy(Exception):
+    """Raised when another process holds the scheduler lock."""
+
+
+class FileLock:
+    """Exclusive, non-blocking ``flock`` held for the duration of a ``with`` block."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'a+')
+        try:
+            fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.file.close()
+            raise LockBusy(f"{self.path} is locked by another process")
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(str(os.getpid()))
+        self.file.flush()
+        return self
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+class Job:
+    """A management command scheduled at one or more UTC times of day."""
+
+    def __init__(self, name, command, times, args=(), weekdays=None, timeout=None):
+        self.name = name
+        self.command = command
+        self.args = list(args)
+        self.times = sorted(datetime.time.fromisoformat(value) for value in times)
+        self.weekdays = set(weekdays) if weekdays is not None else set(range(7))
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config['name'],
+            config['command'],
+            config['times'],
+            args=config.get('args', ()),
+            weekdays=config.get('weekdays'),
+            timeout=config.get('timeout'),
+        )
+
+    def latest_slot(self, now):
+        """Return the most recent scheduled time at or before ``now`` (within a week)."""
+        for days_ago in range(8):
+            day = (now - datetime.timedelta(days=days_ago)).date()
+            if day.weekday() not in self.weekdays:
+                continue
+            for at in reversed(self.times):
+                slot = datetime.datetime.combine(day, at, tzinfo=datetime.timezone.utc)
+                if slot <= now:
+                    return slot
+        return None
+
+    def next_slot(self, now):
+        """Return the first scheduled time after ``now``."""
+        for days_ahead in range(8):
+            day = (now + datetime.timedelta(days=days_ahead)).date()
+            if day.weekday() not in self.weekdays:
+                continue
+            for at in self.times:
+                slot = datetime.datetime.combine(day, at, tzinfo=datetime.timezone.utc)
+                if slot > now:
+                    return slot
+        return None
+
+    def due_slot(self, now, last_run, catch_up):
+        """
+        Return the slot to run now, if any.
+
+        Several missed slots collapse into one run of the latest; a slot older
+        than ``catch_up`` is skipped and waits for the next one.
+        """
+        slot = self.latest_slot(now)
+        if slot is None or (last_run is not None and slot <= last_run):
+            return None
+        if now - slot > catch_up:
+            return None
+        return slot
+
+
+def load_state(path):
+    """Return {job name: last slot run} from the state file."""
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return {name: datetime.datetime.fromisoformat(value) for name, value in raw.items()}
+
+
+def save_state(path, state):
+    """Write the state file atomically so a crash never leaves it half written."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({name: slot.isoformat() for name, slot in state.items()}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def preload_commands(jobs):
+    """
+    Import the command class of every job, and PRELOAD_MODULES, in this process.
+
+    Raises:
+        KeyError: When a job names an unknown command
+    """
+    commands = get_commands()
+    for job in jobs:
+        load_command_class(commands[job.command], job.command)
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+
+def _run_job(command, args):
+    # The scheduler handles Ctrl-C and shuts down once the job finishes
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    call_command(command, *args)
+
+
+def start_job(job, context):
+    """
+    Start a job in a forked child process.
+
+    Args:
+        job: Job to run
+        context: ``multiprocessing`` context using the 'fork' start method
+
+    Returns:
+        The started Process
+    """
+    # The child must open its own database connections
+    connections.close_all()
+    process = context.Process(target=_run_job, args=(job.command, job.args), name=job.name)
+    process.start()
+    return process
@@ -0,0 +1,89 @@
+"""
+Seeded synthetic OHLCV markets for benchmarks and tests.
+
+Prices follow a random walk with two kinds of injected events so the
+strategies have something to find:
+
+* V20 runs: six consecutive green candles rising ~30%, framed by red candles
+* MA crossovers: a 100-day decline followed by a 100-day rally, which pushes
+  the 50-day average back above the 200-day average
+
+The same seed always produces the same market.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+SyntheticMarket = namedtuple('SyntheticMarket', ['quotes', 'v20_starts', 'ma_crossovers'])
+
+TRADING_DAYS = 252
+V20_RUN_LENGTH = 6
+V20_DAILY_RETURN = 0.045  # 1.045 ** 6 ~ +30%
+MA_SWING_DAYS = 100
+
+
+def generate_market(symbols=40, years=2, seed=0, v20_runs=2, ma_crossovers=1, start='2020-01-01'):
+    """
+    Generate daily OHLCV quotes for many symbols.
+
+    Args:
+        symbols: Number of symbols, named SYN0000, SYN0001, ...
+        years: Years of business-day history per symbol
+        seed: Random seed
+        v20_runs: V20 runs injected per symbol
+        ma_crossovers: Decline-then-rally swings injected per symbol; needs at
+            least 320 days of history
+        start: First date of the history
+
+    Returns:
+        SyntheticMarket of ({symbol: DataFrame}, {symbol: [run start dates]},
+        {symbol: [rally start dates]})
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=int(years * TRADING_DAYS))
+    n = len(index)
+
+    quotes = {}
+    v20_starts = {}
+    crossovers = {}
+    for i in range(symbols):
+        symbol = f"SYN{i:04d}"
+        returns = rng.normal(0.0003, 0.015, n)
+
+        rally_starts = []
+        if n >= 2 * MA_SWING_DAYS + 120:
+            for at in np.sort(rng.choice(np.arange(2 * MA_SWING_DAYS, n - 120), ma_crossovers, replace=False)):
+                returns[at - MA_SWING_DAYS:at] = rng.normal(-0.004, 0.005, MA_SWING_DAYS)
+                returns[at:at + MA_SWING_DAYS] = rng.normal(0.006, 0.005, MA_SWING_DAYS)
+                rally_starts.append(at)
+
+        # Keep injected runs apart so each stays a separate run of green candles
+        slots = np.arange(10, n - V20_RUN_LENGTH - 10, 3 * V20_RUN_LENGTH)
+        run_starts = np.sort(rng.choice(slots, min(v20_runs, len(slots)), replace=False))
+        for at in run_starts:
+            returns[at:at + V20_RUN_LENGTH] = V20_DAILY_RETURN
+            returns[at + V20_RUN_LENGTH] = -0.01
+
+        close = 100 * np.exp(np.cumsum(returns))
+        previous_close = np.concatenate([[100.0], close[:-1]])
+        open_ = previous_close * (1 + rng.normal(0, 0.003, n))
+
+        for at in run_starts:
+            # Green candles opening at the previous close, framed by red candles
+            run = slice(at, at + V20_RUN_LENGTH + 1)
+            open_[run] = previous_close[run]
+            open_[at - 1] = max(open_[at - 1], close[at - 1]) * 1.002
+
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n)))
+        volume = rng.lognormal(13, 0.5, n).astype(np.int64)
+
+        quotes[symbol] = pd.DataFrame(
+            {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+            index=index,
+        )
+        v20_starts[symbol] = list(index[run_starts])
+        crossovers[symbol] = list(index[rally_starts])
+
+    return SyntheticMarket(quotes, v20_starts, crossovers)
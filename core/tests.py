@@ -0,0 +1,726 @@
+import asyncio
+import contextlib
+import datetime
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.alerts import AlertEngine, TriggerIndex
+from core.archive import SignalArchive, history
+from core.management.commands.archive_signals import Command as ArchiveCommand
+from core.backtest import backtest_limit_orders, backtest_ma, summarize
+from core.fetch import AsyncQuoteFetcher, FixtureProvider
+from core.instrumentation import find_regressions, percentiles, record_run
+from core.lth import compute_lth
+from core.models import DataVersion, FiredAlert, Membership, PipelineRun, StockLTH, Universe
+from core.prices import PriceService, cache_expiry
+from core.quote_store import QuoteStore
+from core.scheduler import FileLock, Job, LockBusy, load_state, save_state
+from core.synthetic import generate_market
+from core.universes import import_universes, symbol_index, sync_universes
+from ma.models import StockSignal
+from signals.models import Signal
+
+
+def make_quotes(start, periods, base=100.0):
+    index = pd.date_range(start, periods=periods, freq='D')
+    closes = [base + i for i in range(periods)]
+    return pd.DataFrame(
+        {'Open': closes, 'High': closes, 'Low': closes, 'Close': closes, 'Volume': [1000] * periods},
+        index=index,
+    )
+
+
+class FakeFetcher:
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.calls = []
+
+    def __call__(self, symbols, start_date, end_date):
+        self.calls.append((tuple(symbols), start_date, end_date))
+        result = {}
+        for symbol in symbols:
+            data = self.quotes[symbol]
+            result[symbol] = data[(data.index >= start_date) & (data.index < end_date)]
+        return result
+
+
+class QuoteStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = QuoteStore(self.tmp.name)
+        self.fetcher = FakeFetcher({'AAA': make_quotes('2024-01-01', 60)})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_backfills_then_tops_up_from_last_stored_bar(self):
+        quotes = self.store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-01', self.fetcher)
+        self.assertEqual(len(quotes['AAA']), 31)
+        self.assertEqual(self.fetcher.calls, [(('AAA',), '2024-01-01', '2024-02-01')])
+
+        quotes = self.store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-05', self.fetcher)
+        self.assertEqual(len(quotes['AAA']), 35)
+        self.assertEqual(self.fetcher.calls[-1], (('AAA',), '2024-01-31', '2024-02-05'))
+
+    def test_up_to_date_symbols_are_served_locally(self):
+        self.store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-01', self.fetcher)
+        quotes = self.store.get_stock_quotes(['AAA'], '2024-01-10', '2024-02-01', self.fetcher)
+
+        self.assertEqual(len(self.fetcher.calls), 1)
+        self.assertEqual(quotes['AAA'].index[0], pd.Timestamp('2024-01-10'))
+        self.assertEqual(quotes['AAA']['Close'].iloc[-1], 130.0)
+
+    def test_longer_window_triggers_backfill(self):
+        self.store.get_stock_quotes(['AAA'], '2024-01-20', '2024-02-01', self.fetcher)
+        quotes = self.store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-01', self.fetcher)
+
+        self.assertEqual(self.fetcher.calls[-1][1], '2024-01-01')
+        self.assertEqual(len(quotes['AAA']), 31)
+
+    def test_readjusted_history_is_backfilled_instead_of_extended(self):
+        self.store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-01', self.fetcher)
+        # A 2:1 split back-adjusts every bar the provider serves from now on
+        self.fetcher.quotes['AAA'] = make_quotes('2024-01-01', 60) / 2
+
+        quotes = self.store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-05', self.fetcher)
+        self.assertEqual(self.fetcher.calls[-1], (('AAA',), '2024-01-01', '2024-02-05'))
+        self.assertEqual(len(quotes['AAA']), 35)
+        self.assertEqual(quotes['AAA']['Close'].iloc[0], 50.0)
+        self.assertEqual(self.store.load('AAA')[0]['Close'].iloc[0], 50.0)
+        self.assertEqual(self.store.readjusted, ['AAA'])
+
+        # The basis survives in the file and a plain top-up keeps it
+        store = QuoteStore(self.tmp.name)
+        store.get_stock_quotes(['AAA'], '2024-01-01', '2024-02-10', self.fetcher)
+        self.assertEqual((store.bases, store.readjusted), ({'AAA': 1}, []))
+
+
+class CountingBackend:
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    def fetch(self, symbols):
+        self.calls.append(list(symbols))
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+class PriceServiceTests(SimpleTestCase):
+    def test_fetches_missing_symbols_in_one_batch_and_caches(self):
+        backend = CountingBackend({'AAPL': 200.0, 'TCS.NS': 3500.0})
+        service = PriceService(backend)
+
+        self.assertEqual(
+            service.get_prices(['AAPL', 'TCS.NS', 'AAPL', 'GONE']),
+            {'AAPL': 200.0, 'TCS.NS': 3500.0, 'GONE': None},
+        )
+        service.get_prices(['AAPL', 'TCS.NS', 'GONE'])
+
+        self.assertEqual(backend.calls, [['AAPL', 'GONE', 'TCS.NS']])
+
+    def test_cache_expiry_follows_market_hours(self):
+        # Wednesday 15:00 UTC is 11:00 in New York: market open
+        now = datetime.datetime(2024, 1, 10, 15, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(cache_expiry('AAPL', now=now), now.timestamp() + 60)
+
+        # Friday 22:00 UTC is after the close: cached until Monday's open
+        now = datetime.datetime(2024, 1, 12, 22, 0, tzinfo=datetime.timezone.utc)
+        monday_open = datetime.datetime(2024, 1, 15, 14, 30, tzinfo=datetime.timezone.utc)
+        self.assertEqual(cache_expiry('AAPL', now=now), monday_open.timestamp())
+
+        # Early Wednesday in India: cached until that morning's open
+        now = datetime.datetime(2024, 1, 10, 1, 0, tzinfo=datetime.timezone.utc)
+        india_open = datetime.datetime(2024, 1, 10, 3, 45, tzinfo=datetime.timezone.utc)
+        self.assertEqual(cache_expiry('TCS.NS', now=now), india_open.timestamp())
+
+
+class BulkLTHUpdateTests(TestCase):
+    def test_classifies_new_updated_and_unchanged(self):
+        StockLTH.objects.create(symbol='AAA', lth_price=100, lth_date=datetime.date(2023, 1, 1))
+        StockLTH.objects.create(symbol='BBB', lth_price=200, lth_date=datetime.date(2023, 1, 1))
+
+        with self.assertNumQueries(7):
+            result = StockLTH.bulk_update_lth_if_higher({
+                'AAA': (150.0, datetime.date(2024, 1, 1)),
+                'BBB': (180.0, datetime.date(2024, 1, 1)),
+                'CCC': (50.0, datetime.date(2024, 1, 1)),
+            }, universe='v40')
+
+        self.assertEqual(result, {'new': 1, 'updated': 1, 'unchanged': 1})
+        self.assertEqual(StockLTH.objects.get(symbol='AAA').lth_price, 150)
+        self.assertEqual(StockLTH.objects.get(symbol='BBB').lth_price, 200)
+        self.assertEqual(StockLTH.objects.get(symbol='BBB').universe, 'v40')
+        self.assertEqual(StockLTH.objects.get(symbol='CCC').universe, 'v40')
+
+
+class ComputeLTHTests(SimpleTestCase):
+    def test_matches_per_symbol_idxmax_on_misaligned_dates(self):
+        rng = np.random.default_rng(7)
+        stock_quotes = {}
+        for i, start in enumerate(['2024-01-01', '2024-01-15', '2024-02-01']):
+            data = make_quotes(start, 40)
+            data['Close'] = rng.uniform(50, 150, len(data))
+            stock_quotes[f'S{i}'] = data
+
+        summary = compute_lth(stock_quotes).summary
+
+        for symbol, data in stock_quotes.items():
+            max_close_idx = data['Close'].idxmax()
+            self.assertEqual(summary.loc[symbol, 'lth_price'], data.loc[max_close_idx, 'Close'])
+            self.assertEqual(summary.loc[symbol, 'lth_date'], max_close_idx.date())
+            self.assertEqual(summary.loc[symbol, 'last_close'], data['Close'].iloc[-1])
+
+    def test_running_high_and_drawdown(self):
+        data = make_quotes('2024-01-01', 4)
+        data['Close'] = [100.0, 120.0, 90.0, 108.0]
+
+        result = compute_lth({'AAA': data})
+
+        self.assertEqual(list(result.running_high['AAA']), [100.0, 120.0, 120.0, 120.0])
+        self.assertEqual(list(result.drawdown_pct['AAA'].round(2)), [0.0, 0.0, -25.0, -10.0])
+        self.assertEqual(result.summary.loc['AAA', 'drawdown_pct'], -10.0)
+
+    def test_malformed_frames_are_skipped_or_cleaned(self):
+        repeated = make_quotes('2024-01-01', 3)
+        repeated = pd.concat([repeated, repeated.iloc[[-1]].assign(Close=500.0)])
+        stock_quotes = {
+            'AAA': make_quotes('2024-01-01', 5),
+            'DUP': repeated,
+            'NOCLOSE': make_quotes('2024-01-01', 5).drop(columns='Close'),
+            'TEXT': make_quotes('2024-01-01', 5).assign(Close='n/a'),
+        }
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            summary = compute_lth(stock_quotes).summary
+
+        self.assertEqual(sorted(summary.index), ['AAA', 'DUP'])
+        self.assertEqual(summary.loc['DUP', 'lth_price'], 500.0)
+        self.assertIn('Skipping NOCLOSE', output.getvalue())
+        self.assertIn('Skipping TEXT', output.getvalue())
+
+
+class FlakyProvider(FixtureProvider):
+    def __init__(self, quotes, failures):
+        super().__init__(quotes)
+        self.failures = dict(failures)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, symbol, start_date, end_date):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if self.failures.get(symbol, 0) > 0:
+                self.failures[symbol] -= 1
+                raise ConnectionError('temporary failure')
+            return await super().fetch(symbol, start_date, end_date)
+        finally:
+            self.in_flight -= 1
+
+
+class BatchProvider(FixtureProvider):
+    """Serves several symbols per request, leaving out unknown ones like yf.download."""
+
+    def __init__(self, quotes, batch_size, drop_once=()):
+        super().__init__(quotes)
+        self.batch_size = batch_size
+        self.drop_once = set(drop_once)
+        self.requests = []
+
+    async def fetch_batch(self, symbols, start_date, end_date):
+        self.requests.append(list(symbols))
+        result = {}
+        for symbol in symbols:
+            if symbol in self.drop_once:
+                self.drop_once.discard(symbol)
+            elif symbol in self.quotes:
+                result[symbol] = await self.fetch(symbol, start_date, end_date)
+        return result
+
+
+class AsyncQuoteFetcherTests(SimpleTestCase):
+    def test_retries_bounds_concurrency_and_reports_failures(self):
+        quotes = {f'S{i}': make_quotes('2024-01-01', 10) for i in range(6)}
+        provider = FlakyProvider(quotes, {'S1': 2, 'S2': 10})
+        fetcher = AsyncQuoteFetcher(provider, concurrency=2, rate=1000, retries=3, backoff=0.001)
+
+        result = fetcher.get_stock_quotes(list(quotes) + ['MISSING'], '2024-01-01', '2024-01-06')
+
+        self.assertEqual(sorted(result), ['S0', 'S1', 'S3', 'S4', 'S5'])
+        self.assertEqual(len(result['S1']), 5)
+        self.assertEqual(sorted(fetcher.failures), ['MISSING', 'S2'])
+        self.assertLessEqual(provider.max_in_flight, 2)
+
+    def test_batches_share_one_request_and_retry_missing_symbols(self):
+        quotes = {f'S{i}': make_quotes('2024-01-01', 10) for i in range(7)}
+        provider = BatchProvider(quotes, batch_size=3, drop_once={'S4'})
+        fetcher = AsyncQuoteFetcher(provider, concurrency=2, rate=1000, retries=2, backoff=0.001)
+
+        result = fetcher.get_stock_quotes(list(quotes) + ['MISSING'], '2024-01-01', '2024-01-06')
+
+        self.assertEqual(sorted(result), sorted(quotes))
+        self.assertEqual(sorted(len(batch) for batch in provider.requests), [1, 1, 1, 2, 3, 3])
+        self.assertEqual(list(fetcher.failures), ['MISSING'])
+
+
+@override_settings(PRICE_BACKEND='core.prices.StaticPriceBackend')
+class VersionedResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_are_cached_until_the_data_version_changes(self):
+        first = self.client.get('/signals/?universe=v40')
+        self.assertEqual(first.status_code, 200)
+
+        # Served from cache: only the data version is read
+        with self.assertNumQueries(1):
+            second = self.client.get('/signals/?universe=v40')
+        self.assertEqual(second.content, first.content)
+
+        DataVersion.publish(DataVersion.current().version + 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/signals/?universe=v40')
+        self.assertGreater(len(queries), 1)
+
+    def test_etag_revalidation_returns_not_modified(self):
+        response = self.client.get('/ma/')
+
+        revalidated = self.client.get('/ma/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertIn('Last-Modified', response)
+
+
+class LTHExportTests(TestCase):
+    def test_streams_lth_rows_filtered_by_universe(self):
+        StockLTH.objects.create(symbol='AAA', lth_price=200, lth_date=datetime.date(2021, 5, 1), universe='v40')
+        StockLTH.objects.create(symbol='AAPL', lth_price=300, lth_date=datetime.date(2022, 1, 3), universe='us40')
+
+        response = self.client.get('/lth/export/?format=csv&universe=us40')
+
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('AAPL,300.0000,2022-01-03,us40', lines[1])
+
+
+class PipelineInstrumentationTests(TestCase):
+    def test_run_ledger_records_stages_and_failures(self):
+        with record_run('process_stocks') as recorder:
+            with recorder.stage('fetch', 'v40') as stage:
+                stage.rows = 500
+                stage.failed = 2
+            with recorder.stage('v20_compute', 'v40') as stage:
+                stage.rows = 3
+
+        run = PipelineRun.objects.get()
+        self.assertEqual(run.status, PipelineRun.PARTIAL)
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(
+            list(run.stages.order_by('pk').values_list('stage', 'universe', 'rows', 'failed')),
+            [('fetch', 'v40', 500, 2), ('v20_compute', 'v40', 3, 0)],
+        )
+
+    def test_failed_run_keeps_completed_stages(self):
+        with self.assertRaises(ValueError):
+            with record_run('process_lth') as recorder:
+                with recorder.stage('fetch'):
+                    pass
+                raise ValueError('boom')
+
+        run = PipelineRun.objects.get()
+        self.assertEqual(run.status, PipelineRun.FAILED)
+        self.assertEqual(run.error, 'ValueError: boom')
+        self.assertEqual(run.stages.count(), 1)
+
+    def test_flags_stages_slower_than_the_trailing_week(self):
+        now = timezone.now()
+        series = {
+            ('run_pipeline', 'fetch'): [(now - datetime.timedelta(days=d), 10.0) for d in (20, 3, 2, 1)]
+            + [(now, 11.0)],
+            # 60s twenty days ago is outside the trailing week and must not mask the jump
+            ('run_pipeline', 'v20_compute'): [(now - datetime.timedelta(days=20), 60.0)]
+            + [(now - datetime.timedelta(days=d), 2.0) for d in (3, 2, 1)]
+            + [(now, 5.0)],
+        }
+
+        self.assertEqual(
+            find_regressions(series),
+            [('run_pipeline', 'v20_compute', 5.0, 2.0)],
+        )
+        self.assertEqual(percentiles([1.0, 2.0, 3.0, 4.0, 5.0]), (3.0, 4.8))
+
+
+class SyntheticMarketTests(SimpleTestCase):
+    def test_same_seed_gives_the_same_consistent_candles(self):
+        market = generate_market(symbols=3, years=2, seed=7)
+
+        again = generate_market(symbols=3, years=2, seed=7)
+        pd.testing.assert_frame_equal(market.quotes['SYN0002'], again.quotes['SYN0002'])
+        for data in market.quotes.values():
+            self.assertTrue((data['High'] >= data[['Open', 'Close']].max(axis=1)).all())
+            self.assertTrue((data['Low'] <= data[['Open', 'Close']].min(axis=1)).all())
+
+    def test_injected_rally_crosses_the_moving_averages(self):
+        market = generate_market(symbols=1, years=2, seed=3)
+        close = market.quotes['SYN0000']['Close']
+        rally_start = market.ma_crossovers['SYN0000'][0]
+
+        above = close.rolling(50).mean() > close.rolling(200).mean()
+        self.assertFalse(above[rally_start])
+        self.assertTrue(above[rally_start:].iloc[100])
+
+
+def make_bars(start, lows, highs, closes=None):
+    index = pd.date_range(start, periods=len(lows), freq='D')
+    closes = closes or [(low + high) / 2 for low, high in zip(lows, highs)]
+    return pd.DataFrame({'Low': lows, 'High': highs, 'Close': closes}, index=index)
+
+
+class BacktestTests(SimpleTestCase):
+    def setUp(self):
+        # Dips to 95 on Jan 3, rallies to 125 on Jan 6, then drifts
+        self.quotes = {'AAA': make_bars(
+            '2024-01-01',
+            lows=[100, 99, 95, 97, 105, 118, 110],
+            highs=[104, 103, 99, 108, 115, 125, 114],
+        )}
+
+    def test_limit_orders_report_fill_target_and_adverse_excursion(self):
+        signals = pd.DataFrame({
+            'symbol': ['AAA', 'AAA', 'AAA', 'ZZZ'],
+            'date': [datetime.date(2024, 1, 1)] * 4,
+            'buy_price': [96.0, 90.0, 96.0, 10.0],
+            'sell_price': [120.0, 120.0, 130.0, 12.0],
+            'strategy': 'v20',
+            'universe': 'v40',
+        })
+
+        results = backtest_limit_orders(signals, self.quotes)
+
+        self.assertEqual(list(results['status']), ['target_hit', 'unfilled', 'open', 'no_data'])
+        hit = results.iloc[0]
+        self.assertEqual(hit['fill_date'], pd.Timestamp('2024-01-03'))
+        self.assertEqual(hit['exit_date'], pd.Timestamp('2024-01-06'))
+        self.assertEqual(hit['days_held'], 3)
+        self.assertEqual(hit['mae_pct'], -1.04)
+        self.assertEqual(hit['return_pct'], 25.0)
+        # Still open: marked to the last close of 112
+        self.assertEqual(results.iloc[2]['return_pct'], 16.67)
+
+        summary = summarize(results).loc[('v40', 'v20')]
+        self.assertEqual((summary['signals'], summary['filled'], summary['hits']), (4, 2, 1))
+        self.assertEqual(summary['hit_rate'], 0.5)
+
+    def test_ma_buys_exit_at_the_next_sell(self):
+        signals = pd.DataFrame({
+            'symbol': ['AAA', 'AAA', 'AAA'],
+            'date': [datetime.date(2024, 1, 2), datetime.date(2024, 1, 5), datetime.date(2024, 1, 6)],
+            'action': ['Buy', 'Sell', 'Buy'],
+            'price': [100.0, 110.0, 120.0],
+            'strategy': 'ma',
+            'universe': 'ma',
+        })
+
+        results = backtest_ma(signals, self.quotes)
+
+        self.assertEqual(list(results['status']), ['closed', 'open'])
+        self.assertEqual(list(results['return_pct']), [10.0, -6.67])
+        self.assertEqual(list(results['mae_pct']), [-5.0, -8.33])
+
+
+class SchedulerTests(SimpleTestCase):
+    def utc(self, *args):
+        return datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+
+    def test_missed_slots_collapse_into_one_catch_up_run(self):
+        job = Job('lth', 'process_lth', ['05:30', '08:30'], weekdays=[0, 1, 2, 3, 4])
+        catch_up = datetime.timedelta(hours=6)
+        # Friday 2024-01-05; the scheduler was down through both Friday slots
+        now = self.utc(2024, 1, 5, 10, 0)
+
+        self.assertEqual(job.due_slot(now, self.utc(2024, 1, 4, 8, 30), catch_up), self.utc(2024, 1, 5, 8, 30))
+        self.assertIsNone(job.due_slot(now, self.utc(2024, 1, 5, 8, 30), catch_up))
+        # Saturday: Friday's last slot is too old to catch up and nothing runs on weekends
+        self.assertIsNone(job.due_slot(self.utc(2024, 1, 6, 18, 0), self.utc(2024, 1, 4, 8, 30), catch_up))
+        self.assertEqual(job.next_slot(self.utc(2024, 1, 6, 18, 0)), self.utc(2024, 1, 8, 5, 30))
+
+    def test_state_round_trips_and_lock_is_exclusive(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state = {'pipeline': self.utc(2024, 1, 5, 13, 30)}
+            save_state(f"{tmp_dir}/state.json", state)
+            self.assertEqual(load_state(f"{tmp_dir}/state.json"), state)
+
+            with FileLock(f"{tmp_dir}/scheduler.lock"):
+                with self.assertRaises(LockBusy):
+                    with FileLock(f"{tmp_dir}/scheduler.lock"):
+                        pass
+            with FileLock(f"{tmp_dir}/scheduler.lock"):
+                pass
+
+    def test_preloads_job_commands_and_their_imports(self):
+        # A fresh interpreter, since this test process has imported everything already
+        script = (
+            "import sys, django; django.setup(); "
+            "from core.scheduler import Job, preload_commands; "
+            "before = {'pandas', 'numpy', 'yfinance'} & set(sys.modules); "
+            "preload_commands([Job('lth', 'process_lth', ['05:30']), Job('v20', 'process_stocks', ['13:30'])]); "
+            "print(sorted(before), all(m in sys.modules for m in ("
+            "'pandas', 'numpy', 'yfinance', 'core.management.commands.process_lth', "
+            "'signals.management.commands.process_stocks')))"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True, cwd=Path(__file__).parent.parent,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'swing_trader.settings'},
+        ).stdout
+        self.assertEqual(output.strip(), '[] True')
+
+
+class SignalArchiveTests(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        settings_override = override_settings(SIGNAL_ARCHIVE_DIR=tmp_dir.name, QUOTE_STORE_DIR=tmp_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        today = timezone.now().date()
+        self.old_day = today - datetime.timedelta(days=800)
+        for i, day in enumerate([self.old_day, self.old_day + datetime.timedelta(days=40), today]):
+            Signal.objects.create(
+                symbol='AAA', date=day, buy_price=100 + i, sell_price=130, expected_gain=30,
+                strategy='v20', universe='v40', status=Signal.EXPIRED if day < today else Signal.OPEN,
+            )
+        StockSignal.objects.create(symbol='AAA', date=today, action='Buy', price=110)
+        StockSignal.objects.create(symbol='AAA', date=today - datetime.timedelta(days=3), action='Buy', price=100)
+
+    def archive(self, *args):
+        call_command('archive_signals', *args, '--pause', '0', stdout=io.StringIO())
+
+    def test_old_rows_move_to_month_partitions_and_history_reads_both(self):
+        self.archive('--days', '365')
+
+        self.assertEqual(Signal.objects.count(), 1)
+        archive = SignalArchive()
+        self.assertEqual(len(archive.partitions(Signal)), 2)
+
+        signals = history(Signal, filters={'universe': 'v40'})
+        self.assertEqual(sorted(signals['buy_price']), [100.0, 101.0, 102.0])
+        self.assertEqual(len(history(Signal, end=self.old_day + datetime.timedelta(days=1))), 1)
+
+        # Archiving the same rows again keeps a single copy
+        archive.append(Signal, history(Signal))
+        self.assertEqual(len(archive.read(Signal)), 3)
+
+    def test_old_signals_still_tracked_stay_in_the_hot_table(self):
+        filled = Signal.objects.create(
+            symbol='BBB', date=self.old_day, buy_price=50, sell_price=65, expected_gain=30,
+            strategy='v20', universe='v40', status=Signal.FILLED,
+        )
+        self.archive('--table', 'signals', '--days', '365')
+
+        self.assertTrue(Signal.objects.filter(pk=filled.pk).exists())
+        self.assertEqual(Signal.objects.count(), 2)
+        self.assertEqual(len(history(Signal)), 4)
+
+    def test_superseded_ma_signals_leave_the_hot_table(self):
+        self.archive('--table', 'ma', '--superseded')
+
+        self.assertEqual(list(StockSignal.objects.values_list('price', flat=True)), [100])
+        self.assertEqual(sorted(history(StockSignal)['price']), [100.0, 110.0])
+
+    def test_archives_exactly_the_rows_it_deletes(self):
+        first, middle, last = Signal.objects.order_by('pk')
+        archived = ArchiveCommand().archive_rows(Signal, [first.pk, last.pk], SignalArchive(), batch_size=1, pause=0)
+
+        self.assertEqual(archived, 2)
+        self.assertEqual(list(Signal.objects.values_list('pk', flat=True)), [middle.pk])
+        self.assertEqual(sorted(SignalArchive().read(Signal)['buy_price']), [float(first.buy_price), float(last.buy_price)])
+
+    def test_superseded_keeps_signals_shown_in_other_universes(self):
+        today = timezone.now().date()
+        in_v200 = Signal.objects.create(
+            symbol='AAA', date=today, buy_price=102, sell_price=130, expected_gain=30,
+            strategy='v20', universe='v200',
+        )
+        superseded = Signal.objects.create(
+            symbol='AAA', date=today - datetime.timedelta(days=1), buy_price=102, sell_price=125, expected_gain=25,
+            strategy='v20', universe='v200',
+        )
+        self.archive('--table', 'signals', '--superseded', '--days', '3650')
+
+        self.assertTrue(Signal.objects.filter(pk=in_v200.pk).exists())
+        self.assertFalse(Signal.objects.filter(pk=superseded.pk).exists())
+        self.assertEqual(Signal.objects.filter(universe='v40').count(), 3)
+
+
+class UniverseImportTests(TestCase):
+    def write_universe(self, directory, filename, symbols):
+        with open(f"{directory}/{filename}", 'w') as f:
+            f.write('\n'.join(symbols) + '\n')
+
+    def test_import_tracks_membership_changes_with_effective_dates(self):
+        config = {
+            'files': [{'filename': 'v40.txt', 'category': 'v40'}],
+            'ma': [{'filename': 'v40.txt', 'category': 'v40'}, {'filename': 'us40.txt', 'category': 'us40'}],
+        }
+        first, second = datetime.date(2024, 1, 1), datetime.date(2024, 6, 1)
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_universe(directory, 'v40.txt', ['TCS.NS', 'INFY.NS'])
+            self.write_universe(directory, 'us40.txt', ['AAPL'])
+            import_universes(config, on=first, base_dir=directory)
+
+            self.write_universe(directory, 'v40.txt', ['TCS.NS', 'SBIN.NS'])
+            changes = import_universes(config, on=second, base_dir=directory)
+
+        self.assertEqual(changes, {'v40': (1, 1), 'us40': (0, 0)})
+        v40 = Universe.objects.get(name='v40')
+        self.assertTrue(v40.run_v20 and v40.run_ma)
+        self.assertFalse(Universe.objects.get(name='us40').run_v20)
+        self.assertEqual(Membership.objects.get(symbol='INFY.NS').end_date, second)
+
+        self.assertEqual(symbol_index(first).symbols('v40'), ['INFY.NS', 'TCS.NS'])
+        self.assertEqual(symbol_index(second).symbols('v40'), ['SBIN.NS', 'TCS.NS'])
+        self.assertEqual(symbol_index(second).universes('AAPL'), {'us40'})
+
+    def test_symbol_removed_and_restored_on_the_same_day(self):
+        config = {'files': [{'filename': 'v40.txt', 'category': 'v40'}]}
+        earlier, today = datetime.date(2024, 1, 1), datetime.date(2024, 6, 1)
+        with tempfile.TemporaryDirectory() as directory:
+            steps = [(earlier, ['A', 'B', 'C']), (today, ['A', 'D']), (today, ['A', 'B']), (today, ['A', 'B', 'C', 'D'])]
+            for on, symbols in steps:
+                self.write_universe(directory, 'v40.txt', symbols)
+                import_universes(config, on=on, base_dir=directory)
+
+        self.assertEqual(symbol_index(today).symbols('v40'), ['A', 'B', 'C', 'D'])
+        self.assertEqual(
+            sorted(Membership.objects.values_list('symbol', 'start_date', 'end_date')),
+            [('A', earlier, None), ('B', earlier, None), ('C', earlier, None), ('D', today, None)],
+        )
+
+    def test_sync_picks_up_edited_symbol_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(f"{directory}/stocks_config.json", 'w') as f:
+                f.write('{"files": [{"filename": "v40.txt", "category": "v40"}], "ma": []}')
+            self.write_universe(directory, 'v40.txt', ['TCS.NS'])
+            sync_universes(f"{directory}/stocks_config.json")
+            self.assertEqual(symbol_index().symbols('v40'), ['TCS.NS'])
+
+            self.write_universe(directory, 'v40.txt', ['TCS.NS', 'SBIN.NS'])
+            self.assertEqual(sync_universes(f"{directory}/stocks_config.json"), {'v40': (1, 0)})
+            self.assertEqual(symbol_index().symbols('v40'), ['SBIN.NS', 'TCS.NS'])
+
+            self.assertEqual(sync_universes(f"{directory}/missing.json"), {})
+        self.assertEqual(Membership.objects.count(), 2)
+
+    def test_symbol_index_is_cached_until_memberships_change(self):
+        universe = Universe.objects.create(name='v40')
+        Membership.objects.create(universe=universe, symbol='TCS.NS', start_date=datetime.date(2024, 1, 1))
+        symbol_index()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(symbol_index().symbols('v40'), ['TCS.NS'])
+
+        Membership.objects.create(universe=universe, symbol='SBIN.NS', start_date=datetime.date(2024, 1, 1))
+        self.assertEqual(symbol_index().symbols('v40'), ['SBIN.NS', 'TCS.NS'])
+
+
+class RecordingSink:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, alerts):
+        self.sent.extend(alerts)
+
+
+class AlertTests(TestCase):
+    def test_index_finds_crossed_levels_on_both_sides(self):
+        index = TriggerIndex([
+            ('v20_buy', 1, 'AAA', 100), ('v20_sell', 1, 'AAA', 130),
+            ('v20_buy', 2, 'AAA', 90), ('ma_buy', 3, 'AAA', 105),
+            ('v20_buy', 4, 'BBB', 50),
+        ])
+
+        crossed = index.crossed({'AAA': 99.5, 'BBB': None}, {'AAA': 110, 'BBB': 60})
+        self.assertEqual(sorted((alert.kind, alert.signal_id) for alert in crossed), [('ma_buy', 3), ('v20_buy', 1)])
+        self.assertEqual([alert.signal_id for alert in index.crossed({'AAA': 131}, {'AAA': 99.5})], [1])
+        # Levels the price already sat beyond were not crossed
+        self.assertEqual(index.crossed({'AAA': 85}, {'AAA': 89}), [])
+        self.assertEqual(index.crossed({'BBB': 40}, {}), [])
+
+    def test_engine_fires_each_trigger_once(self):
+        sink = RecordingSink()
+        engine = AlertEngine(TriggerIndex([('v20_buy', 1, 'AAA', 100), ('v20_buy', 2, 'AAA', 80)]), [sink])
+
+        self.assertEqual(engine.check({'AAA': 101}), [])
+        self.assertEqual(len(engine.check({'AAA': 95})), 1)
+        self.assertEqual(engine.check({'AAA': 94}), [])
+        self.assertEqual(FiredAlert.objects.get().signal_id, 1)
+
+        # A reloaded index skips triggers recorded as fired
+        reloaded = TriggerIndex([('v20_buy', 1, 'AAA', 100), ('v20_buy', 2, 'AAA', 80)],
+                                exclude=FiredAlert.objects.values_list('kind', 'signal_id'))
+        self.assertEqual(len(reloaded), 1)
+        self.assertEqual(len(sink.sent), 1)
+
+    def test_first_check_only_records_prices(self):
+        sink = RecordingSink()
+        engine = AlertEngine(TriggerIndex([('v20_buy', 1, 'AAA', 100), ('v20_sell', 1, 'AAA', 130)]), [sink])
+
+        # Already below the buy level when first seen: no crossing happened
+        self.assertEqual(engine.check({'AAA': 95}), [])
+        self.assertEqual(engine.check({'AAA': 96}), [])
+        self.assertEqual([alert.kind for alert in engine.check({'AAA': 131})], ['v20_sell'])
+
+        # A restarted engine resumes from the saved prices
+        engine = AlertEngine(TriggerIndex([('v20_buy', 1, 'AAA', 100)]), [sink], last_prices=engine.last_prices)
+        self.assertEqual(len(engine.check({'AAA': 99})), 1)
+        self.assertEqual(len(sink.sent), 2)
+
+    def test_retry_skips_sinks_that_already_received_the_alert(self):
+        class FailingOnceSink(RecordingSink):
+            failed = False
+
+            def send(self, alerts):
+                if not self.failed:
+                    self.failed = True
+                    raise OSError('webhook down')
+                super().send(alerts)
+
+        first, second = RecordingSink(), FailingOnceSink()
+        engine = AlertEngine(TriggerIndex([('v20_buy', 1, 'AAA', 100)]), [first, second], last_prices={'AAA': 105})
+
+        with self.assertRaises(OSError):
+            engine.check({'AAA': 99})
+        self.assertFalse(FiredAlert.objects.exists())
+
+        self.assertEqual(len(engine.check({'AAA': 98})), 1)
+        self.assertEqual(len(first.sent), 1)
+        self.assertEqual(len(second.sent), 1)
+        self.assertEqual(FiredAlert.objects.count(), 1)
+
+    def test_checks_thousands_of_triggers_per_tick(self):
+        rng = np.random.default_rng(0)
+        triggers = [
+            ('v20_buy', i, f'S{i % 500:03d}', float(level)) for i, level in enumerate(rng.uniform(50, 150, 20000))
+        ]
+        index = TriggerIndex(triggers)
+        prices = {f'S{i:03d}': 100.0 for i in range(500)}
+
+        crossed = index.crossed(prices, {symbol: 150.0 for symbol in prices})
+
+        self.assertEqual(len(crossed), sum(1 for trigger in triggers if 100.0 <= trigger[3] < 150.0))
@@ -0,0 +1,151 @@
+"""
+Universe definitions: the stocks_config.json files and the Universe tables.
+
+``stocks_config.json`` and the symbol files it names are the source the
+Universe and Membership tables are imported from; each processing command
+syncs them on start. Processing commands and views read the tables, through
+a per-process cached symbol index, instead of re-parsing the files.
+"""
+import json
+from pathlib import Path
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Membership, Universe
+
+# Config sections and the strategy flag each one sets
+SECTION_FLAGS = {'files': 'run_v20', 'ma': 'run_ma'}
+
+_index_cache = {}
+
+
+def load_stocks_config(path='stocks_config.json'):
+    """Load the universe configuration file."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def read_symbol_file(path):
+    """Read one symbol per line, skipping blank lines."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def import_universes(config_data, on=None, base_dir='.'):
+    """
+    Sync the Universe and Membership tables with the config and its symbol files.
+
+    Symbols new to a universe start a membership on ``on``, or reopen one that
+    ended on ``on``; symbols no longer listed have their open membership ended
+    on ``on``. Universes missing from
+    the config keep their memberships but stop running any strategy.
+
+    Args:
+        config_data: Parsed stocks_config.json
+        on: Effective date of the changes (default: today)
+        base_dir: Directory the symbol files are relative to
+
+    Returns:
+        Dict of {universe name: (symbols added, symbols removed)}
+    """
+    on = on or timezone.now().date()
+    flags = {}
+    for section, flag in SECTION_FLAGS.items():
+        for entry in config_data.get(section, []):
+            flags.setdefault((entry['category'], entry['filename']), set()).add(flag)
+
+    changes = {}
+    with transaction.atomic():
+        Universe.objects.exclude(name__in=[name for name, _ in flags]).update(run_v20=False, run_ma=False)
+
+        for (name, filename), universe_flags in flags.items():
+            universe, _ = Universe.objects.update_or_create(
+                name=name,
+                defaults={
+                    'source_file': filename,
+                    **{flag: flag in universe_flags for flag in SECTION_FLAGS.values()},
+                },
+            )
+            symbols = set(read_symbol_file(Path(base_dir) / filename))
+            current = set(universe.memberships.active(on).values_list('symbol', flat=True))
+
+            added = symbols - current
+            removed = current - symbols
+            # A symbol dropped and restored on the same day keeps its membership
+            ended_on = universe.memberships.filter(symbol__in=added, end_date=on)
+            reopened = set(ended_on.values_list('symbol', flat=True))
+            ended_on.update(end_date=None)
+            Membership.objects.bulk_create([
+                Membership(universe=universe, symbol=symbol, start_date=on) for symbol in sorted(added - reopened)
+            ])
+            universe.memberships.active(on).filter(symbol__in=removed).update(end_date=on)
+            changes[name] = (len(added), len(removed))
+
+    clear_symbol_index()
+    return changes
+
+
+def sync_universes(path='stocks_config.json'):
+    """
+    Import the config and its symbol files as they are now.
+
+    Called at the start of every processing command, so edits to the symbol
+    files take effect on the next run as they did before the tables existed.
+    Importing is idempotent; without a config file the tables are left as they are.
+
+    Returns:
+        Dict of {universe name: (symbols added, symbols removed)}
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return import_universes(load_stocks_config(path), base_dir=path.parent)
+
+
+def strategy_universes(strategy):
+    """
+    Universes a strategy runs on.
+
+    Args:
+        strategy: 'v20' or 'ma'
+    """
+    return list(Universe.objects.filter(**{f'run_{strategy}': True}).order_by('pk'))
+
+
+class SymbolIndex:
+    """Active memberships on one date, indexed both ways."""
+
+    def __init__(self, memberships):
+        self.by_symbol = {}
+        self.by_universe = {}
+        for symbol, universe in memberships:
+            self.by_symbol.setdefault(symbol, set()).add(universe)
+            self.by_universe.setdefault(universe, []).append(symbol)
+
+    def universes(self, symbol):
+        """Names of the universes ``symbol`` belongs to."""
+        return self.by_symbol.get(symbol, set())
+
+    def symbols(self, universe):
+        """Symbols of a universe, sorted."""
+        return sorted(self.by_universe.get(universe, []))
+
+
+def symbol_index(on=None):
+    """
+    Return the SymbolIndex for ``on`` (default: today), cached per process.
+
+    The cache is cleared by import_universes and by saving or deleting a
+    Membership in this process.
+    """
+    on = on or timezone.now().date()
+    if on not in _index_cache:
+        memberships = Membership.objects.active(on).values_list('symbol', 'universe__name')
+        _index_cache[on] = SymbolIndex(memberships.iterator(chunk_size=2000))
+    return _index_cache[on]
+
+
+def clear_symbol_index(*args, **kwargs):
+    """Drop cached symbol indexes; also usable as a model signal receiver."""
+    _index_cache.clear()
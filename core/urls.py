@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import StockLTHExportView
+
+urlpatterns = [
+    path('export/', StockLTHExportView.as_view(), name='lth_export'),
+]
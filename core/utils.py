@@ -1,5 +1,6 @@
 """Utility functions for working with LTH data across apps."""
 
+from core.lth import update_lth_from_quotes
 from core.models import StockLTH
 
 
@@ -32,6 +33,11 @@ class LTHHelper:
         if lth_price is None:
             return None
         
+        return LTHHelper.distance_from_lth_price(current_price, lth_price)
+
+    @staticmethod
+    def distance_from_lth_price(current_price, lth_price):
+        """Calculate percentage distance from an already known LTH price."""
         distance_pct = ((float(current_price) - float(lth_price)) / float(lth_price)) * 100
         return round(distance_pct, 2)
     
@@ -73,43 +79,11 @@ class LTHHelper:
         Returns:
             Dictionary with update statistics
         """
-        updated_count = 0
-        new_count = 0
-        error_count = 0
-        
-        for symbol, data in stock_quotes.items():
-            try:
-                if data.empty:
-                    continue
-                
-                # Find the highest closing price and its date
-                max_close_idx = data['Close'].idxmax()
-                lth_price = data.loc[max_close_idx, 'Close']
-                lth_date = max_close_idx.date()
-                
-                # Update or create LTH record
-                was_updated_or_new = StockLTH.update_lth_if_higher(
-                    symbol=symbol,
-                    price=lth_price,
-                    date=lth_date,
-                    universe=universe
-                )
-                
-                if was_updated_or_new:
-                    # Check if it's a new record or an update
-                    existing_records = StockLTH.objects.filter(symbol=symbol).count()
-                    if existing_records == 1:
-                        new_count += 1
-                    else:
-                        updated_count += 1
-                        
-            except Exception as e:
-                error_count += 1
-                print(f"Error updating LTH for {symbol}: {str(e)}")
+        result = update_lth_from_quotes(stock_quotes, universe=universe)
         
         return {
-            'updated': updated_count,
-            'new': new_count,
-            'errors': error_count,
+            'updated': result['updated'],
+            'new': result['new'],
+            'errors': sum(1 for data in stock_quotes.values() if not data.empty) - result['processed'],
             'total_processed': len(stock_quotes)
         }
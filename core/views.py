@@ -0,0 +1,9 @@
+from core.export import ExportView
+from core.models import StockLTH
+
+
+class StockLTHExportView(ExportView):
+    model = StockLTH
+    fields = ('symbol', 'lth_price', 'lth_date', 'universe', 'last_updated')
+    filter_fields = ('symbol', 'universe')
+    date_field = 'lth_date'
@@ -0,0 +1,56 @@
+"""Materialize the lowest priced MA signals into the dashboard table."""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.dashboard import lth_columns
+from core.universes import symbol_index
+from .models import DashboardRow, StockSignal
+
+
+def rebuild_dashboard(version):
+    """
+    Stage MA dashboard rows holding the lowest priced signal per symbol.
+
+    Rows stay hidden until ``version`` is published; see core.publish.
+
+    Args:
+        version: DataVersion the rows are built for
+
+    Returns:
+        Number of rows written
+    """
+    today = timezone.now().date()
+    built_at = timezone.now()
+    signals = list(StockSignal.objects.lowest_per_symbol())
+    columns = lth_columns([signal.symbol for signal in signals])
+    index = symbol_index()
+
+    rows = [
+        DashboardRow(
+            signal=signal,
+            symbol=signal.symbol,
+            date=signal.date,
+            action=signal.action,
+            price=signal.price,
+            universe=signal.universe or _ma_universe(index, signal.symbol),
+            # New signals are those dated within the last 7 days
+            is_new=signal.date >= today - timedelta(days=7),
+            built_at=built_at,
+            run_version=version,
+            **columns[signal.symbol],
+        )
+        for signal in signals
+    ]
+
+    with transaction.atomic():
+        DashboardRow.objects.bulk_create(rows, batch_size=500)
+
+    return len(rows)
+
+
+def _ma_universe(index, symbol):
+    """Universe of a signal stored before signals recorded one: its first current membership."""
+    universes = sorted(index.universes(symbol))
+    return universes[0] if universes else None
@@ -1,50 +1,201 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from tradewise.quotes import StockReader
+from core.checkpoints import load_checkpoints, save_checkpoints, split_rebased, stamp_basis
+from core.db import bulk_upsert
+from core.fetch import AsyncQuoteFetcher
+from core.instrumentation import StageRecorder, record_run
+from core.publish import publish_dashboards
+from core.parallel import format_worker_summary, run_in_pool, shard
+from core.quote_store import QuoteStore
+from core.universes import strategy_universes, symbol_index, sync_universes
 from ma.models import StockSignal
+from ma.strategies import resume_signals
 from tradewise.strategy import MovingAverageStrategy
 import datetime
-import json
 
 class Command(BaseCommand):
     help = 'Process stocks and store results in the database'
 
-    def handle(self, *args, **options):
-        with open('stocks_config.json', 'r') as f:
-            config_data = json.load(f)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes (default: 1, sequential)',
+        )
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            default=50,
+            help='Symbols per worker task when running with --workers (default: 50)',
+        )
+        parser.add_argument(
+            '--full-recompute',
+            action='store_true',
+            help='Evaluate the whole history instead of resuming from the stored checkpoints',
+        )
 
-        for file_data in config_data['ma']:
-            input_filename = file_data['filename']
-            category = file_data['category']
-            processor = StockProcessor(input_filename, category)
-            processor.process_stocks()
+    def handle(self, *args, **options):
+        full_recompute = options['full_recompute']
+        with record_run('process_ma_stocks') as recorder:
+            sync_universes()
+            universes = strategy_universes('ma')
+            if options['workers'] > 1:
+                self.handle_parallel(universes, options['workers'], options['shard_size'], recorder, full_recompute)
+            else:
+                for universe in universes:
+                    processor = StockProcessor(universe.source_file, universe.name, recorder, full_recompute)
+                    processor.process_stocks()
+
+            with recorder.stage('dashboard') as stage:
+                signal_rows, ma_rows = publish_dashboards()
+                stage.rows = signal_rows + ma_rows
+            self.stdout.write(f"Published dashboards with {signal_rows} signal rows and {ma_rows} MA rows")
 
         self.stdout.write(self.style.SUCCESS('Successfully processed and stored stocks'))
 
+    def handle_parallel(self, universes, workers, shard_size, recorder, full_recompute=False):
+        """Compute signals for symbol shards on a process pool and store them here."""
+        tasks = []
+        for universe in universes:
+            for symbols in shard(symbol_index().symbols(universe.name), shard_size):
+                # Workers do not touch the database; checkpoints travel with the task
+                checkpoints = load_checkpoints('ma', universe.name, symbols)
+                tasks.append((universe.source_file, universe.name, symbols, checkpoints, full_recompute))
+
+        def store(task, result):
+            formatted_signals, checkpoints, rebased, stages = result
+            recorder.extend(stages)
+            StockProcessor(task[0], task[1], recorder).store_signals(formatted_signals, checkpoints, rebased)
+            self.stdout.write(f"  {task[1]}: {len(task[2])} symbols, {len(formatted_signals)} signals")
+
+        worker_stats, failures = run_in_pool(compute_signals, tasks, workers, store)
+
+        for task, error in failures:
+            with recorder.stage('ma_compute', task[1]) as stage:
+                stage.failed = len(task[2])
+            self.stdout.write(self.style.ERROR(f"  {task[1]}: shard of {len(task[2])} symbols failed: {error}"))
+        for line in format_worker_summary(worker_stats):
+            self.stdout.write(line)
+
+
+def compute_signals(input_filename, category, symbols, checkpoints=None, full_recompute=False):
+    """
+    Fetch quotes and evaluate the strategy for one shard; runs in a worker process.
+
+    Returns:
+        Tuple of (formatted signals, new checkpoints, re-adjusted symbols,
+        stage timings) for the parent to persist
+    """
+    processor = StockProcessor(input_filename, category, full_recompute=full_recompute)
+    formatted_signals = processor.compute_signals(processor.fetch_quotes(symbols), checkpoints)
+    return formatted_signals, processor.checkpoints, processor.rebased, processor.recorder.stages
+
+
 class StockProcessor:
-    def __init__(self, input_filename, category):
+    def __init__(self, input_filename, category, recorder=None, full_recompute=False):
         self.input_filename = input_filename
         self.category = category
+        self.recorder = recorder or StageRecorder()
+        self.full_recompute = full_recompute
+        self.checkpoints = {}
+        # {symbol: adjustment basis} of the quotes fetched by fetch_quotes
+        self.bases = {}
+        # Symbols re-adjusted since their checkpoint; their stored signals are on the old prices
+        self.rebased = set()
 
     def process_stocks(self):
-        reader = StockReader(self.input_filename)
-        stocks_list = reader.read_stock_list()
-
-        end_date = datetime.datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=2*365)).strftime("%Y-%m-%d")
+        stocks_list = symbol_index().symbols(self.category)
 
-        stock_quotes = reader.get_stock_quotes(stocks_list, start_date, end_date)
+        stock_quotes = self.fetch_quotes(stocks_list)
 
-        analyzer = MovingAverageStrategy(stock_quotes)
-        signals = analyzer.moving_average_strategy()
+        return self.process_quotes(stock_quotes)
 
-        # Filtered Signals
-        filter_signals = self.filter_signals(signals)
-        print('signals: \n', filter_signals)
+    def fetch_quotes(self, stocks_list):
+        """Fetch two years of quotes for the given symbols."""
+        fetcher = AsyncQuoteFetcher.from_settings()
 
-        # Formatted Signals
-        formatted_signals = self.formatted_signals(filter_signals)
-        StockSignal.objects.bulk_create([StockSignal(**signal_data) for signal_data in formatted_signals])
+        end_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        start_date = (datetime.datetime.now() - datetime.timedelta(days=2*365)).strftime("%Y-%m-%d")
 
+        with self.recorder.stage('fetch', self.category) as stage:
+            store = QuoteStore()
+            stock_quotes = store.get_stock_quotes(
+                stocks_list, start_date, end_date, fetch=fetcher.get_stock_quotes
+            )
+            self.bases = store.bases
+            stage.rows = sum(len(data) for data in stock_quotes.values())
+            stage.failed = len(fetcher.failures)
+        for symbol, error in fetcher.failures.items():
+            print(f"Failed to fetch quotes for {symbol}: {error}")
+        return stock_quotes
+
+    def process_quotes(self, stock_quotes, bases=None):
+        """
+        Run the moving average strategy on already fetched quotes and store the signals.
+
+        Args:
+            stock_quotes: Dictionary of {symbol: DataFrame}
+            bases: Optional {symbol: adjustment basis} of the quotes, e.g.
+                ``QuoteStore.bases``; defaults to those of fetch_quotes
+        """
+        checkpoints = load_checkpoints('ma', self.category, stock_quotes)
+        formatted_signals = self.compute_signals(stock_quotes, checkpoints, bases)
+        self.store_signals(formatted_signals, self.checkpoints, self.rebased)
+        return formatted_signals
+
+    def compute_signals(self, stock_quotes, checkpoints=None, bases=None):
+        """
+        Run the moving average strategy and return formatted signals.
+
+        With checkpoints only the bars after each symbol's checkpoint, plus
+        MA_WARMUP_BARS before it, are evaluated; the new checkpoints are left
+        in ``self.checkpoints``. Symbols re-adjusted since their checkpoint
+        are evaluated in full and left in ``self.rebased``.
+        """
+        bases = self.bases if bases is None else bases
+        current, self.rebased = split_rebased(checkpoints or {}, bases)
+        resume_from = None if checkpoints is None or self.full_recompute else current
+        with self.recorder.stage('ma_compute', self.category) as stage:
+            signals, checkpoints = resume_signals(
+                self.moving_average_strategy, stock_quotes, resume_from, warmup=settings.MA_WARMUP_BARS
+            )
+            self.checkpoints = stamp_basis(checkpoints, bases)
+
+            # Filtered Signals
+            filter_signals = self.filter_signals(signals)
+            print('signals: \n', filter_signals)
+
+            # Formatted Signals
+            formatted_signals = self.formatted_signals(filter_signals)
+            stage.rows = len(formatted_signals)
+        return formatted_signals
+
+    @staticmethod
+    def moving_average_strategy(stock_quotes):
+        analyzer = MovingAverageStrategy(stock_quotes)
+        return analyzer.moving_average_strategy()
+
+    def store_signals(self, formatted_signals, checkpoints=None, rebased=()):
+        """
+        Upsert formatted signals in one transaction, then the checkpoints they were computed to.
+
+        Stored signals of ``rebased`` symbols are deleted first, since they
+        were computed on prices from before a re-adjustment.
+        """
+        with self.recorder.stage('ma_store', self.category) as stage:
+            if rebased:
+                StockSignal.objects.filter(symbol__in=list(rebased)).delete()
+            stage.rows = bulk_upsert(
+                StockSignal,
+                [StockSignal(**signal_data) for signal_data in formatted_signals],
+                unique_fields=StockSignal.NATURAL_KEY,
+                update_fields=['price', 'universe'],
+            )
+            if checkpoints:
+                # Saved after the signals, so an interrupted run re-emits rather than loses them
+                save_checkpoints('ma', self.category, checkpoints)
+        return stage.rows
 
     def filter_signals(self, signals):
         # Read the list of stocks of interest from interest.txt
@@ -69,6 +220,7 @@ class StockProcessor:
                     "date": action["date"],
                     "action": action["action"],
                     "price": action["price"],
+                    "universe": self.category,
                 })
 
         return formatted_signals
\ No newline at end of file
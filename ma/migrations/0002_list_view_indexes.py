@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ma', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stocksignal',
+            index=models.Index(fields=['symbol', 'price'], name='ma_stocksig_symbol_3d4f2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stocksignal',
+            index=models.Index(fields=['symbol', 'date'], name='ma_stocksig_symbol_864363_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:33
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def remove_duplicate_stock_signals(apps, schema_editor):
+    """Collapse duplicates onto the oldest row, carrying over the latest price."""
+    StockSignal = apps.get_model('ma', 'StockSignal')
+    natural_key = ['symbol', 'date', 'action']
+
+    duplicates = (
+        StockSignal.objects.values(*natural_key)
+        .annotate(count=Count('id'), first_id=Min('id'), last_id=Max('id'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        latest = StockSignal.objects.get(pk=duplicate['last_id'])
+        StockSignal.objects.filter(pk=duplicate['first_id']).update(price=latest.price)
+        StockSignal.objects.filter(
+            **{field: duplicate[field] for field in natural_key}
+        ).exclude(pk=duplicate['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ma', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_stock_signals, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='stocksignal',
+            constraint=models.UniqueConstraint(fields=('symbol', 'date', 'action'), name='unique_stock_signal_natural_key'),
+        ),
+    ]
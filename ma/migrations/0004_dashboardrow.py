@@ -0,0 +1,35 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ma', '0003_natural_key_constraint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lth_price', models.DecimalField(decimal_places=4, max_digits=15, null=True)),
+                ('lth_date', models.DateField(null=True)),
+                ('close_price', models.DecimalField(decimal_places=4, max_digits=15, null=True)),
+                ('distance_from_lth', models.FloatField(null=True)),
+                ('is_new', models.BooleanField(default=False)),
+                ('built_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('symbol', models.CharField(max_length=20)),
+                ('date', models.DateField()),
+                ('action', models.CharField(max_length=4)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('signal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_rows', to='ma.stocksignal')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['symbol'], name='ma_dashboar_symbol_8c8b29_idx'), models.Index(fields=['distance_from_lth'], name='ma_dashboar_distanc_b9ede6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ma', '0004_dashboardrow'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['date'], name='ma_dashboar_date_215eab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['price'], name='ma_dashboar_price_165f29_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['is_new'], name='ma_dashboar_is_new_3d4b41_idx'),
+        ),
+    ]
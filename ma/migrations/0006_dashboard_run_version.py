@@ -0,0 +1,33 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+def tag_published_rows(apps, schema_editor):
+    # Existing rows belong to the snapshot readers already see
+    DataVersion = apps.get_model('core', 'DataVersion')
+    DashboardRow = apps.get_model('ma', 'DashboardRow')
+    data_version = DataVersion.objects.filter(pk=1).first()
+    if data_version is not None:
+        DashboardRow.objects.update(run_version=data_version.version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ma', '0005_dashboard_list_indexes'),
+        ('core', '0002_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardrow',
+            name='run_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(tag_published_rows, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['run_version', 'date'], name='ma_dashboar_run_ver_8fa332_idx'),
+        ),
+    ]
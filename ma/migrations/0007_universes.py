@@ -0,0 +1,31 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ma', '0006_dashboard_run_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardrow',
+            name='universe',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='stocksignal',
+            name='universe',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['run_version', 'universe', 'date'], name='ma_dashboar_run_ver_ab6f67_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stocksignal',
+            index=models.Index(fields=['universe'], name='ma_stocksig_univers_2e63c2_idx'),
+        ),
+    ]
@@ -1,10 +1,68 @@
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from core.models import DashboardRowBase
+
+
+class StockSignalQuerySet(models.QuerySet):
+    def lowest_per_symbol(self):
+        """Keep the lowest priced signal for each symbol, in one SQL query."""
+        lowest = self.annotate(
+            price_rank=Window(
+                RowNumber(),
+                partition_by=[F('symbol')],
+                order_by=[F('price').asc(), F('id').asc()],
+            )
+        ).filter(price_rank=1)
+        return self.filter(pk__in=lowest.values('pk'))
+
 
 class StockSignal(models.Model):
+    # Natural key of a signal; re-running the strategy upserts on these fields
+    NATURAL_KEY = ('symbol', 'date', 'action')
+
     symbol = models.CharField(max_length=20)
     date = models.DateField()
     action = models.CharField(max_length=4)  # 'buy' or 'sell'
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    universe = models.CharField(max_length=100, blank=True, null=True)  # Universe the strategy ran on
+
+    objects = StockSignalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['symbol', 'price']),
+            models.Index(fields=['symbol', 'date']),
+            models.Index(fields=['universe']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['symbol', 'date', 'action'],
+                name='unique_stock_signal_natural_key',
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.symbol} - Price: {self.price}, Action: {self.action}"
\ No newline at end of file
+        return f"{self.symbol} - Price: {self.price}, Action: {self.action}"
+
+
+class DashboardRow(DashboardRowBase):
+    """Precomputed row for the MA signals list view."""
+    signal = models.ForeignKey(StockSignal, on_delete=models.CASCADE, related_name='dashboard_rows')
+    symbol = models.CharField(max_length=20)
+    date = models.DateField()
+    action = models.CharField(max_length=4)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    universe = models.CharField(max_length=100, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_version', 'date']),
+            models.Index(fields=['run_version', 'universe', 'date']),
+            models.Index(fields=['symbol']),
+            models.Index(fields=['distance_from_lth']),
+            models.Index(fields=['date']),
+            models.Index(fields=['price']),
+            models.Index(fields=['is_new']),
+        ]
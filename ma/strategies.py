@@ -0,0 +1,56 @@
+"""
+Checkpointed evaluation of the moving average strategy.
+
+The strategy itself stays a black box: any callable taking {symbol: OHLC
+DataFrame} and returning {symbol: [{'action', 'date', 'price'}, ...]}, such as
+tradewise's ``MovingAverageStrategy(...).moving_average_strategy``. A moving
+average crossover on a bar only depends on the bars inside its longest window,
+so a checkpoint just records the last evaluated bar. The next run hands the
+strategy that many warm-up bars before the checkpoint plus the new bars, and
+keeps only the actions dated after the checkpoint.
+"""
+import pandas as pd
+
+
+def _action_date(action):
+    return pd.Timestamp(action['date']).date()
+
+
+def resume_signals(evaluate, stock_quotes, checkpoints=None, warmup=250):
+    """
+    Evaluate a strategy only over the bars after each symbol's checkpoint.
+
+    Args:
+        evaluate: Strategy callable, ``evaluate(stock_quotes) -> {symbol: actions}``
+        stock_quotes: Dictionary of {symbol: OHLC DataFrame}
+        checkpoints: Optional {symbol: (last_date, state)} to resume from
+        warmup: Bars before the checkpoint handed to the strategy; must cover
+            its longest moving average window
+
+    Returns:
+        Tuple of ({symbol: actions}, {symbol: checkpoint}) holding only symbols
+        with new actions and only checkpoints that moved
+    """
+    checkpoints = checkpoints or {}
+    windows = {}
+    for symbol, data in stock_quotes.items():
+        if data.empty:
+            continue
+        data = data.sort_index()
+        if symbol in checkpoints:
+            last_date = checkpoints[symbol][0]
+            if data.index[-1].date() <= last_date:
+                continue
+            start = data.index.searchsorted(pd.Timestamp(last_date), side='right') - warmup
+            data = data.iloc[max(start, 0):]
+        windows[symbol] = data
+
+    signals = {}
+    for symbol, actions in (evaluate(windows) if windows else {}).items():
+        if symbol in checkpoints:
+            actions = [action for action in actions if _action_date(action) > checkpoints[symbol][0]]
+        if actions:
+            signals[symbol] = actions
+
+    new_checkpoints = {symbol: (data.index[-1].date(), {}) for symbol, data in windows.items()}
+    return signals, new_checkpoints
@@ -0,0 +1,176 @@
+import contextlib
+import datetime
+import importlib.util
+import io
+from unittest import skipUnless
+
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from core.models import StrategyCheckpoint
+from core.publish import publish_dashboards
+from core.synthetic import generate_market
+from .models import DashboardRow, StockSignal
+from .strategies import resume_signals
+from .views import StockSignalListView
+
+
+class LowestPriceSignalTests(TestCase):
+    def test_keeps_lowest_price_signal_per_symbol(self):
+        day = datetime.date(2024, 1, 10)
+        StockSignal.objects.create(symbol='AAA', date=day, action='Buy', price=110)
+        lowest = StockSignal.objects.create(symbol='AAA', date=day + datetime.timedelta(days=1), action='Buy', price=100)
+        only_bbb = StockSignal.objects.create(symbol='BBB', date=day, action='Buy', price=50)
+
+        self.assertEqual(
+            set(StockSignal.objects.lowest_per_symbol().values_list('pk', flat=True)),
+            {lowest.pk, only_bbb.pk},
+        )
+
+    def test_query_count_is_constant_as_table_grows(self):
+        for size in (10, 200):
+            StockSignal.objects.all().delete()
+            StockSignal.objects.bulk_create([
+                StockSignal(symbol=f'S{i % 9}', date=datetime.date(2024, 1, 1) + datetime.timedelta(days=i), action='Buy', price=100 + i)
+                for i in range(size)
+            ])
+
+            with self.assertNumQueries(1):
+                list(StockSignal.objects.lowest_per_symbol())
+
+
+class DashboardTests(TestCase):
+    def test_view_reads_rebuilt_rows_in_one_query(self):
+        day = datetime.date(2024, 1, 10)
+        StockSignal.objects.create(symbol='AAPL', date=day, action='Buy', price=110, universe='us40')
+        StockSignal.objects.create(
+            symbol='AAPL', date=day + datetime.timedelta(days=1), action='Buy', price=100, universe='us40'
+        )
+        StockSignal.objects.create(symbol='TCS.NS', date=day, action='Buy', price=50, universe='v40')
+
+        self.assertEqual(publish_dashboards(), (0, 2))
+        self.assertEqual(DashboardRow.objects.get(symbol='AAPL').price, 100)
+
+        view = StockSignalListView(us=True, filter_signals=False)
+        view.setup(RequestFactory().get('/ma/us/'))
+        with self.assertNumQueries(1):
+            rows = list(view.get_queryset())
+        self.assertEqual([row.symbol for row in rows], ['AAPL'])
+
+    def test_list_is_filtered_ordered_and_paginated_in_sql(self):
+        day = datetime.date(2024, 1, 1)
+        StockSignal.objects.bulk_create([
+            StockSignal(symbol=f'S{i:03d}.NS', date=day + datetime.timedelta(days=i), action='Buy', price=100 + i)
+            for i in range(250)
+        ])
+        publish_dashboards()
+        # Rows with an even price sit 30% below their LTH; the rest only 5%
+        DashboardRow.objects.update(distance_from_lth=-5.0)
+        DashboardRow.objects.filter(price__in=range(100, 350, 2)).update(distance_from_lth=-30.0)
+
+        view = StockSignalListView()
+        view.setup(RequestFactory().get('/ma/?ordering=-price'))
+        queryset = view.get_queryset()
+        self.assertEqual(queryset.count(), 125)
+        self.assertEqual(queryset.order_by(*view.get_ordering()).first().price, 348)
+
+        view.setup(RequestFactory().get('/ma/?ordering=lth_price'))
+        self.assertEqual(view.get_ordering(), ['date', 'pk'])
+
+
+def sma_crossovers(stock_quotes, fast=20, slow=50):
+    """Reference strategy with the tradewise output shape and a known lookback."""
+    signals = {}
+    for symbol, data in stock_quotes.items():
+        closes = data['Close']
+        diff = closes.rolling(fast).mean() - closes.rolling(slow).mean()
+        previous = diff.shift()
+        crossed = ((previous <= 0) & (diff > 0)) | ((previous >= 0) & (diff < 0))
+        signals[symbol] = [
+            {'action': 'Buy' if diff[day] > 0 else 'Sell', 'date': day.date(), 'price': round(closes[day], 2)}
+            for day in data.index[crossed]
+        ]
+    return signals
+
+
+class ResumeSignalsTests(SimpleTestCase):
+    def flatten(self, signals):
+        return {(symbol, action['date'], action['action']) for symbol, actions in signals.items() for action in actions}
+
+    def test_daily_resumes_match_a_full_recompute_over_a_long_series(self):
+        quotes = generate_market(4, years=4, seed=11, ma_crossovers=3).quotes
+        length = min(len(data) for data in quotes.values())
+
+        full, _ = resume_signals(sma_crossovers, quotes)
+        self.assertGreater(len(self.flatten(full)), 20)
+
+        resumed, checkpoints = set(), {}
+        for end in range(40, length + 1):
+            signals, moved = resume_signals(
+                sma_crossovers, {symbol: data.iloc[:end] for symbol, data in quotes.items()}, checkpoints, warmup=60
+            )
+            resumed |= self.flatten(signals)
+            checkpoints.update(moved)
+
+        self.assertEqual(resumed, self.flatten(full))
+
+    def test_resume_hands_the_strategy_warmup_and_new_bars_only(self):
+        quotes = generate_market(2, years=2, seed=3).quotes
+        seen = {}
+
+        def evaluate(stock_quotes):
+            seen.update({symbol: len(data) for symbol, data in stock_quotes.items()})
+            return sma_crossovers(stock_quotes)
+
+        _, checkpoints = resume_signals(evaluate, {symbol: data.iloc[:-3] for symbol, data in quotes.items()})
+        signals, moved = resume_signals(evaluate, quotes, checkpoints, warmup=60)
+
+        self.assertEqual(seen, {symbol: 63 for symbol in quotes})
+        self.assertEqual(moved, {symbol: (data.index[-1].date(), {}) for symbol, data in quotes.items()})
+        self.assertEqual(resume_signals(evaluate, quotes, moved), ({}, {}))
+
+
+@skipUnless(importlib.util.find_spec('tradewise'), 'tradewise is not installed')
+class IncrementalMATests(TestCase):
+    def process(self, quotes, full_recompute=False, bases=None):
+        from .management.commands.process_ma_stocks import StockProcessor
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            StockProcessor('us40.txt', 'us40', full_recompute=full_recompute).process_quotes(quotes, bases)
+
+    def stored_signals(self):
+        return set(StockSignal.objects.values_list('symbol', 'date', 'action', 'price'))
+
+    def test_resumed_runs_match_a_full_recompute_over_a_long_series(self):
+        quotes = generate_market(6, years=4, seed=11, ma_crossovers=3).quotes
+        length = min(len(data) for data in quotes.values())
+
+        self.process(quotes, full_recompute=True)
+        full = self.stored_signals()
+        self.assertTrue(full)
+        StockSignal.objects.all().delete()
+        StrategyCheckpoint.objects.all().delete()
+
+        # Starts before the slow moving average exists, then advances a few bars at a time
+        for end in range(150, length + 5, 5):
+            self.process({symbol: data.iloc[:end] for symbol, data in quotes.items()})
+
+        self.assertEqual(self.stored_signals(), full)
+
+    def test_readjusted_symbols_are_evaluated_again_from_scratch(self):
+        quotes = generate_market(6, years=4, seed=11, ma_crossovers=3).quotes
+        length = min(len(data) for data in quotes.values())
+        split = next(iter(quotes))
+        # A 2:1 split back-adjusts the whole history of one symbol
+        adjusted = {**quotes, split: quotes[split].assign(**{c: quotes[split][c] / 2 for c in ['Open', 'High', 'Low', 'Close']})}
+
+        self.process(adjusted, full_recompute=True)
+        full = self.stored_signals()
+        StockSignal.objects.all().delete()
+        StrategyCheckpoint.objects.all().delete()
+
+        self.process({symbol: data.iloc[:length // 2] for symbol, data in quotes.items()})
+        # The quote store now serves the adjusted history on basis 1
+        for end in range(length // 2 + 5, length + 5, 5):
+            self.process({symbol: data.iloc[:end] for symbol, data in adjusted.items()}, bases={split: 1})
+
+        self.assertEqual(self.stored_signals(), full)
@@ -1,86 +1,48 @@
-from pathlib import Path
-
 from django.views.generic import ListView
-from django.conf import settings
-from django.db.models import F, Subquery, OuterRef, Case, When, BooleanField, Min
-from django.utils import timezone
-from datetime import timedelta
-from .models import StockSignal
-from core.mixins import LTHFilterMixin
-import yfinance as yf
+from .models import DashboardRow, StockSignal
+from core.cache import VersionedCacheMixin
+from core.export import ExportView
+from core.mixins import DashboardQueryMixin, LTHFilterMixin
 
-class StockSignalListView(LTHFilterMixin, ListView):
+class StockSignalListView(VersionedCacheMixin, DashboardQueryMixin, LTHFilterMixin, ListView):
     us = False
+    us_universe = 'us40'
     filter_signals = True
-    model = StockSignal
+    model = DashboardRow
     template_name = 'ma/stock_signals.html'
     context_object_name = 'signals'
-    ordering = ['date']
+    default_ordering = 'date'
+    ordering_fields = ('date', 'symbol', 'price', 'distance_from_lth')
 
-    def get_ordering(self):
-        ordering = self.request.GET.get('ordering', 'date')
-        return ordering
-    
     def get_queryset(self):
+        # Rows hold the lowest price signal per symbol, built by ma.dashboard at the end of each run
         queryset = super().get_queryset()
 
         if getattr(self, 'us', False):
-            us_symbols = self._get_us_symbols()
-            if us_symbols:
-                queryset = queryset.filter(symbol__in=us_symbols)
-            else:
-                queryset = queryset.exclude(symbol__contains='.')
+            queryset = queryset.filter(universe=self.us_universe)
 
-        # Get today's date
-        today = timezone.now().date()
-
-        # Get the IDs of records with minimum price for each symbol
-        lowest_price_signal_ids = []
-        unique_symbols = queryset.values('symbol').distinct()
-        
-        for symbol_dict in unique_symbols:
-            symbol = symbol_dict['symbol']
-            lowest_price_signal = queryset.filter(
-                symbol=symbol
-            ).order_by('price').first()
-            if lowest_price_signal:
-                lowest_price_signal_ids.append(lowest_price_signal.pk)
-
-        # Filter queryset to only include the lowest price signals
-        queryset = queryset.filter(pk__in=lowest_price_signal_ids)
-
-        # Annotate with a flag for new signals (added within the last 7 days)
-        queryset = queryset.annotate(
-            is_new=Case(
-                When(date__gte=today - timedelta(days=7), then=True),
-                default=False,
-                output_field=BooleanField()
-            )
-        )
-
-        return queryset
-
-    def _get_us_symbols(self):
-        us_file = Path(settings.BASE_DIR) / 'us40.txt'
-        if us_file.exists():
-            with open(us_file, 'r', encoding='utf-8') as f:
-                return [line.strip() for line in f if line.strip()]
-        return []
+        return self.filter_dashboard(queryset)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # Only the current page is loaded; filtering already happened in SQL
         signals = list(context['signals'])
         
-        # Use the mixin to add LTH data and filtering
-        filtered_signals = self.add_lth_data_to_signals(
-            signals,
-            price_field='price',
-            filter_signals=self.filter_signals,
+        # Use the mixin to overlay live prices and LTH data
+        context['signals'] = self.add_lth_data_to_signals(
+            signals, price_field='price', filter_signals=False
         )
         
-        # Update context with filtered signals and LTH info
-        context['signals'] = filtered_signals
-        context = self.add_lth_context(context, signals, filtered_signals)
+        # Update context with LTH filter info
+        context = self.add_lth_context(
+            context, self.unfiltered_queryset.count(), context['paginator'].count
+        )
         
         context['page_title'] = 'US Stock Trading Signals' if getattr(self, 'us', False) else 'Stock Trading Signals'
         return context
+
+
+class StockSignalExportView(ExportView):
+    model = StockSignal
+    fields = ('symbol', 'date', 'action', 'price', 'universe')
+    filter_fields = ('symbol', 'action', 'universe')
@@ -1,20 +1,17 @@
-import schedule
-import subprocess
-import time
-import datetime
+"""
+Start the in-process scheduler.
 
-def run_cmd_sh():
-    # Execute the cmd.sh script using subprocess
-    subprocess.run(["/bin/bash", "/path/to/cmd.sh"])
+Jobs and their times live in SCHEDULER_JOBS in swing_trader/settings.py;
+arguments are passed through, e.g. ``python run.py --run pipeline``.
+"""
+import os
+import sys
 
-# Define the time in UTC for 7:00 PM IST
-target_time_utc = datetime.time(13, 30)  # 7:00 PM IST is 13:30 UTC
 
-# Schedule the task to run daily at the target time in UTC
-schedule.every().day.at(target_time_utc.strftime("%H:%M")).do(run_cmd_sh)
-
-# Run the scheduler continuously
-while True:
-    schedule.run_pending()
-    time.sleep(60)  # Adjust the interval as needed
+if __name__ == '__main__':
+    # Commands read stocks_config.json and the universe files from the project root
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'swing_trader.settings')
+    from django.core.management import execute_from_command_line
 
+    execute_from_command_line([sys.argv[0], 'run_scheduler', *sys.argv[1:]])
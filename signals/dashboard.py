@@ -0,0 +1,52 @@
+"""Materialize the deduplicated V20 signals into the dashboard table."""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.dashboard import lth_columns
+from .models import DashboardRow, Signal
+
+
+def rebuild_dashboard(version):
+    """
+    Stage V20 dashboard rows for the current deduplicated signals.
+
+    Rows stay hidden until ``version`` is published; see core.publish.
+
+    Args:
+        version: DataVersion the rows are built for
+
+    Returns:
+        Number of rows written
+    """
+    today = timezone.now().date()
+    built_at = timezone.now()
+    signals = list(Signal.objects.deduplicated())
+    columns = lth_columns([signal.symbol for signal in signals])
+
+    rows = [
+        DashboardRow(
+            signal=signal,
+            symbol=signal.symbol,
+            date=signal.date,
+            buy_price=signal.buy_price,
+            sell_price=signal.sell_price,
+            expected_gain=signal.expected_gain,
+            strategy=signal.strategy,
+            universe=signal.universe,
+            status=signal.status,
+            filled_date=signal.filled_date,
+            # New stocks are those added within the last 7 days
+            is_new=signal.added_date >= today - timedelta(days=7),
+            built_at=built_at,
+            run_version=version,
+            **columns[signal.symbol],
+        )
+        for signal in signals
+    ]
+
+    with transaction.atomic():
+        DashboardRow.objects.bulk_create(rows, batch_size=500)
+
+    return len(rows)
@@ -1,7 +1,7 @@
 import django_filters
-from .models import Signal
+from .models import DashboardRow
 
 class SignalFilter(django_filters.FilterSet):
     class Meta:
-        model = Signal
-        fields = ['strategy', 'universe']  # Add more fields as needed
+        model = DashboardRow
+        fields = ['strategy', 'universe']  # Add more fields as needed; status is filtered by the view
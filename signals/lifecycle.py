@@ -0,0 +1,115 @@
+"""
+Incremental status tracking for stored V20 signals.
+
+A signal starts ``open``. It becomes ``filled`` on the first bar after its
+date whose low reaches ``buy_price``, and ``target_hit`` on a later bar whose
+high reaches ``sell_price``. An open signal that is not filled within
+``SIGNAL_EXPIRY_DAYS`` of its date becomes ``expired``.
+
+Each signal remembers the last bar applied to it in ``checked_through``, so a
+run only looks at the bars that arrived since the previous run, and only for
+signals that are still open or filled.
+"""
+from collections import Counter
+from itertools import groupby
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from core.quote_store import QuoteStore
+from .models import Signal
+
+LIFECYCLE_FIELDS = ['status', 'filled_date', 'closed_date', 'checked_through']
+
+
+def advance_signals(stock_quotes, universe=None, expiry_days=None):
+    """
+    Apply new daily bars to the open and filled signals of the quoted symbols.
+
+    Args:
+        stock_quotes: Dictionary of {symbol: OHLC DataFrame}
+        universe: Only advance signals of this universe
+        expiry_days: Days an open signal may wait for a fill (default: SIGNAL_EXPIRY_DAYS)
+
+    Returns:
+        Counter of {new status: signals moved to it}
+    """
+    if expiry_days is None:
+        expiry_days = settings.SIGNAL_EXPIRY_DAYS
+    expiry = np.timedelta64(expiry_days, 'D')
+
+    queryset = Signal.objects.filter(status__in=Signal.ACTIONABLE_STATUSES, symbol__in=list(stock_quotes))
+    if universe:
+        queryset = queryset.filter(universe=universe)
+    signals = queryset.only('symbol', 'date', 'buy_price', 'sell_price', *LIFECYCLE_FIELDS).order_by('symbol')
+
+    moved = Counter()
+    checked = []
+    for symbol, group in groupby(signals.iterator(chunk_size=2000), key=lambda signal: signal.symbol):
+        data = stock_quotes[symbol]
+        if data is None or data.empty:
+            continue
+        data = data.sort_index()
+        dates = data.index.to_numpy(dtype='datetime64[D]')
+        lows = data['Low'].to_numpy(dtype=float)
+        highs = data['High'].to_numpy(dtype=float)
+
+        for signal in group:
+            previous_status = signal.status
+            if _advance(signal, dates, lows, highs, expiry):
+                checked.append(signal)
+                if signal.status != previous_status:
+                    moved[signal.status] += 1
+
+    with transaction.atomic():
+        Signal.objects.bulk_update(checked, LIFECYCLE_FIELDS, batch_size=500)
+    return moved
+
+
+def _advance(signal, dates, lows, highs, expiry):
+    """Apply the bars after the signal's checkpoint; return False when there are none."""
+    checkpoint = np.datetime64(signal.checked_through or signal.date, 'D')
+    start = np.searchsorted(dates, checkpoint, side='right')
+    if start >= len(dates):
+        return False
+
+    target_from = start
+    if signal.status == Signal.OPEN:
+        expires_on = np.datetime64(signal.date, 'D') + expiry
+        stop = np.searchsorted(dates, expires_on, side='right')
+        fills = lows[start:stop] <= float(signal.buy_price)
+        if fills.any():
+            fill_idx = start + int(fills.argmax())
+            signal.status = Signal.FILLED
+            signal.filled_date = _to_date(dates[fill_idx])
+            # The target counts only on bars after the fill bar, since intraday order is unknown
+            target_from = fill_idx + 1
+        elif dates[-1] > expires_on:
+            signal.status = Signal.EXPIRED
+            signal.closed_date = _to_date(expires_on)
+
+    if signal.status == Signal.FILLED:
+        hits = highs[target_from:] >= float(signal.sell_price)
+        if hits.any():
+            signal.status = Signal.TARGET_HIT
+            signal.closed_date = _to_date(dates[target_from + int(hits.argmax())])
+
+    signal.checked_through = _to_date(dates[-1])
+    return True
+
+
+def _to_date(value):
+    return pd.Timestamp(value).date()
+
+
+def load_stored_quotes(symbols):
+    """Read already stored quotes for the given symbols from the local quote store."""
+    store = QuoteStore()
+    quotes = {}
+    for symbol in symbols:
+        data, _ = store.load(symbol)
+        if data is not None:
+            quotes[symbol] = data
+    return quotes
@@ -1,9 +1,18 @@
 from django.core.management.base import BaseCommand
-from tradewise.quotes import StockReader
+from core.checkpoints import load_checkpoints, save_checkpoints, split_rebased, stamp_basis
+from core.db import bulk_upsert
+from core.fetch import AsyncQuoteFetcher
+from core.instrumentation import StageRecorder, record_run
+from core.panel import build_panel
+from core.publish import publish_dashboards
+from core.parallel import format_worker_summary, run_in_pool, shard
+from core.quote_store import QuoteStore
+from core.universes import strategy_universes, symbol_index, sync_universes
+from signals.lifecycle import advance_signals, load_stored_quotes
+from signals.strategies import SIGNAL_COLUMNS, resume_quotes, v20_checkpoints, v20_signals_multi
 from signals.models import Signal
-from tradewise.strategy import V20Strategy
 import datetime
-import json
+import pandas as pd
 
 
 universe_strategies = {
@@ -26,79 +35,230 @@ universe_strategies = {
 class Command(BaseCommand):
     help = 'Process stocks and store results in the database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes (default: 1, sequential)',
+        )
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            default=50,
+            help='Symbols per worker task when running with --workers (default: 50)',
+        )
+        parser.add_argument(
+            '--full-recompute',
+            action='store_true',
+            help='Evaluate the whole history instead of resuming from the stored checkpoints',
+        )
+
     def handle(self, *args, **options):
-        with open('stocks_config.json', 'r') as f:
-            config_data = json.load(f)
+        full_recompute = options['full_recompute']
+        with record_run('process_stocks') as recorder:
+            sync_universes()
+            universes = strategy_universes('v20')
+            if options['workers'] > 1:
+                self.handle_parallel(universes, options['workers'], options['shard_size'], recorder, full_recompute)
+            else:
+                for universe in universes:
+                    processor = StockProcessor(universe.source_file, universe.name, recorder, full_recompute)
+                    processor.process_stocks()
 
-        for file_data in config_data['files']:
-            input_filename = file_data['filename']
-            category = file_data['category']
-            processor = StockProcessor(input_filename, category)
-            processor.process_stocks()
+            with recorder.stage('dashboard') as stage:
+                signal_rows, ma_rows = publish_dashboards()
+                stage.rows = signal_rows + ma_rows
+            self.stdout.write(f"Published dashboards with {signal_rows} signal rows and {ma_rows} MA rows")
 
         self.stdout.write(self.style.SUCCESS('Successfully processed and stored stocks'))
 
+    def handle_parallel(self, universes, workers, shard_size, recorder, full_recompute=False):
+        """Compute signals for symbol shards on a process pool and store them here."""
+        tasks = []
+        for universe in universes:
+            for symbols in shard(symbol_index().symbols(universe.name), shard_size):
+                # Workers do not touch the database; checkpoints travel with the task
+                checkpoints = load_checkpoints('v20', universe.name, symbols)
+                tasks.append((universe.source_file, universe.name, symbols, checkpoints, full_recompute))
+
+        signal_storer = SignalStorer()
+
+        def store(task, result):
+            signals, checkpoints, rebased, stages = result
+            recorder.extend(stages)
+            with recorder.stage('v20_store', task[1]) as stage:
+                signal_storer.discard_signals(task[1], rebased)
+                stage.rows = signal_storer.store_signals(signals)
+                save_checkpoints('v20', task[1], checkpoints)
+            self.stdout.write(f"  {task[1]}: {len(task[2])} symbols, {len(signals)} signals")
+
+        worker_stats, failures = run_in_pool(compute_signals, tasks, workers, store)
+
+        for task, error in failures:
+            with recorder.stage('v20_compute', task[1]) as stage:
+                stage.failed = len(task[2])
+            self.stdout.write(self.style.ERROR(f"  {task[1]}: shard of {len(task[2])} symbols failed: {error}"))
+
+        # Workers saved their quotes to the local store; advance statuses from there
+        for universe in universes:
+            with recorder.stage('v20_lifecycle', universe.name) as stage:
+                quotes = load_stored_quotes(symbol_index().symbols(universe.name))
+                stage.rows = sum(advance_signals(quotes, universe=universe.name).values())
+        for line in format_worker_summary(worker_stats):
+            self.stdout.write(line)
+
+
+def compute_signals(input_filename, category, symbols, checkpoints=None, full_recompute=False):
+    """
+    Fetch quotes and evaluate strategies for one shard; runs in a worker process.
+
+    Returns:
+        Tuple of (signals DataFrame, new checkpoints, re-adjusted symbols,
+        stage timings) for the parent to persist
+    """
+    processor = StockProcessor(input_filename, category)
+    stock_quotes = processor.fetch_quotes(symbols)
+    with processor.recorder.stage('v20_compute', category) as stage:
+        strategy_processor = StrategyProcessor(stock_quotes, category, checkpoints, processor.bases, full_recompute)
+        signals = strategy_processor.apply_strategies()
+        stage.rows = len(signals)
+    return signals, strategy_processor.checkpoints, strategy_processor.rebased, processor.recorder.stages
+
+
 class StockProcessor:
-    def __init__(self, input_filename, category):
+    def __init__(self, input_filename, category, recorder=None, full_recompute=False):
         self.input_filename = input_filename
         self.category = category
+        self.recorder = recorder or StageRecorder()
+        self.full_recompute = full_recompute
+        # {symbol: adjustment basis} of the quotes fetched by fetch_quotes
+        self.bases = {}
 
     def process_stocks(self):
-        reader = StockReader(self.input_filename)
-        stocks_list = reader.read_stock_list()
+        stocks_list = symbol_index().symbols(self.category)
+
+        stock_quotes = self.fetch_quotes(stocks_list)
+
+        return self.process_quotes(stock_quotes)
+
+    def fetch_quotes(self, stocks_list):
+        """Fetch two years of quotes for the given symbols."""
+        fetcher = AsyncQuoteFetcher.from_settings()
 
         end_date = datetime.datetime.now().strftime("%Y-%m-%d")
         start_date = (datetime.datetime.now() - datetime.timedelta(days=2*365)).strftime("%Y-%m-%d")
 
-        stock_quotes = reader.get_stock_quotes(stocks_list, start_date, end_date)
+        with self.recorder.stage('fetch', self.category) as stage:
+            store = QuoteStore()
+            stock_quotes = store.get_stock_quotes(
+                stocks_list, start_date, end_date, fetch=fetcher.get_stock_quotes
+            )
+            self.bases = store.bases
+            stage.rows = sum(len(data) for data in stock_quotes.values())
+            stage.failed = len(fetcher.failures)
+        for symbol, error in fetcher.failures.items():
+            print(f"Failed to fetch quotes for {symbol}: {error}")
+        return stock_quotes
 
-        strategy_processor = StrategyProcessor(stock_quotes, self.category)
-        signals = strategy_processor.apply_strategies()
+    def process_quotes(self, stock_quotes, bases=None):
+        """
+        Run strategies on already fetched quotes and store the signals.
 
-        signal_storer = SignalStorer()
-        signal_storer.store_signals(signals)
+        Args:
+            stock_quotes: Dictionary of {symbol: DataFrame}
+            bases: Optional {symbol: adjustment basis} of the quotes, e.g.
+                ``QuoteStore.bases``; defaults to those of fetch_quotes
+        """
+        checkpoints = load_checkpoints('v20', self.category, stock_quotes)
+        bases = self.bases if bases is None else bases
+
+        with self.recorder.stage('v20_compute', self.category) as stage:
+            strategy_processor = StrategyProcessor(
+                stock_quotes, self.category, checkpoints, bases, self.full_recompute
+            )
+            signals = strategy_processor.apply_strategies()
+            stage.rows = len(signals)
+
+        with self.recorder.stage('v20_store', self.category) as stage:
+            signal_storer = SignalStorer()
+            signal_storer.discard_signals(self.category, strategy_processor.rebased)
+            stage.rows = signal_storer.store_signals(signals)
+            # Saved after the signals, so an interrupted run re-emits rather than loses them
+            save_checkpoints('v20', self.category, strategy_processor.checkpoints)
+
+        with self.recorder.stage('v20_lifecycle', self.category) as stage:
+            stage.rows = sum(advance_signals(stock_quotes, universe=self.category).values())
+        return signals
 
 class StrategyProcessor:
-    def __init__(self, stock_quotes, category):
+    def __init__(self, stock_quotes, category, checkpoints=None, bases=None, full_recompute=False):
         self.stock_quotes = stock_quotes
         self.category = category
+        self.bases = bases or {}
+        # Symbols re-adjusted since their checkpoint; their stored signals are on the old prices
+        current, self.rebased = split_rebased(checkpoints or {}, self.bases)
+        # {symbol: (last_date, state)} to resume from; None evaluates the whole history
+        self.resume_from = None if checkpoints is None or full_recompute else current
+        self.checkpoints = {}
 
     def apply_strategies(self):
-        signals = []
+        """
+        Evaluate the universe's strategies on an aligned OHLC panel.
+
+        With checkpoints only the bars since each symbol's checkpoint are
+        evaluated, and only signals of runs those bars touch are returned.
+        The new checkpoints are left in ``self.checkpoints``.
+
+        Returns:
+            DataFrame with one row per signal, ready for SignalStorer
+        """
+        stock_quotes = self.stock_quotes
+        if self.resume_from is not None:
+            stock_quotes = resume_quotes(stock_quotes, self.resume_from)
+        panel = build_panel(stock_quotes)
+        self.checkpoints = stamp_basis(v20_checkpoints(panel), self.bases)
         strategies = universe_strategies[self.category]
+
+        # Group the argument sets per strategy so each engine runs once
+        num_days_by_strategy = {}
         for strategy_info in strategies:
             strategy_name = strategy_info["name"]
-            strategy_args = strategy_info["args"]
-
-            strategy_class = self.get_strategy_class(strategy_name)
-
-            # Dynamically call the strategy method based on strategy name
-            strategy_method = getattr(strategy_class(self.stock_quotes, category=self.category), f"{strategy_name.lower()}_strategy")
-            strategy_results = strategy_method(**strategy_args)
-
-            for symbol, results in strategy_results.items():
-                for result in results:
-                    signals.append({
-                        "symbol": symbol,
-                        "date": result["date"],
-                        "buy_price": result["buy"],
-                        "sell_price": result["sell"],
-                        "expected_gain": result["expected_gain"],
-                        "strategy": strategy_name,
-                        "universe": self.category
-                    })
+            num_days_by_strategy.setdefault(strategy_name, []).append(strategy_info["args"]["num_days"])
 
-        return signals
+        frames = []
+        for strategy_name, num_days_list in num_days_by_strategy.items():
+            strategy_engine = self.get_strategy_engine(strategy_name)
+            for frame in strategy_engine(panel, num_days_list).values():
+                frames.append(frame.assign(strategy=strategy_name, universe=self.category))
 
-    def get_strategy_class(self, strategy_name):
-        # Implement logic to get the strategy class based on the name
+        if not frames:
+            return pd.DataFrame(columns=SIGNAL_COLUMNS + ['strategy', 'universe'])
+        return pd.concat(frames, ignore_index=True)
+
+    def get_strategy_engine(self, strategy_name):
+        # Implement logic to get the strategy engine based on the name
         if strategy_name == "v20":
-            return V20Strategy
+            return v20_signals_multi
         # elif strategy_name == "AnotherStrategy":
-        #     return AnotherStrategy
-        # Add more strategy classes as needed
+        #     return another_strategy_multi
+        # Add more strategy engines as needed
+        raise ValueError(f"Unknown strategy: {strategy_name}")
 
 class SignalStorer:
+    def discard_signals(self, universe, symbols):
+        """Delete a universe's stored signals for symbols that are evaluated again from scratch."""
+        if not symbols:
+            return 0
+        deleted, _ = Signal.objects.filter(universe=universe, symbol__in=list(symbols)).delete()
+        return deleted
+
     def store_signals(self, signals):
-        for signal_data in signals:
-            Signal.objects.create(**signal_data)
+        """Upsert a signals DataFrame in one transaction, keeping added_date of existing rows."""
+        return bulk_upsert(
+            Signal,
+            [Signal(**signal_data) for signal_data in signals.to_dict('records')],
+            unique_fields=Signal.NATURAL_KEY,
+            update_fields=['sell_price', 'expected_gain'],
+        )
+
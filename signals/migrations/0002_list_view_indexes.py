@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='signal',
+            index=models.Index(fields=['symbol', 'buy_price', 'sell_price'], name='signals_sig_symbol_d2b78e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signal',
+            index=models.Index(fields=['universe', 'strategy'], name='signals_sig_univers_6c29a0_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:33
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def remove_duplicate_signals(apps, schema_editor):
+    """Collapse duplicates onto the oldest row, carrying over the latest targets."""
+    Signal = apps.get_model('signals', 'Signal')
+    natural_key = ['symbol', 'date', 'strategy', 'universe', 'buy_price']
+
+    duplicates = (
+        Signal.objects.values(*natural_key)
+        .annotate(count=Count('id'), first_id=Min('id'), last_id=Max('id'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        latest = Signal.objects.get(pk=duplicate['last_id'])
+        Signal.objects.filter(pk=duplicate['first_id']).update(
+            sell_price=latest.sell_price,
+            expected_gain=latest.expected_gain,
+        )
+        Signal.objects.filter(
+            **{field: duplicate[field] for field in natural_key}
+        ).exclude(pk=duplicate['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_signals, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='signal',
+            constraint=models.UniqueConstraint(fields=('symbol', 'date', 'strategy', 'universe', 'buy_price'), name='unique_signal_natural_key'),
+        ),
+    ]
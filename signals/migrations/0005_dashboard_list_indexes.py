@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0004_dashboardrow'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['date'], name='signals_das_date_999356_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['symbol'], name='signals_das_symbol_eac965_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['expected_gain'], name='signals_das_expecte_fce8be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['is_new'], name='signals_das_is_new_c9de5d_idx'),
+        ),
+    ]
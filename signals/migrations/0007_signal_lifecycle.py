@@ -0,0 +1,51 @@
+# Generated by Django 4.2.17 on 2026-10-18 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0006_dashboard_run_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardrow',
+            name='filled_date',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='dashboardrow',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('filled', 'Filled'), ('target_hit', 'Target hit'), ('expired', 'Expired')], default='open', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='signal',
+            name='checked_through',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='signal',
+            name='closed_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='signal',
+            name='filled_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='signal',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('filled', 'Filled'), ('target_hit', 'Target hit'), ('expired', 'Expired')], default='open', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardrow',
+            index=models.Index(fields=['run_version', 'status', 'universe'], name='signals_das_run_ver_bc4f07_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signal',
+            index=models.Index(fields=['status', 'universe'], name='signals_sig_status_e28b31_idx'),
+        ),
+    ]
@@ -1,8 +1,61 @@
 # signals/models.py
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 
+from core.models import DashboardRowBase
+
+
+class SignalQuerySet(models.QuerySet):
+    def deduplicated(self):
+        """
+        Keep one signal per (symbol, buy_price) and then per (symbol, date).
+
+        The first pass keeps the highest sell_price for each symbol and buy
+        price; the second keeps the highest sell_price (then expected_gain)
+        for each symbol and date. Both passes run as window functions in a
+        single SQL query, partitioned per universe and strategy, so each
+        universe's view keeps its own best signals.
+        """
+        best_per_buy_price = self.annotate(
+            buy_price_rank=Window(
+                RowNumber(),
+                partition_by=[F('universe'), F('strategy'), F('symbol'), F('buy_price')],
+                order_by=[F('sell_price').desc(), F('id').asc()],
+            )
+        ).filter(buy_price_rank=1)
+
+        best_per_date = self.model.objects.filter(
+            pk__in=best_per_buy_price.values('pk')
+        ).annotate(
+            date_rank=Window(
+                RowNumber(),
+                partition_by=[F('universe'), F('strategy'), F('symbol'), F('date')],
+                order_by=[F('sell_price').desc(), F('expected_gain').desc(), F('id').asc()],
+            )
+        ).filter(date_rank=1)
+
+        return self.filter(pk__in=best_per_date.values('pk'))
+
+
 class Signal(models.Model):
+    # Natural key of a signal; re-running a strategy upserts on these fields
+    NATURAL_KEY = ('symbol', 'date', 'strategy', 'universe', 'buy_price')
+
+    OPEN = 'open'  # Waiting for the price to reach buy_price
+    FILLED = 'filled'  # Bought, waiting for the price to reach sell_price
+    TARGET_HIT = 'target_hit'
+    EXPIRED = 'expired'  # Never filled within SIGNAL_EXPIRY_DAYS
+    STATUS_CHOICES = [
+        (OPEN, 'Open'),
+        (FILLED, 'Filled'),
+        (TARGET_HIT, 'Target hit'),
+        (EXPIRED, 'Expired'),
+    ]
+    # Statuses the list views show by default
+    ACTIONABLE_STATUSES = (OPEN, FILLED)
+
     symbol = models.CharField(max_length=20)
     date = models.DateField()
     buy_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -11,6 +64,25 @@ class Signal(models.Model):
     strategy = models.CharField(max_length=100)  # Adjust max_length as needed
     universe = models.CharField(max_length=100)  # Add universe field
     added_date = models.DateField(default=timezone.now)  # Date when the record is added
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=OPEN)
+    filled_date = models.DateField(null=True, blank=True)
+    closed_date = models.DateField(null=True, blank=True)  # Date the target was hit or the signal expired
+    checked_through = models.DateField(null=True, blank=True)  # Last daily bar applied by signals.lifecycle
+
+    objects = SignalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['symbol', 'buy_price', 'sell_price']),
+            models.Index(fields=['universe', 'strategy']),
+            models.Index(fields=['status', 'universe']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['symbol', 'date', 'strategy', 'universe', 'buy_price'],
+                name='unique_signal_natural_key',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.symbol} - Buy: {self.buy_price}, Sell: {self.sell_price}, Gain: {self.expected_gain}%"
@@ -29,3 +101,29 @@ class Signal(models.Model):
         """Check if buy_price is near LTH."""
         from core.utils import LTHHelper
         return LTHHelper.is_near_lth(self.buy_price, self.symbol, threshold_pct)
+
+
+class DashboardRow(DashboardRowBase):
+    """Precomputed row for the V20 signals list view."""
+    signal = models.ForeignKey(Signal, on_delete=models.CASCADE, related_name='dashboard_rows')
+    symbol = models.CharField(max_length=20)
+    date = models.DateField()
+    buy_price = models.DecimalField(max_digits=10, decimal_places=2)
+    sell_price = models.DecimalField(max_digits=10, decimal_places=2)
+    expected_gain = models.DecimalField(max_digits=5, decimal_places=2)
+    strategy = models.CharField(max_length=100)
+    universe = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=Signal.STATUS_CHOICES, default=Signal.OPEN)
+    filled_date = models.DateField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_version', 'status', 'universe']),
+            models.Index(fields=['run_version', 'universe', 'strategy']),
+            models.Index(fields=['universe', 'strategy']),
+            models.Index(fields=['distance_from_lth']),
+            models.Index(fields=['date']),
+            models.Index(fields=['symbol']),
+            models.Index(fields=['expected_gain']),
+            models.Index(fields=['is_new']),
+        ]
@@ -0,0 +1,147 @@
+"""
+Vectorized V20 strategy evaluated on an aligned OHLC panel.
+
+A V20 setup is a run of consecutive green candles (close above open) whose
+high rises at least 20% above the low of the run's first candle within the
+first ``num_days`` candles of the run. The buy price is that first low and the
+sell price the highest high reached within the window.
+
+A run only depends on its own candles, so a daily run can resume from a
+checkpoint: symbols are re-evaluated from the start of a green run still open
+at the last evaluated bar, or from the first new bar otherwise.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+SIGNAL_COLUMNS = ['symbol', 'date', 'buy_price', 'sell_price', 'expected_gain']
+
+
+def green_runs(panel):
+    """
+    Locate runs of consecutive green candles for every symbol at once.
+
+    Runs are counted over each symbol's own bars: dates on which only other
+    symbols of the panel traded (NaN rows for this symbol) neither break a run
+    nor count towards its length.
+
+    Returns:
+        Tuple of (green, position, run_start) arrays shaped dates x symbols:
+        whether the candle is green, its 0-based position within its run and
+        the row index where the run started
+    """
+    opens = panel['Open'].to_numpy()
+    closes = panel['Close'].to_numpy()
+    traded = ~(np.isnan(opens) | np.isnan(closes))
+    green = closes > opens
+
+    rows = np.arange(green.shape[0])[:, None]
+    bars = np.cumsum(traded, axis=0)
+    last_break = np.maximum.accumulate(np.where(traded & ~green, bars, 0), axis=0)
+    position = bars - last_break - 1
+    run_start = np.maximum.accumulate(np.where(green & (position == 0), rows, 0), axis=0)
+    return green, position, run_start
+
+
+def v20_signals_multi(panel, num_days_list, min_gain=20.0):
+    """
+    Evaluate V20 for several ``num_days`` values in one pass over the panel.
+
+    Args:
+        panel: Dictionary of {field: DataFrame} from ``core.panel.build_panel``
+        num_days_list: Iterable of run window lengths to evaluate
+        min_gain: Minimum move in percent for a run to qualify
+
+    Returns:
+        Dictionary of {num_days: DataFrame} with SIGNAL_COLUMNS
+    """
+    closes = panel['Close']
+    if closes.empty:
+        return {num_days: pd.DataFrame(columns=SIGNAL_COLUMNS) for num_days in num_days_list}
+
+    highs = panel['High'].to_numpy()
+    lows = panel['Low'].to_numpy()
+    green, position, run_start = green_runs(panel)
+    n_dates = green.shape[0]
+
+    results = {}
+    for num_days in num_days_list:
+        rows, cols = np.nonzero(green & (position < num_days))
+
+        # One group per (symbol, run start); sort so each group is contiguous
+        keys = cols * n_dates + run_start[rows, cols]
+        order = np.argsort(keys, kind='stable')
+        keys, first = np.unique(keys[order], return_index=True)
+
+        sell = np.fmax.reduceat(highs[rows, cols][order], first) if len(keys) else np.array([])
+        start_rows = keys % n_dates
+        symbol_cols = keys // n_dates
+        buy = lows[start_rows, symbol_cols]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gain = (sell / buy - 1) * 100
+        keep = gain >= min_gain
+
+        results[num_days] = pd.DataFrame({
+            'symbol': closes.columns[symbol_cols[keep]],
+            'date': closes.index[start_rows[keep]].date,
+            'buy_price': np.round(buy[keep], 2),
+            'sell_price': np.round(sell[keep], 2),
+            'expected_gain': np.round(gain[keep], 2),
+        }, columns=SIGNAL_COLUMNS)
+
+    return results
+
+
+def v20_signals(panel, num_days=30, min_gain=20.0):
+    """Evaluate V20 for a single ``num_days`` value."""
+    return v20_signals_multi(panel, [num_days], min_gain=min_gain)[num_days]
+
+
+def v20_checkpoints(panel):
+    """
+    Record where the next evaluation of each symbol in ``panel`` can resume.
+
+    Returns:
+        Dictionary of {symbol: (last_date, state)}; ``state['resume_from']`` is
+        the ISO date the green run open at ``last_date`` started, or None
+    """
+    closes = panel['Close']
+    if closes.empty:
+        return {}
+    green, _, run_start = green_runs(panel)
+    valid = ~np.isnan(closes.to_numpy())
+
+    checkpoints = {}
+    for col, symbol in enumerate(closes.columns):
+        rows = np.flatnonzero(valid[:, col])
+        if not len(rows):
+            continue
+        last = rows[-1]
+        resume_from = closes.index[run_start[last, col]].date().isoformat() if green[last, col] else None
+        checkpoints[symbol] = (closes.index[last].date(), {'resume_from': resume_from})
+    return checkpoints
+
+
+def resume_quotes(stock_quotes, checkpoints):
+    """
+    Trim each symbol's quotes to the bars an incremental run has to evaluate.
+
+    Symbols without a checkpoint keep all their quotes; symbols without bars
+    after their checkpoint are left out.
+    """
+    trimmed = {}
+    for symbol, data in stock_quotes.items():
+        if symbol not in checkpoints:
+            trimmed[symbol] = data
+            continue
+        last_date, state = checkpoints[symbol]
+        if data.empty or data.index[-1].date() <= last_date:
+            continue
+        if state.get('resume_from'):
+            start = datetime.date.fromisoformat(state['resume_from'])
+        else:
+            start = last_date + datetime.timedelta(days=1)
+        trimmed[symbol] = data[data.index >= pd.Timestamp(start)]
+    return trimmed
@@ -1,3 +1,424 @@
-from django.test import TestCase
+import datetime
+import gzip
+import importlib.util
+import json
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+import pandas as pd
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.checkpoints import load_checkpoints
+from core.db import bulk_upsert
+from core.models import DataVersion, StockLTH, StrategyCheckpoint
+from core.panel import build_panel
+from core.publish import publish_dashboards
+from core.synthetic import generate_market
+
+from .dashboard import rebuild_dashboard
+from .lifecycle import advance_signals
+from .models import DashboardRow, Signal
+from .management.commands.process_stocks import StockProcessor
+from .strategies import resume_quotes, v20_signals, v20_signals_multi
+from .views import SignalListView
+
+
+def create_signal(symbol, date, buy_price, sell_price, expected_gain=20, universe='v40'):
+    return Signal.objects.create(
+        symbol=symbol,
+        date=date,
+        buy_price=buy_price,
+        sell_price=sell_price,
+        expected_gain=expected_gain,
+        strategy='v20',
+        universe=universe,
+    )
+
+
+class SignalDeduplicationTests(TestCase):
+    def test_keeps_best_signal_per_buy_price_then_per_date(self):
+        day = datetime.date(2024, 1, 10)
+        create_signal('AAA', day, 100, 120)
+        best_for_buy_price = create_signal('AAA', day - datetime.timedelta(days=3), 100, 130)
+        create_signal('AAA', day, 101, 125, expected_gain=23)
+        best_for_date = create_signal('AAA', day, 102, 125, expected_gain=24)
+        only_bbb = create_signal('BBB', day, 50, 60)
+
+        self.assertEqual(
+            set(Signal.objects.deduplicated().values_list('pk', flat=True)),
+            {best_for_buy_price.pk, best_for_date.pk, only_bbb.pk},
+        )
+
+    def test_deduplicates_within_each_universe(self):
+        day = datetime.date(2024, 1, 10)
+        v40 = create_signal('LT.NS', day, 100, 130)
+        v200 = create_signal('LT.NS', day, 100, 130, universe='v200')
+        create_signal('LT.NS', day - datetime.timedelta(days=5), 100, 120, universe='v200')
+
+        self.assertEqual(set(Signal.objects.deduplicated().values_list('pk', flat=True)), {v40.pk, v200.pk})
+
+        publish_dashboards()
+        DashboardRow.objects.update(distance_from_lth=-25.0)
+        view = SignalListView()
+        view.setup(RequestFactory().get('/signals/?universe=v200&status=all'))
+        self.assertEqual([(row.symbol, row.universe) for row in view.get_queryset()], [('LT.NS', 'v200')])
+
+    def test_query_count_is_constant_as_table_grows(self):
+        for size in (10, 200):
+            Signal.objects.all().delete()
+            for i in range(size):
+                create_signal(f'S{i % 7}', datetime.date(2024, 1, 1) + datetime.timedelta(days=i), 100 + i % 5, 120 + i)
+
+            with self.assertNumQueries(1):
+                list(Signal.objects.filter(universe='v40').deduplicated())
+
+
+class DashboardTests(TestCase):
+    def test_rebuild_keeps_deduplicated_signals_with_lth_columns(self):
+        day = datetime.date(2024, 1, 10)
+        create_signal('AAA', day, 100, 120)
+        best = create_signal('AAA', day - datetime.timedelta(days=3), 100, 130)
+        StockLTH.objects.create(symbol='AAA', lth_price=200, lth_date=datetime.date(2021, 5, 1))
+
+        self.assertEqual(rebuild_dashboard(1), 1)
+        row = DashboardRow.objects.get()
+        self.assertEqual(row.signal_id, best.pk)
+        self.assertEqual(row.lth_price, 200)
+        self.assertTrue(row.is_new)
+
+    def test_view_reads_dashboard_in_one_query(self):
+        create_signal('AAA', datetime.date(2024, 1, 10), 100, 120)
+        create_signal('BBB', datetime.date(2024, 1, 10), 100, 120, universe='v200')
+        publish_dashboards()
+
+        DashboardRow.objects.update(distance_from_lth=-25.0)
+
+        view = SignalListView()
+        view.setup(RequestFactory().get('/signals/?universe=v200'))
+        with self.assertNumQueries(1):
+            rows = list(view.get_queryset())
+        self.assertEqual([row.symbol for row in rows], ['BBB'])
+
+    def test_staged_rows_stay_hidden_until_published(self):
+        create_signal('AAA', datetime.date(2024, 1, 10), 100, 120)
+        publish_dashboards()
+        create_signal('BBB', datetime.date(2024, 1, 10), 100, 120)
+        published = DataVersion.current().version
+
+        rebuild_dashboard(published + 1)
+        self.assertEqual(DashboardRow.objects.count(), 3)
+        self.assertEqual([row.symbol for row in DashboardRow.objects.published()], ['AAA'])
+
+        DataVersion.publish(published + 1)
+        self.assertEqual(sorted(row.symbol for row in DashboardRow.objects.published()), ['AAA', 'BBB'])
+
+    def test_publish_takes_the_version_lock_before_reading_the_version(self):
+        with CaptureQueriesContext(connection) as queries:
+            publish_dashboards()
+
+        sql = [query['sql'] for query in queries.captured_queries if 'core_dataversion' in query['sql']]
+        self.assertTrue(sql[0].startswith('UPDATE'))
+        self.assertEqual(DataVersion.current().version, 1)
+
+    def test_publish_drops_the_previous_snapshot(self):
+        create_signal('AAA', datetime.date(2024, 1, 10), 100, 120)
+        publish_dashboards()
+        publish_dashboards()
+
+        self.assertEqual(DataVersion.current().version, 2)
+        self.assertEqual(list(DashboardRow.objects.values_list('run_version', flat=True)), [2])
+
+
+@override_settings(PRICE_BACKEND='core.prices.StaticPriceBackend')
+class SignalListPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(250):
+            create_signal(f'S{i:03d}', datetime.date(2024, 1, 1) + datetime.timedelta(days=i), 100, 130)
+        publish_dashboards()
+        DashboardRow.objects.update(distance_from_lth=-25.0)
+        # Close to LTH: hidden by the default filter
+        DashboardRow.objects.filter(symbol='S000').update(distance_from_lth=-5.0)
+
+    def render(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_later_pages_cost_the_same_as_the_first(self):
+        first, first_queries = self.render('/signals/')
+        last, last_queries = self.render('/signals/?page=3')
+
+        self.assertEqual(first_queries, last_queries)
+        self.assertEqual(len(first.context['signals']), 100)
+        self.assertEqual(len(last.context['signals']), 49)
+        self.assertEqual(first.context['total_signals_before_filter'], 250)
+        self.assertEqual(first.context['total_signals_after_filter'], 249)
+
+    def test_unknown_ordering_falls_back_to_newest_first(self):
+        response, _ = self.render('/signals/?ordering=lth_price')
+
+        self.assertEqual(response.context['signals'][0].symbol, 'S249')
+
+
+class SignalExportTests(TestCase):
+    def setUp(self):
+        for i in range(5):
+            create_signal(f'S{i}', datetime.date(2024, 1, 1) + datetime.timedelta(days=i), 100, 120)
+        create_signal('US', datetime.date(2024, 1, 3), 100, 120, universe='us40')
+
+    def read_json(self, url, **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return json.loads(content)
+
+    def test_pages_through_filtered_rows_with_a_cursor(self):
+        first = self.read_json('/signals/export/?universe=v40&limit=3')
+        self.assertEqual([row['symbol'] for row in first['results']], ['S0', 'S1', 'S2'])
+
+        second = self.read_json(f"/signals/export/?universe=v40&limit=3&after={first['next']}")
+        self.assertEqual([row['symbol'] for row in second['results']], ['S3', 'S4'])
+        self.assertIsNone(second['next'])
+
+    def test_csv_export_is_gzipped_and_date_filtered(self):
+        response = self.client.get(
+            '/signals/export/?format=csv&since=2024-01-02&until=2024-01-04', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'symbol', 'date'])
+        self.assertEqual(sorted(line.split(',')[1] for line in lines[1:]), ['S1', 'S2', 'US'])
+
+    def test_rejects_invalid_parameters(self):
+        self.assertEqual(self.client.get('/signals/export/?limit=many').status_code, 400)
+        self.assertEqual(self.client.get('/signals/export/?format=xml').status_code, 400)
+
+
+class SignalUpsertTests(TestCase):
+    def upsert(self, signals):
+        return bulk_upsert(
+            Signal,
+            [Signal(**signal_data) for signal_data in signals],
+            unique_fields=Signal.NATURAL_KEY,
+            update_fields=['sell_price', 'expected_gain'],
+        )
+
+    def test_rerun_updates_targets_and_keeps_added_date(self):
+        signal_data = {
+            'symbol': 'AAA', 'date': datetime.date(2024, 1, 10), 'buy_price': 100.0,
+            'sell_price': 120.0, 'expected_gain': 20.0, 'strategy': 'v20', 'universe': 'v40',
+        }
+        self.upsert([dict(signal_data, added_date=datetime.date(2024, 1, 11))])
+        self.upsert([
+            dict(signal_data, sell_price=125.0, expected_gain=25.0),
+            dict(signal_data, date=datetime.date(2024, 2, 1)),
+        ])
+
+        self.assertEqual(Signal.objects.count(), 2)
+        signal = Signal.objects.get(date=datetime.date(2024, 1, 10))
+        self.assertEqual(signal.sell_price, 125)
+        self.assertEqual(signal.added_date, datetime.date(2024, 1, 11))
+
+    def test_prices_rounding_to_the_same_cents_are_one_row(self):
+        signal_data = {
+            'symbol': 'AAA', 'date': datetime.date(2024, 1, 10), 'buy_price': Decimal('101.00'),
+            'sell_price': 120.0, 'expected_gain': 20.0, 'strategy': 'v20', 'universe': 'v40',
+        }
+        self.upsert([signal_data])
+        written = self.upsert([
+            dict(signal_data, buy_price=Decimal(101.001), sell_price=121.0),
+            dict(signal_data, buy_price=101.004, sell_price=122.0),
+        ])
+
+        self.assertEqual(written, 1)
+        self.assertEqual(Signal.objects.get().sell_price, 122)
+
+
+def make_candles(start, candles):
+    """Build OHLC quotes from (open, high, low, close) tuples."""
+    index = pd.date_range(start, periods=len(candles), freq='D')
+    return pd.DataFrame(candles, index=index, columns=['Open', 'High', 'Low', 'Close'])
+
+
+def make_lows_highs(start, lows, highs):
+    index = pd.date_range(start, periods=len(lows), freq='D')
+    return pd.DataFrame({'Low': lows, 'High': highs, 'Close': lows}, index=index)
+
+
+class SignalLifecycleTests(TestCase):
+    def test_advances_only_through_new_bars(self):
+        signal = create_signal('AAA', datetime.date(2024, 1, 1), 100, 120)
+        # Fills on Jan 3; the target is reached on Jan 6, after the first run
+        bars = make_lows_highs('2024-01-01', [104, 102, 99, 101, 110, 118], [106, 104, 103, 108, 115, 121])
+
+        moved = advance_signals({'AAA': bars.iloc[:4]})
+        signal.refresh_from_db()
+        self.assertEqual(moved, {Signal.FILLED: 1})
+        self.assertEqual(signal.filled_date, datetime.date(2024, 1, 3))
+        self.assertEqual(signal.checked_through, datetime.date(2024, 1, 4))
+
+        # Bars already applied are skipped: a changed history before the checkpoint has no effect
+        rewritten = bars.copy()
+        rewritten.loc['2024-01-02', 'High'] = 200
+        advance_signals({'AAA': rewritten})
+        signal.refresh_from_db()
+        self.assertEqual(signal.status, Signal.TARGET_HIT)
+        self.assertEqual(signal.closed_date, datetime.date(2024, 1, 6))
+
+    def test_unfilled_signal_expires(self):
+        signal = create_signal('AAA', datetime.date(2024, 1, 1), 50, 60)
+        advance_signals({'AAA': make_lows_highs('2024-01-01', [100] * 12, [110] * 12)}, expiry_days=10)
+
+        signal.refresh_from_db()
+        self.assertEqual(signal.status, Signal.EXPIRED)
+        self.assertEqual(signal.closed_date, datetime.date(2024, 1, 11))
+
+    def test_list_shows_actionable_signals_by_default(self):
+        create_signal('OPEN', datetime.date(2024, 1, 1), 100, 120)
+        done = create_signal('DONE', datetime.date(2024, 1, 1), 100, 120)
+        Signal.objects.filter(pk=done.pk).update(status=Signal.TARGET_HIT)
+        publish_dashboards()
+
+        view = SignalListView(filter_signals=False)
+        view.setup(RequestFactory().get('/signals/'))
+        self.assertEqual([row.symbol for row in view.get_queryset()], ['OPEN'])
+        view.setup(RequestFactory().get('/signals/?status=all'))
+        self.assertEqual(view.get_queryset().count(), 2)
+
+
+class V20StrategyTests(SimpleTestCase):
+    def setUp(self):
+        self.panel = build_panel({
+            # Three green candles from 100 to 126: a 26% run
+            'AAA': make_candles('2024-01-01', [
+                (105, 106, 100, 101), (100, 108, 99, 107), (107, 115, 106, 114),
+                (114, 121, 113, 120), (120, 126, 119, 125), (125, 126, 110, 111),
+            ]),
+            # Green run that only moves 10%
+            'BBB': make_candles('2024-01-03', [
+                (50, 52, 49, 51), (51, 55, 50, 54), (54, 55, 53, 53),
+            ]),
+        })
+
+    def test_detects_runs_across_symbols(self):
+        signals = v20_signals(self.panel, num_days=30)
+
+        self.assertEqual(len(signals), 1)
+        signal = signals.iloc[0]
+        self.assertEqual(signal['symbol'], 'AAA')
+        self.assertEqual(signal['date'], datetime.date(2024, 1, 2))
+        self.assertEqual(signal['buy_price'], 99)
+        self.assertEqual(signal['sell_price'], 126)
+        self.assertEqual(signal['expected_gain'], 27.27)
+
+    def test_evaluates_several_windows_in_one_pass(self):
+        results = v20_signals_multi(self.panel, [2, 3, 30])
+
+        self.assertTrue(results[2].empty)
+        self.assertEqual(list(results[3]['sell_price']), [121])
+        self.assertEqual(list(results[30]['sell_price']), [126])
+
+    def test_finds_runs_injected_into_a_synthetic_market(self):
+        market = generate_market(symbols=20, years=2, seed=1)
+        signals = v20_signals(build_panel(market.quotes), num_days=30)
+
+        found = set(zip(signals['symbol'], signals['date']))
+        for symbol, starts in market.v20_starts.items():
+            for start in starts:
+                self.assertIn((symbol, start.date()), found)
+
+
+    def test_runs_ignore_dates_only_other_symbols_traded(self):
+        aaa = make_candles('2024-01-01', [
+            (105, 106, 100, 101), (100, 108, 99, 107), (107, 115, 106, 114),
+            (114, 121, 113, 120), (120, 126, 119, 125), (125, 126, 110, 111),
+        ])
+        # AAA does not trade on Jan 3, which CCC does: a NaN row inside AAA's run
+        aaa.index = pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-04', '2024-01-05', '2024-01-06', '2024-01-07'])
+        ccc = make_candles('2024-01-01', [(10, 11, 9, 10)] * 7)
+
+        alone = v20_signals(build_panel({'AAA': aaa}), num_days=30)
+        together = v20_signals(build_panel({'AAA': aaa, 'CCC': ccc}), num_days=30)
+        self.assertEqual(list(alone['sell_price']), [126])
+        self.assertTrue(together.equals(alone))
+
+
+@skipUnless(importlib.util.find_spec('tradewise'), 'tradewise is not installed')
+class V20ParityTests(SimpleTestCase):
+    def test_matches_tradewise_v20_strategy(self):
+        from tradewise.strategy import V20Strategy
+
+        quotes = generate_market(symbols=20, years=2, seed=7, v20_runs=3).quotes
+        for num_days in (20, 30):
+            expected = set()
+            for symbol, results in V20Strategy(quotes, category='v40').v20_strategy(num_days=num_days).items():
+                for result in results:
+                    expected.add((
+                        symbol, pd.Timestamp(result['date']).date(),
+                        round(float(result['buy']), 2), round(float(result['sell']), 2),
+                        round(float(result['expected_gain']), 2),
+                    ))
+
+            signals = v20_signals(build_panel(quotes), num_days=num_days)
+            self.assertEqual(set(signals.itertuples(index=False, name=None)), expected)
+
+
+class IncrementalV20Tests(TestCase):
+    SIGNAL_FIELDS = ('symbol', 'date', 'buy_price', 'sell_price', 'expected_gain')
+
+    def stored_signals(self):
+        return set(Signal.objects.values_list(*self.SIGNAL_FIELDS))
+
+    def test_incremental_runs_match_a_full_recompute(self):
+        quotes = generate_market(8, years=1, seed=5, v20_runs=3).quotes
+        length = min(len(data) for data in quotes.values())
+
+        StockProcessor('v40.txt', 'v40', full_recompute=True).process_quotes(quotes)
+        full = self.stored_signals()
+        self.assertTrue(full)
+        Signal.objects.all().delete()
+        StrategyCheckpoint.objects.all().delete()
+
+        # A first run without checkpoints, then daily runs with one new bar each
+        for end in [length // 2, *range(length // 2 + 1, length + 1)]:
+            StockProcessor('v40.txt', 'v40').process_quotes({s: data.iloc[:end] for s, data in quotes.items()})
+
+        self.assertEqual(self.stored_signals(), full)
+
+    def test_readjusted_symbols_are_evaluated_again_from_scratch(self):
+        quotes = generate_market(8, years=1, seed=5, v20_runs=3).quotes
+        length = min(len(data) for data in quotes.values())
+        split = next(iter(quotes))
+        # A 2:1 split back-adjusts the whole history of one symbol
+        adjusted = {**quotes, split: quotes[split].assign(**{c: quotes[split][c] / 2 for c in ['Open', 'High', 'Low', 'Close']})}
+
+        StockProcessor('v40.txt', 'v40', full_recompute=True).process_quotes(adjusted)
+        full = self.stored_signals()
+        self.assertIn(split, {signal[0] for signal in full})
+        Signal.objects.all().delete()
+        StrategyCheckpoint.objects.all().delete()
+
+        for end in [length // 2, length // 2 + 1]:
+            StockProcessor('v40.txt', 'v40').process_quotes({s: data.iloc[:end] for s, data in quotes.items()})
+        # The quote store now serves the adjusted history on basis 1
+        for end in range(length // 2 + 2, length + 1):
+            StockProcessor('v40.txt', 'v40').process_quotes(
+                {s: data.iloc[:end] for s, data in adjusted.items()}, bases={split: 1}
+            )
+
+        self.assertEqual(self.stored_signals(), full)
+        self.assertEqual(load_checkpoints('v20', 'v40', [split])[split][1]['basis'], 1)
+
+    def test_resumed_run_reads_only_recent_bars(self):
+        quotes = generate_market(4, years=1, seed=2).quotes
+        StockProcessor('v40.txt', 'v40').process_quotes({s: data.iloc[:-1] for s, data in quotes.items()})
+
+        trimmed = resume_quotes(quotes, load_checkpoints('v20', 'v40', quotes))
+        self.assertLess(sum(len(data) for data in trimmed.values()), sum(len(data) for data in quotes.values()) / 10)
@@ -1,8 +1,9 @@
 # signals/urls.py
 from django.urls import path
-from .views import SignalListView
+from .views import SignalExportView, SignalListView
 
 urlpatterns = [
     path('', SignalListView.as_view(), name='signals_list'),
+    path('export/', SignalExportView.as_view(), name='signals_export'),
 ]
 
@@ -1,84 +1,61 @@
-from django.shortcuts import render
 from django_filters.views import FilterView
-from .models import Signal
+from .models import DashboardRow, Signal
 from .filters import SignalFilter
-from django.db.models import F, Subquery, OuterRef, Case, When, BooleanField, Max
-from django.utils import timezone
-from datetime import timedelta
-from core.mixins import LTHFilterMixin
-import yfinance as yf
+from core.cache import VersionedCacheMixin
+from core.export import ExportView
+from core.mixins import DashboardQueryMixin, LTHFilterMixin
 
-class SignalListView(LTHFilterMixin, FilterView):
-    model = Signal
+class SignalListView(VersionedCacheMixin, DashboardQueryMixin, LTHFilterMixin, FilterView):
+    model = DashboardRow
     template_name = 'signals/signals_list.html'
     filterset_class = SignalFilter
     context_object_name = 'signals'
+    default_ordering = '-date'
+    ordering_fields = ('date', 'symbol', 'distance_from_lth', 'expected_gain')
 
     def get_queryset(self):
+        # Rows are deduplicated and flagged as new by signals.dashboard at the end of each run
         queryset = super().get_queryset()
         # Get the query parameters
         strategy = self.request.GET.get('strategy')
         universe = self.request.GET.get('universe')
+        status = self.request.GET.get('status')
         
         # Optionally, perform additional filtering based on the query parameters
         if strategy:
             queryset = queryset.filter(strategy=strategy)
         if universe:
             queryset = queryset.filter(universe=universe)
+        # Only actionable signals unless a status (or 'all') is asked for
+        if status != 'all':
+            statuses = [status] if status else Signal.ACTIONABLE_STATUSES
+            queryset = queryset.filter(status__in=statuses)
 
-        # Get today's date
-        today = timezone.now().date()
-
-        # Step 1: Get the IDs of records with highest sell_price for each symbol-buy_price combo
-        max_sell_price_signal_ids = []
-        symbol_buy_price_combos = queryset.values('symbol', 'buy_price').distinct()
-        
-        for combo in symbol_buy_price_combos:
-            max_sell_price_signal = queryset.filter(
-                symbol=combo['symbol'],
-                buy_price=combo['buy_price']
-            ).order_by('-sell_price').first()
-            if max_sell_price_signal:
-                max_sell_price_signal_ids.append(max_sell_price_signal.pk)
-
-        # Filter queryset to only include the maximum sell price signals
-        queryset = queryset.filter(pk__in=max_sell_price_signal_ids)
-
-        # Step 2: If there are still multiple entries for same symbol-date, pick one with highest sell_price
-        final_signal_ids = []
-        symbol_date_combos = queryset.values('symbol', 'date').distinct()
-        
-        for combo in symbol_date_combos:
-            best_signal = queryset.filter(
-                symbol=combo['symbol'],
-                date=combo['date']
-            ).order_by('-sell_price', '-expected_gain').first()
-            if best_signal:
-                final_signal_ids.append(best_signal.pk)
-
-        # Filter queryset to only include the final selected signals
-        queryset = queryset.filter(pk__in=final_signal_ids)
-
-        # Annotate with a flag for new stocks (added within the last 7 days)
-        queryset = queryset.annotate(
-            is_new=Case(
-                When(added_date__gte=today - timedelta(days=7), then=True),
-                default=False,
-                output_field=BooleanField()
-            )
-        )
-
-        return queryset
+        return self.filter_dashboard(queryset)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # Only the current page is loaded; filtering already happened in SQL
         signals = list(context['signals'])
         
-        # Use the mixin to add LTH data and filtering
-        filtered_signals = self.add_lth_data_to_signals(signals, price_field='buy_price')
+        # Use the mixin to overlay live prices and LTH data
+        context['signals'] = self.add_lth_data_to_signals(
+            signals, price_field='buy_price', filter_signals=False
+        )
         
-        # Update context with filtered signals and LTH info
-        context['signals'] = filtered_signals
-        context = self.add_lth_context(context, signals, filtered_signals)
+        # Update context with LTH filter info
+        context = self.add_lth_context(
+            context, self.unfiltered_queryset.count(), context['paginator'].count
+        )
 
         return context
+
+
+class SignalExportView(ExportView):
+    """Every stored V20 signal, not just the deduplicated dashboard rows."""
+    model = Signal
+    fields = (
+        'symbol', 'date', 'buy_price', 'sell_price', 'expected_gain', 'strategy', 'universe', 'added_date',
+        'status', 'filled_date', 'closed_date',
+    )
+    filter_fields = ('symbol', 'strategy', 'universe', 'status')
@@ -80,9 +80,21 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Seconds a writer waits for the lock before raising "database is locked"
+        "OPTIONS": {"timeout": 20},
     }
 }
 
+# Applied to every new SQLite connection. WAL lets the web app keep reading while
+# a processing run writes; NORMAL sync is durable enough in WAL mode.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64000,  # KiB when negative, i.e. 64 MB
+    "mmap_size": 256 * 1024 * 1024,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -118,3 +130,77 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Local OHLCV quote store used by the processing commands
+QUOTE_STORE_DIR = BASE_DIR / "data" / "quotes"
+
+# Signals older than the retention horizon move from the database to compressed
+# month-partitioned files. Keep the horizon at least as long as the strategy
+# lookback (2 years) so processing runs never regenerate archived rows.
+SIGNAL_ARCHIVE_DIR = BASE_DIR / "data" / "archive"
+SIGNAL_RETENTION_DAYS = 2 * 365
+
+# A V20 signal whose buy_price is not reached within this many days expires
+SIGNAL_EXPIRY_DAYS = 365
+
+# Bars before an MA checkpoint re-evaluated on resume; must cover the longest
+# moving average window of the strategy (200 days)
+MA_WARMUP_BARS = 250
+
+# Quote download: provider class, concurrent requests, requests per second and
+# retries; a request covers up to the provider's batch_size symbols
+QUOTE_PROVIDER = "core.fetch.YFinanceProvider"
+QUOTE_FETCH_CONCURRENCY = 8
+QUOTE_FETCH_RATE = 5.0
+QUOTE_FETCH_RETRIES = 3
+QUOTE_FETCH_BACKOFF = 0.5  # seconds, doubled on every retry
+
+# Current-price lookups for the list views
+PRICE_BACKEND = "core.prices.YFinanceBackend"
+PRICE_CACHE_TTL = 60  # seconds, while the market is open
+
+# Caches; switch to django.core.cache.backends.filebased.FileBasedCache to share
+# cached pages between several web processes
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Rendered list pages are cached per data version. They include live prices,
+# so entries also expire after the price TTL.
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = PRICE_CACHE_TTL
+
+# Price alerts checked by `manage.py check_alerts`. Sinks are classes with a
+# send(alerts) method; core.alerts.WebhookSink posts to ALERT_WEBHOOK_URL.
+ALERT_SINKS = ["core.alerts.FileSink"]
+ALERT_FILE = BASE_DIR / "data" / "alerts.jsonl"
+ALERT_WEBHOOK_URL = ""
+ALERT_STATE_FILE = BASE_DIR / "data" / "alert_prices.json"  # last checked price per symbol
+ALERT_CHECK_INTERVAL = PRICE_CACHE_TTL  # seconds between price checks
+
+# Jobs run by `manage.py run_scheduler`. Times are UTC; weekdays use Monday=0.
+# A job missed by less than SCHEDULER_CATCH_UP seconds (e.g. while the daemon
+# was down) runs once when the scheduler comes back.
+SCHEDULER_JOBS = [
+    {
+        "name": "lth_intraday",
+        "command": "process_lth",
+        "args": ["--update-only", "--days-back", "7"],
+        "times": ["05:30", "08:30"],
+        "weekdays": [0, 1, 2, 3, 4],
+        "timeout": 20 * 60,
+    },
+    {
+        "name": "pipeline",
+        "command": "run_pipeline",
+        "args": [],
+        "times": ["13:30"],  # 7:00 PM IST, after the Indian market close
+        "timeout": 3 * 60 * 60,
+    },
+]
+SCHEDULER_CATCH_UP = 6 * 60 * 60
+SCHEDULER_LOCK_FILE = BASE_DIR / "data" / "scheduler.lock"
+SCHEDULER_STATE_FILE = BASE_DIR / "data" / "scheduler_state.json"
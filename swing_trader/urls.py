@@ -22,4 +22,5 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path('signals/', include('signals.urls')),
     path('ma/', include('ma.urls')),
+    path('lth/', include('core.urls')),
 ]